@@ -16,18 +16,64 @@ BOT_TOKEN = os.getenv("BOT_TOKEN")
 ADMINS = [int(x) for x in os.getenv("ADMINS", "").split(",") if x.strip()]
 
 
-# Пути к файлам хранения
-DATA_DIR = BASE_DIR / "data"
-DATA_DIR.mkdir(exist_ok=True)
+# Пути к файлам хранения (DATA_DIR можно переопределить, например для профилирования)
+DATA_DIR = Path(os.getenv("DATA_DIR", BASE_DIR / "data"))
+DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 USERS_FILE = DATA_DIR / "users.db"
 SCHEDULE_FILE = DATA_DIR / "schedule"
 ATTENDANCE_FILE = DATA_DIR / "attendance"
 SUBSCRIPTIONS_FILE = DATA_DIR / "subscriptions"
+FSM_FILE = DATA_DIR / "fsm.db"
+
+# FSM-хранилище: период записи в БД и время жизни брошенных состояний
+FSM_FLUSH_INTERVAL = float(os.getenv("FSM_FLUSH_INTERVAL", "2"))  # секунды
+FSM_STATE_TTL = float(os.getenv("FSM_STATE_TTL", str(24 * 3600)))  # секунды
+
+# Настройки SQLite (общие для users.db и club_schedule.db)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(64 * 1024 * 1024)))  # байты
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-16000"))  # <0 — в КиБ (≈16 МБ)
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
+# Кеш пользователей в UserService
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "600"))  # секунды
+# Период фоновой записи изменённых Telegram-профилей
+PROFILE_FLUSH_INTERVAL = float(os.getenv("PROFILE_FLUSH_INTERVAL", "5"))  # секунды
+
+# Лимиты исходящих запросов к Telegram (telegram/middlewares/outbound.py)
+OUTBOUND_GLOBAL_RATE = float(os.getenv("OUTBOUND_GLOBAL_RATE", "30"))  # сообщений/с на бота
+OUTBOUND_GROUP_PER_MINUTE = float(os.getenv("OUTBOUND_GROUP_PER_MINUTE", "20"))
+OUTBOUND_PRIVATE_PER_SECOND = float(os.getenv("OUTBOUND_PRIVATE_PER_SECOND", "1"))
+
+# Защита от флуда входящими апдейтами (telegram/middlewares/throttling.py)
+THROTTLE_USER_LIMIT = int(os.getenv("THROTTLE_USER_LIMIT", "10"))
+THROTTLE_USER_WINDOW = float(os.getenv("THROTTLE_USER_WINDOW", "5"))  # секунды
+THROTTLE_CHAT_LIMIT = int(os.getenv("THROTTLE_CHAT_LIMIT", "60"))
+THROTTLE_CHAT_WINDOW = float(os.getenv("THROTTLE_CHAT_WINDOW", "10"))  # секунды
+THROTTLE_CALLBACK_DEBOUNCE = float(os.getenv("THROTTLE_CALLBACK_DEBOUNCE", "1"))  # секунды
+
+# Журнал изменений расписания: записи старше N дней при старте уходят в помесячные архивы
+CHANGE_LOG_RETENTION_DAYS = int(os.getenv("CHANGE_LOG_RETENTION_DAYS", "180"))
+
+# Фоновое создание занятий из шаблонов (telegram/tasks/schedule_materializer.py)
+SCHEDULE_MATERIALIZE_WEEKS = int(os.getenv("SCHEDULE_MATERIALIZE_WEEKS", "8"))  # недель вперёд
+SCHEDULE_MATERIALIZE_HOUR = int(os.getenv("SCHEDULE_MATERIALIZE_HOUR", "4"))  # час ночного прохода
+
+# Кеш снимков расписания по датам в ScheduleService
+SCHEDULE_CACHE_SIZE = int(os.getenv("SCHEDULE_CACHE_SIZE", "60"))  # дат
+SCHEDULE_CACHE_TTL = float(os.getenv("SCHEDULE_CACHE_TTL", "3600"))  # секунды; страховка от правок в обход сервиса
+
+# Опросы посещаемости в группах
+POLL_DURATION_HOURS = float(os.getenv("POLL_DURATION_HOURS", "12"))
+POLL_EDIT_INTERVAL = float(os.getenv("POLL_EDIT_INTERVAL", "3"))  # секунды между правками сообщения опроса
 
 # Настройки логов (если понадобятся)
-LOGS_DIR = BASE_DIR / "logs"
-LOGS_DIR.mkdir(exist_ok=True)
+LOGS_DIR = Path(os.getenv("LOGS_DIR", BASE_DIR / "logs"))
+LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
 # Default settings (на будущее)
 DEFAULT_LANGUAGE = "ru"
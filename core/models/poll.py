@@ -1,14 +1,41 @@
-﻿\"\"\"Poll model.\"\"\"
-
+﻿# core/models/poll.py
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+# варианты ответа в опросе посещаемости
+ANSWER_YES = "yes"
+ANSWER_NO = "no"
+POLL_ANSWERS = (ANSWER_YES, ANSWER_NO)
+
+
+@dataclass(slots=True)
+class PollVote:
+    """Один голос; в БД голоса только дописываются, действует последний."""
+    poll_id: int
+    user_id: int
+    username: Optional[str]
+    full_name: Optional[str]
+    answer: str                 # yes / no
+    voted_at: datetime
+    id: Optional[int] = None
 
-@dataclass
+
+@dataclass(slots=True)
 class Poll:
+    id: Optional[int]
     chat_id: int
-    message_id: int | None
-    command: str
+    message_id: Optional[int]
+    command: str                # заголовок опроса (текст после /poll)
     expires_at: datetime
-    participants: List[Tuple[int, str, str]] = field(default_factory=list)
     active: bool = True
+    # текущий голос каждого участника: user_id → голос; порядок — порядок первого голоса
+    votes: Dict[int, PollVote] = field(default_factory=dict)
+
+    def voters(self, answer: str) -> List[PollVote]:
+        return [v for v in self.votes.values() if v.answer == answer]
+
+    @property
+    def participants(self) -> List[Tuple[int, Optional[str], Optional[str]]]:
+        """Идущие на занятие: (user_id, username, full_name)."""
+        return [(v.user_id, v.username, v.full_name) for v in self.voters(ANSWER_YES)]
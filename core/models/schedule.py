@@ -1,15 +1,15 @@
 ﻿# core/models/schedule.py
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import date, time, datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 
 # ============================================================
 #  БАЗОВОЕ ЗАНЯТИЕ НЕДЕЛЬНОГО РАСПИСАНИЯ
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class BaseScheduleTemplate:
     id: Optional[int]
     weekday: int                   # 0–6
@@ -29,7 +29,7 @@ class BaseScheduleTemplate:
 #  КОНКРЕТНОЕ ЗАНЯТИЕ ПО КАЛЕНДАРЮ
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class TrainingInstance:
     id: Optional[int]
     date: date
@@ -82,20 +82,76 @@ class TrainingInstance:
             comment=None
         )
 
+    def to_log_dict(self) -> Dict[str, Any]:
+        """Поля занятия (без id) в JSON-совместимом виде — для журнала изменений."""
+        return {
+            "date": self.date.isoformat(),
+            "start_time": self.start_time.strftime("%H:%M"),
+            "duration_minutes": self.duration_minutes,
+            "trainer_id": self.trainer_id,
+            "place": self.place,
+            "training_type": self.training_type,
+            "source_template_id": self.source_template_id,
+            "status": self.status,
+            "comment": self.comment,
+        }
+
+    def with_log_values(self, values: Dict[str, Any]) -> "TrainingInstance":
+        """
+        Копия с полями из payload журнала. Ключи, которых нет среди полей
+        (id, служебные пометки), игнорируются.
+        """
+        data = {k: v for k, v in values.items() if k in TRAINING_LOG_FIELDS}
+        if "date" in data:
+            data["date"] = date.fromisoformat(data["date"])
+        if "start_time" in data:
+            data["start_time"] = time.fromisoformat(data["start_time"])
+        return replace(self, **data)
+
+
+TRAINING_LOG_FIELDS = (
+    "date", "start_time", "duration_minutes", "trainer_id", "place",
+    "training_type", "source_template_id", "status", "comment",
+)
+
+
+def log_diff(old: Dict[str, Any], new: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Только изменившиеся поля: (старые значения, новые значения)."""
+    changed = [k for k in new if old.get(k) != new[k]]
+    return {k: old.get(k) for k in changed}, {k: new[k] for k in changed}
+
 
 # ============================================================
 #  ЛОГ ИЗМЕНЕНИЙ РАСПИСАНИЯ
 # ============================================================
 
-@dataclass
+# training_id групповой записи (операция над диапазоном дат):
+# old_value = {"<id занятия>": {старые значения полей}, ...}
+GROUP_LOG_TRAINING_ID = 0
+
+@dataclass(slots=True)
 class ScheduleChangeLog:
     id: Optional[int]
     training_id: int
     admin_user_id: int
 
-    change_type: str            # added / canceled / time_changed / moved / trainer_changed
+    change_type: str            # added / canceled / time_changed / moved / trainer_changed / range_*
+    # только изменившиеся поля; old_value=None — запись о создании занятия
     old_value: Optional[Dict[str, Any]]
     new_value: Optional[Dict[str, Any]]
 
     timestamp: Optional[datetime] = None
+    prev_log_id: Optional[int] = None   # предыдущая запись по тому же занятию
+
 
+
+@dataclass(frozen=True, slots=True)
+class ScheduleChangeSummary:
+    """Строка журнала без old/new payload — для списков в админке."""
+    id: int
+    training_id: int
+    admin_user_id: int
+    change_type: str
+    timestamp: datetime
+    training_date: Optional[date] = None
+    training_start_time: Optional[time] = None
@@ -10,7 +10,7 @@ def current_time_iso() -> str:
     return datetime.utcnow().isoformat(sep=" ", timespec="seconds")
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     user_id: int
     username: Optional[str] = None
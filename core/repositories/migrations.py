@@ -0,0 +1,155 @@
+# core/repositories/migrations.py
+"""
+Версионированные миграции схемы расписания (data/club_schedule.db).
+
+Текущая версия схемы хранится в PRAGMA user_version. Каждая миграция
+выполняется в своей транзакции вместе с обновлением user_version,
+поэтому при ошибке база остаётся на предыдущей версии.
+"""
+import logging
+import sqlite3
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# (версия, описание, SQL)
+MIGRATIONS: List[Tuple[int, str, str]] = [
+    (
+        1,
+        "base schema",
+        """
+        CREATE TABLE IF NOT EXISTS base_schedule_templates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            weekday INTEGER NOT NULL,
+            start_time TEXT NOT NULL,
+            duration_minutes INTEGER NOT NULL,
+            trainer_id INTEGER NOT NULL,
+            place TEXT NOT NULL,
+            training_type TEXT NOT NULL,
+            active INTEGER DEFAULT 1
+        );
+
+        CREATE TABLE IF NOT EXISTS training_instances (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            start_time TEXT NOT NULL,
+            duration_minutes INTEGER NOT NULL,
+            trainer_id INTEGER NOT NULL,
+            place TEXT NOT NULL,
+            training_type TEXT NOT NULL,
+            source_template_id INTEGER,
+            status TEXT NOT NULL,
+            comment TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS schedule_change_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            training_id INTEGER NOT NULL,
+            admin_user_id INTEGER NOT NULL,
+            change_type TEXT NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            timestamp TEXT NOT NULL
+        );
+        """,
+    ),
+    (
+        2,
+        "schedule indexes and template uniqueness",
+        """
+        -- дубли шаблонных занятий на одну дату: оставляем самое раннее
+        DELETE FROM training_instances
+        WHERE source_template_id IS NOT NULL
+          AND id NOT IN (
+              SELECT MIN(id) FROM training_instances
+              WHERE source_template_id IS NOT NULL
+              GROUP BY date, source_template_id
+          );
+
+        CREATE INDEX IF NOT EXISTS idx_training_instances_date_time
+            ON training_instances(date, start_time);
+
+        -- одно занятие из шаблона на дату; ручные/перенесённые (NULL) не ограничены
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_training_instances_date_template
+            ON training_instances(date, source_template_id)
+            WHERE source_template_id IS NOT NULL;
+
+        CREATE INDEX IF NOT EXISTS idx_change_log_training_ts
+            ON schedule_change_log(training_id, timestamp);
+
+        CREATE INDEX IF NOT EXISTS idx_change_log_ts
+            ON schedule_change_log(timestamp);
+        """,
+    ),
+    (
+        3,
+        "change log version chain",
+        """
+        -- payload хранит только изменённые поля; prev_log_id связывает версии занятия
+        ALTER TABLE schedule_change_log ADD COLUMN prev_log_id INTEGER;
+        """,
+    ),
+    (
+        4,
+        "attendance polls",
+        """
+        CREATE TABLE IF NOT EXISTS polls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chat_id INTEGER NOT NULL,
+            message_id INTEGER,
+            command TEXT NOT NULL,
+            expires_at TEXT NOT NULL,
+            active INTEGER NOT NULL DEFAULT 1
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_polls_active ON polls(active, expires_at);
+
+        -- голоса только дописываются: действует последний голос пользователя
+        CREATE TABLE IF NOT EXISTS poll_votes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            poll_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            username TEXT,
+            full_name TEXT,
+            answer TEXT NOT NULL,
+            voted_at TEXT NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_poll_votes_poll ON poll_votes(poll_id, id);
+        """,
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> int:
+    """
+    Применить недостающие миграции до версии target (по умолчанию — последней).
+    Возвращает итоговую версию схемы.
+    """
+    target = LATEST_VERSION if target is None else target
+    current = get_version(conn)
+
+    for version, description, sql in MIGRATIONS:
+        if version <= current or version > target:
+            continue
+
+        logger.info("Applying schedule migration %s: %s", version, description)
+        try:
+            conn.executescript(
+                f"BEGIN;\n{sql}\nPRAGMA user_version = {version};\nCOMMIT;"
+            )
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            logger.exception("Schedule migration %s failed", version)
+            raise
+        current = version
+
+    return current
@@ -0,0 +1,107 @@
+# core/repositories/poll_repo.py
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import aiosqlite
+
+from core.models.poll import Poll, PollVote
+
+POLL_COLUMNS = "id, chat_id, message_id, command, expires_at, active"
+
+
+def poll_from_row(_cursor, row) -> Poll:
+    return Poll(
+        id=row[0],
+        chat_id=row[1],
+        message_id=row[2],
+        command=row[3],
+        expires_at=datetime.fromisoformat(row[4]),
+        active=bool(row[5]),
+    )
+
+
+def vote_from_row(_cursor, row) -> PollVote:
+    return PollVote(
+        id=row[0],
+        poll_id=row[1],
+        user_id=row[2],
+        username=row[3],
+        full_name=row[4],
+        answer=row[5],
+        voted_at=datetime.fromisoformat(row[6]),
+    )
+
+
+class PollRepository:
+    """
+    Опросы посещаемости в club_schedule.db. Голоса — append-only строки
+    poll_votes, опрос целиком не перезаписывается. Как и репозитории
+    расписания, commit не делает: транзакцией управляет UnitOfWork.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection):
+        self.conn = conn
+
+    async def add(self, poll: Poll) -> int:
+        cur = await self.conn.execute(
+            "INSERT INTO polls (chat_id, message_id, command, expires_at, active) VALUES (?, ?, ?, ?, ?)",
+            (poll.chat_id, poll.message_id, poll.command, poll.expires_at.isoformat(), 1 if poll.active else 0),
+        )
+        poll_id = cur.lastrowid
+        await cur.close()
+        return poll_id
+
+    async def set_message_id(self, poll_id: int, message_id: int):
+        await self.conn.execute("UPDATE polls SET message_id=? WHERE id=?", (message_id, poll_id))
+
+    async def close(self, poll_id: int):
+        await self.conn.execute("UPDATE polls SET active=0 WHERE id=?", (poll_id,))
+
+    async def add_vote(self, vote: PollVote) -> int:
+        cur = await self.conn.execute(
+            """
+            INSERT INTO poll_votes (poll_id, user_id, username, full_name, answer, voted_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (vote.poll_id, vote.user_id, vote.username, vote.full_name, vote.answer, vote.voted_at.isoformat()),
+        )
+        vote_id = cur.lastrowid
+        await cur.close()
+        return vote_id
+
+    async def get(self, poll_id: int) -> Optional[Poll]:
+        cur = await self.conn.execute(f"SELECT {POLL_COLUMNS} FROM polls WHERE id=?", (poll_id,))
+        cur.row_factory = poll_from_row
+        poll = await cur.fetchone()
+        await cur.close()
+        if poll is not None:
+            await self._load_votes({poll.id: poll})
+        return poll
+
+    async def get_active(self) -> List[Poll]:
+        """Активные опросы с текущими голосами — для восстановления после рестарта."""
+        cur = await self.conn.execute(f"SELECT {POLL_COLUMNS} FROM polls WHERE active=1 ORDER BY id")
+        cur.row_factory = poll_from_row
+        polls = await cur.fetchall()
+        await cur.close()
+        await self._load_votes({p.id: p for p in polls})
+        return polls
+
+    async def _load_votes(self, polls: Dict[int, Poll]):
+        """Свернуть журнал голосов: по порядку id, последний голос пользователя побеждает."""
+        if not polls:
+            return
+        placeholders = ", ".join("?" for _ in polls)
+        cur = await self.conn.execute(
+            f"""
+            SELECT id, poll_id, user_id, username, full_name, answer, voted_at
+            FROM poll_votes WHERE poll_id IN ({placeholders})
+            ORDER BY poll_id, id
+            """,
+            tuple(polls),
+        )
+        cur.row_factory = vote_from_row
+        # повторное присваивание ключа dict сохраняет место участника (порядок первого голоса)
+        for vote in await cur.fetchall():
+            polls[vote.poll_id].votes[vote.user_id] = vote
+        await cur.close()
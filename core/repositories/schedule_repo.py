@@ -1,22 +1,87 @@
 ﻿# core/repositories/schedule_repo.py
 import json
-import sqlite3
+import re
+import aiosqlite
 from datetime import datetime, date, time
-from typing import Optional, List
+from functools import lru_cache
+from typing import Optional, List, Dict, Set, Tuple, Any, Callable, Collection
 
 from core.models.schedule import (
     BaseScheduleTemplate,
     TrainingInstance,
-    ScheduleChangeLog
+    ScheduleChangeLog,
+    ScheduleChangeSummary,
+    GROUP_LOG_TRAINING_ID
 )
 
 
+# Различных дат и времён в таблицах немного (год — 365 дат, время
+# кратно получасу), поэтому разбор кешируется: строка → готовый объект.
+@lru_cache(maxsize=4096)
 def parse_time(value: str) -> time:
-    return datetime.strptime(value, "%H:%M").time()
+    return time.fromisoformat(value)
 
 
+@lru_cache(maxsize=4096)
 def parse_date(value: str) -> date:
-    return datetime.strptime(value, "%Y-%m-%d").date()
+    return date.fromisoformat(value)
+
+
+# ---------------------------------------------------------
+# Декодирование строк (row_factory курсора)
+# ---------------------------------------------------------
+# Фабрика ставится на курсор, поэтому модели собираются в потоке
+# aiosqlite вместе с fetch, а не отдельным проходом в event loop.
+
+TEMPLATE_COLUMNS = "id, weekday, start_time, duration_minutes, trainer_id, place, training_type, active"
+INSTANCE_COLUMNS = (
+    "id, date, start_time, duration_minutes, trainer_id, place, training_type, "
+    "source_template_id, status, comment"
+)
+
+
+def template_from_row(_cursor, row) -> BaseScheduleTemplate:
+    return BaseScheduleTemplate(
+        id=row[0],
+        weekday=row[1],
+        start_time=parse_time(row[2]),
+        duration_minutes=row[3],
+        trainer_id=row[4],
+        place=row[5],
+        training_type=row[6],
+        active=bool(row[7]),
+    )
+
+
+def instance_from_row(_cursor, row) -> TrainingInstance:
+    return TrainingInstance(
+        id=row[0],
+        date=parse_date(row[1]),
+        start_time=parse_time(row[2]),
+        duration_minutes=row[3],
+        trainer_id=row[4],
+        place=row[5],
+        training_type=row[6],
+        source_template_id=row[7],
+        status=row[8],
+        comment=row[9],
+    )
+
+
+async def fetch_all(conn: aiosqlite.Connection, sql: str, params: tuple, factory: Callable) -> list:
+    cur = await conn.execute(sql, params)
+    cur.row_factory = factory
+    rows = await cur.fetchall()
+    await cur.close()
+    return rows
+
+
+async def fetch_one(conn: aiosqlite.Connection, sql: str, params: tuple, factory: Callable):
+    cur = await conn.execute(sql, params)
+    cur.row_factory = factory
+    row = await cur.fetchone()
+    await cur.close()
+    return row
 
 
 # ---------------------------------------------------------
@@ -24,12 +89,14 @@ def parse_date(value: str) -> date:
 # ---------------------------------------------------------
 
 class BaseScheduleTemplateRepo:
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: aiosqlite.Connection):
         self.conn = conn
+        # растёт при каждом изменении шаблонов через этот репозиторий;
+        # по нему ScheduleService понимает, что индекс шаблонов устарел
+        self.version = 0
 
-    def add(self, template: BaseScheduleTemplate) -> int:
-        cur = self.conn.cursor()
-        cur.execute("""
+    async def add(self, template: BaseScheduleTemplate) -> int:
+        cur = await self.conn.execute("""
             INSERT INTO base_schedule_templates
             (weekday, start_time, duration_minutes, trainer_id, place, training_type, active)
             VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -42,66 +109,49 @@ class BaseScheduleTemplateRepo:
             template.training_type,
             1 if template.active else 0
         ))
-        self.conn.commit()
-        return cur.lastrowid
+        template_id = cur.lastrowid
+        await cur.close()
+        self.version += 1
+        return template_id
 
-    def get_all(self) -> List[BaseScheduleTemplate]:
-        cur = self.conn.cursor()
-        rows = cur.execute("""
-            SELECT id, weekday, start_time, duration_minutes, trainer_id, place, training_type, active
-            FROM base_schedule_templates
-        """).fetchall()
+    async def set_active(self, template_id: int, active: bool):
+        """Включить/выключить шаблон (выключенный не попадает в расписание)."""
+        await self.conn.execute(
+            "UPDATE base_schedule_templates SET active=? WHERE id=?",
+            (1 if active else 0, template_id)
+        )
+        self.version += 1
 
-        return [
-            BaseScheduleTemplate(
-                id=row[0],
-                weekday=row[1],
-                start_time=parse_time(row[2]),
-                duration_minutes=row[3],
-                trainer_id=row[4],
-                place=row[5],
-                training_type=row[6],
-                active=bool(row[7]),
-            )
-            for row in rows
-        ]
+    async def get_all(self) -> List[BaseScheduleTemplate]:
+        return await fetch_all(self.conn, f"""
+            SELECT {TEMPLATE_COLUMNS}
+            FROM base_schedule_templates
+        """, (), template_from_row)
 
-    def get_active(self) -> List[BaseScheduleTemplate]:
-        cur = self.conn.cursor()
-        rows = cur.execute("""
-            SELECT id, weekday, start_time, duration_minutes, trainer_id, place, training_type, active
+    async def get_active(self) -> List[BaseScheduleTemplate]:
+        return await fetch_all(self.conn, f"""
+            SELECT {TEMPLATE_COLUMNS}
             FROM base_schedule_templates
             WHERE active=1
-        """).fetchall()
-
-        return [
-            BaseScheduleTemplate(
-                id=row[0],
-                weekday=row[1],
-                start_time=parse_time(row[2]),
-                duration_minutes=row[3],
-                trainer_id=row[4],
-                place=row[5],
-                training_type=row[6],
-                active=bool(row[7]),
-            )
-            for row in rows
-        ]
+        """, (), template_from_row)
 
 
 # ---------------------------------------------------------
 # TrainingInstanceRepo
 # ---------------------------------------------------------
 
+# минуты от полуночи для start_time 'HH:MM'
+START_MINUTES_SQL = "(CAST(substr(start_time, 1, 2) AS INTEGER) * 60 + CAST(substr(start_time, 4, 2) AS INTEGER))"
+
+
 class TrainingInstanceRepo:
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: aiosqlite.Connection):
         self.conn = conn
 
-    def add(self, inst: TrainingInstance) -> int:
-        cur = self.conn.cursor()
-        cur.execute("""
+    async def add(self, inst: TrainingInstance) -> int:
+        cur = await self.conn.execute("""
             INSERT INTO training_instances
-            (date, start_time, duration_minutes, trainer_id, place, training_type, 
+            (date, start_time, duration_minutes, trainer_id, place, training_type,
              source_template_id, status, comment)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
@@ -115,64 +165,92 @@ class TrainingInstanceRepo:
             inst.status,
             inst.comment
         ))
-        self.conn.commit()
-        return cur.lastrowid
-
-    def get_by_date(self, d: date) -> List[TrainingInstance]:
-        cur = self.conn.cursor()
-        rows = cur.execute("""
-            SELECT id, date, start_time, duration_minutes, trainer_id, place, training_type,
-                   source_template_id, status, comment
+        inst_id = cur.lastrowid
+        await cur.close()
+        return inst_id
+
+    async def get_by_date(self, d: date) -> List[TrainingInstance]:
+        return await fetch_all(self.conn, f"""
+            SELECT {INSTANCE_COLUMNS}
             FROM training_instances
             WHERE date=?
             ORDER BY start_time
-        """, (d.isoformat(),)).fetchall()
+        """, (d.isoformat(),), instance_from_row)
 
-        return [
-            TrainingInstance(
-                id=row[0],
-                date=parse_date(row[1]),
-                start_time=parse_time(row[2]),
-                duration_minutes=row[3],
-                trainer_id=row[4],
-                place=row[5],
-                training_type=row[6],
-                source_template_id=row[7],
-                status=row[8],
-                comment=row[9],
+    async def get_by_date_range(self, start: date, end: date) -> List[TrainingInstance]:
+        """Все занятия в диапазоне дат [start, end] одним запросом."""
+        return await fetch_all(self.conn, f"""
+            SELECT {INSTANCE_COLUMNS}
+            FROM training_instances
+            WHERE date BETWEEN ? AND ?
+            ORDER BY date, start_time
+        """, (start.isoformat(), end.isoformat()), instance_from_row)
+
+    async def add_many(self, instances: List[TrainingInstance]) -> List[int]:
+        """Вставка пачки занятий; id в порядке instances."""
+        ids = []
+        for inst in instances:
+            cur = await self.conn.execute("""
+                INSERT INTO training_instances
+                (date, start_time, duration_minutes, trainer_id, place, training_type,
+                 source_template_id, status, comment)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                inst.date.isoformat(),
+                inst.start_time.strftime("%H:%M"),
+                inst.duration_minutes,
+                inst.trainer_id,
+                inst.place,
+                inst.training_type,
+                inst.source_template_id,
+                inst.status,
+                inst.comment
+            ))
+            ids.append(cur.lastrowid)
+            await cur.close()
+        return ids
+
+    async def add_missing(self, instances: List[TrainingInstance]) -> int:
+        """
+        Вставка шаблонных занятий, которых ещё нет (INSERT OR IGNORE по
+        уникальному индексу date + source_template_id). Повторный вызов
+        с теми же занятиями ничего не меняет. Возвращает число вставленных.
+        """
+        if not instances:
+            return 0
+        cur = await self.conn.executemany("""
+            INSERT OR IGNORE INTO training_instances
+            (date, start_time, duration_minutes, trainer_id, place, training_type,
+             source_template_id, status, comment)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                inst.date.isoformat(),
+                inst.start_time.strftime("%H:%M"),
+                inst.duration_minutes,
+                inst.trainer_id,
+                inst.place,
+                inst.training_type,
+                inst.source_template_id,
+                inst.status,
+                inst.comment
             )
-            for row in rows
-        ]
+            for inst in instances
+        ])
+        inserted = cur.rowcount
+        await cur.close()
+        return inserted
 
-    def get_by_id(self, inst_id: int) -> Optional[TrainingInstance]:
+    async def get_by_id(self, inst_id: int) -> Optional[TrainingInstance]:
         """Получить конкретное занятие по ID"""
-        cur = self.conn.cursor()
-        row = cur.execute("""
-            SELECT id, date, start_time, duration_minutes, trainer_id, place, training_type,
-                   source_template_id, status, comment
+        return await fetch_one(self.conn, f"""
+            SELECT {INSTANCE_COLUMNS}
             FROM training_instances
             WHERE id=?
-        """, (inst_id,)).fetchone()
-
-        if not row:
-            return None
-
-        return TrainingInstance(
-            id=row[0],
-            date=parse_date(row[1]),
-            start_time=parse_time(row[2]),
-            duration_minutes=row[3],
-            trainer_id=row[4],
-            place=row[5],
-            training_type=row[6],
-            source_template_id=row[7],
-            status=row[8],
-            comment=row[9],
-        )
+        """, (inst_id,), instance_from_row)
 
-    def update(self, inst: TrainingInstance):
-        cur = self.conn.cursor()
-        cur.execute("""
+    async def update(self, inst: TrainingInstance):
+        await self.conn.execute("""
             UPDATE training_instances
             SET date=?, start_time=?, duration_minutes=?, trainer_id=?, place=?,
                 training_type=?, source_template_id=?, status=?, comment=?
@@ -189,87 +267,451 @@ class TrainingInstanceRepo:
             inst.comment,
             inst.id
         ))
-        self.conn.commit()
+
+
+    # ----------------- операции над диапазоном дат -----------------
+    # Одно SELECT (старые значения для журнала) + одно UPDATE с тем же
+    # фильтром. Вызывать внутри UnitOfWork.transaction(): под её блокировкой
+    # набор строк между запросами не меняется. Отменённые занятия не трогаются.
+
+    @staticmethod
+    def _range_filter(
+        start: date,
+        end: date,
+        place: Optional[str] = None,
+        trainer_id: Optional[int] = None,
+        exclude_ids: Collection[int] = (),
+    ) -> Tuple[str, list]:
+        """
+        WHERE для операций над диапазоном. exclude_ids — перенесённые оригиналы
+        (ScheduleChangeLogRepo.moved_away_ids): их статус moved такой же, как
+        у копии, а время уже свободно — трогать их нельзя. Список передаётся
+        одним JSON-параметром, без ограничения на число ?.
+        """
+        where = "date BETWEEN ? AND ? AND status != 'canceled'"
+        params: list = [start.isoformat(), end.isoformat()]
+        if exclude_ids:
+            where += " AND id NOT IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(sorted(exclude_ids)))
+        if place is not None:
+            where += " AND place = ?"
+            params.append(place)
+        if trainer_id is not None:
+            where += " AND trainer_id = ?"
+            params.append(trainer_id)
+        return where, params
+
+    async def _select_values(self, columns: Tuple[str, ...], where: str, params: list) -> Dict[int, Dict[str, Any]]:
+        cur = await self.conn.execute(
+            f"SELECT {', '.join(('id',) + columns)} FROM training_instances WHERE {where}",
+            params,
+        )
+        rows = await cur.fetchall()
+        await cur.close()
+        return {row[0]: dict(zip(columns, row[1:])) for row in rows}
+
+    async def cancel_range(
+        self,
+        start: date,
+        end: date,
+        reason: str,
+        place: Optional[str] = None,
+        exclude_ids: Collection[int] = (),
+    ) -> Dict[int, Dict[str, Any]]:
+        """Отменить занятия диапазона. Возвращает {id: старые status/comment}."""
+        where, params = self._range_filter(start, end, place=place, exclude_ids=exclude_ids)
+        old = await self._select_values(("status", "comment"), where, params)
+        if old:
+            await self.conn.execute(
+                f"UPDATE training_instances SET status = 'canceled', comment = ? WHERE {where}",
+                [reason] + params,
+            )
+        return old
+
+    async def shift_range(
+        self,
+        start: date,
+        end: date,
+        minutes: int,
+        place: Optional[str] = None,
+        trainer_id: Optional[int] = None,
+        exclude_ids: Collection[int] = (),
+    ) -> Tuple[Dict[int, Dict[str, Any]], List[int]]:
+        """
+        Сдвинуть начало занятий на minutes (может быть < 0).
+        Занятия, которые после сдвига начались бы до полуночи или закончились
+        бы после неё, не сдвигаются. Возвращает ({id: старое start_time}, id пропущенных).
+        """
+        where, params = self._range_filter(
+            start, end, place=place, trainer_id=trainer_id, exclude_ids=exclude_ids
+        )
+        fits = f"{START_MINUTES_SQL} + ? BETWEEN 0 AND 1440 - duration_minutes"
+
+        old = await self._select_values(("start_time",), f"{where} AND {fits}", params + [minutes])
+        skipped = await self._select_values((), f"{where} AND NOT ({fits})", params + [minutes])
+        if old:
+            await self.conn.execute(
+                f"""
+                UPDATE training_instances
+                SET start_time = strftime('%H:%M', start_time, ?)
+                WHERE {where} AND {fits}
+                """,
+                [f"{minutes:+d} minutes"] + params + [minutes],
+            )
+        return old, sorted(skipped)
+
+    async def reassign_trainer_range(
+        self,
+        start: date,
+        end: date,
+        from_trainer: int,
+        to_trainer: int,
+        place: Optional[str] = None,
+        exclude_ids: Collection[int] = (),
+    ) -> Dict[int, Dict[str, Any]]:
+        """Передать занятия тренера from_trainer тренеру to_trainer."""
+        where, params = self._range_filter(
+            start, end, place=place, trainer_id=from_trainer, exclude_ids=exclude_ids
+        )
+        old = await self._select_values(("trainer_id",), where, params)
+        if old:
+            await self.conn.execute(
+                f"UPDATE training_instances SET trainer_id = ? WHERE {where}",
+                [to_trainer] + params,
+            )
+        return old
 
 
 # ---------------------------------------------------------
 # ScheduleChangeLogRepo
 # ---------------------------------------------------------
 
+# курсор keyset-пагинации: (timestamp, id) последней показанной записи
+LogCursor = Tuple[str, int]
+
+# архив журнала: одна таблица на месяц, schedule_change_log_YYYY_MM
+ARCHIVE_TABLE_PREFIX = "schedule_change_log_"
+_MONTH_RE = re.compile(r"(\d{4})-(\d{2})")
+
+
+def archive_table_name(month: str) -> str:
+    """'2024-03' -> 'schedule_change_log_2024_03'."""
+    m = _MONTH_RE.fullmatch(month)
+    if not m:
+        raise ValueError(f"Bad archive month: {month!r}")
+    return f"{ARCHIVE_TABLE_PREFIX}{m.group(1)}_{m.group(2)}"
+
+
+def _next_month(month: str) -> str:
+    year, mon = map(int, month.split("-"))
+    return f"{year + mon // 12:04d}-{mon % 12 + 1:02d}"
+
+
 class ScheduleChangeLogRepo:
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: aiosqlite.Connection):
         self.conn = conn
 
-    def add(self, log: ScheduleChangeLog) -> int:
-        cur = self.conn.cursor()
-        cur.execute(
+    @staticmethod
+    def _decode(row) -> ScheduleChangeLog:
+        return ScheduleChangeLog(
+            id=row[0],
+            training_id=row[1],
+            admin_user_id=row[2],
+            change_type=row[3],
+            old_value=json.loads(row[4]) if row[4] else None,
+            new_value=json.loads(row[5]) if row[5] else None,
+            timestamp=datetime.fromisoformat(row[6]),
+            prev_log_id=row[7],
+        )
+
+    async def latest_id(self, training_id: int) -> Optional[int]:
+        """
+        id последней записи по занятию. Архивы просматриваются (новые —
+        первыми), только если в основной таблице записей по занятию нет.
+        """
+        sql = """
+            SELECT id FROM {table}
+            WHERE training_id = ?
+            ORDER BY timestamp DESC, id DESC
+            LIMIT 1
+        """
+        cur = await self.conn.execute(sql.format(table="schedule_change_log"), (training_id,))
+        row = await cur.fetchone()
+        await cur.close()
+        if row:
+            return row[0]
+
+        for table in (await self.archive_tables())[::-1]:
+            cur = await self.conn.execute(sql.format(table=table), (training_id,))
+            row = await cur.fetchone()
+            await cur.close()
+            if row:
+                return row[0]
+        return None
+
+    async def add(self, log: ScheduleChangeLog) -> int:
+        """
+        Добавить запись. prev_log_id, если не задан, — последняя запись
+        по тому же занятию: цепочка версий для восстановления истории.
+        У записи о создании (old_value=None) и групповой записи
+        (training_id=GROUP_LOG_TRAINING_ID) предшественника нет — их не ищем.
+        """
+        if (
+            log.prev_log_id is None
+            and log.old_value is not None
+            and log.training_id != GROUP_LOG_TRAINING_ID
+        ):
+            log.prev_log_id = await self.latest_id(log.training_id)
+
+        cur = await self.conn.execute(
             """
             INSERT INTO schedule_change_log
-            (training_id, admin_user_id, change_type, old_value, new_value, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
+            (training_id, admin_user_id, change_type, old_value, new_value, timestamp, prev_log_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 log.training_id,
                 log.admin_user_id,
                 log.change_type,
-                json.dumps(log.old_value, default=str) if log.old_value else None,
-                json.dumps(log.new_value, default=str) if log.new_value else None,
+                # пустой diff ({}) — не то же самое, что None (создание занятия)
+                json.dumps(log.old_value, ensure_ascii=False, default=str) if log.old_value is not None else None,
+                json.dumps(log.new_value, ensure_ascii=False, default=str) if log.new_value is not None else None,
                 log.timestamp.isoformat(),
+                log.prev_log_id,
             ),
         )
-        self.conn.commit()
-        return cur.lastrowid
+        log_id = cur.lastrowid
+        await cur.close()
+        return log_id
 
-    def get_by_training(self, training_id: int) -> List[ScheduleChangeLog]:
-        cur = self.conn.cursor()
-        rows = cur.execute(
-            """
+    async def get_by_training(
+        self,
+        training_id: int,
+        include_archive: bool = False,
+        include_groups: bool = False,
+    ) -> List[ScheduleChangeLog]:
+        """
+        История одного занятия, новые записи первыми.
+        include_archive=True — плюс записи, перенесённые в помесячные архивы.
+        include_groups=True — плюс групповые записи (операции над диапазоном),
+        в old_value которых есть это занятие.
+        """
+        tables = ["schedule_change_log"]
+        if include_archive:
+            tables += await self.archive_tables()
+
+        where = "training_id=?"
+        params: tuple = (training_id,)
+        if include_groups:
+            where = "(training_id=? OR (training_id=? AND json_type(old_value, ?) IS NOT NULL))"
+            params = (training_id, GROUP_LOG_TRAINING_ID, f'$."{training_id}"')
+
+        union = "\nUNION ALL\n".join(
+            f"""
             SELECT id, training_id, admin_user_id, change_type,
-                   old_value, new_value, timestamp
-            FROM schedule_change_log
-            WHERE training_id=?
-            ORDER BY timestamp DESC
-            """,
-            (training_id,),
-        ).fetchall()
-
-        result = []
-        for row in rows:
-            result.append(
-                ScheduleChangeLog(
-                    id=row[0],
-                    training_id=row[1],
-                    admin_user_id=row[2],
-                    change_type=row[3],
-                    old_value=json.loads(row[4]) if row[4] else None,
-                    new_value=json.loads(row[5]) if row[5] else None,
-                    timestamp=datetime.fromisoformat(row[6]),
-                )
+                   old_value, new_value, timestamp, prev_log_id
+            FROM {table}
+            WHERE {where}
+            """
+            for table in tables
+        )
+        cur = await self.conn.execute(
+            f"{union}\nORDER BY timestamp DESC, id DESC",
+            params * len(tables),
+        )
+        rows = await cur.fetchall()
+        await cur.close()
+
+        return [self._decode(row) for row in rows]
+
+    async def moved_away_ids(self, start: date, end: date) -> Set[int]:
+        """
+        id перенесённых занятий-оригиналов с датой в [start, end].
+        Статус moved у оригинала и копии одинаковый; отличает их запись
+        журнала о создании копии: old_value IS NULL, new_value.moved_from —
+        или, в старом формате (полные снимки), единственная запись moved
+        под id копии с полным снимком оригинала в old_value (old_value.id).
+        Копия всегда на той же дате, что и оригинал.
+        """
+        result: Set[int] = set()
+        for table in ["schedule_change_log"] + await self.archive_tables():
+            cur = await self.conn.execute(
+                f"""
+                SELECT CASE WHEN old_value IS NULL
+                            THEN json_extract(new_value, '$.moved_from')
+                            ELSE json_extract(old_value, '$.id') END
+                FROM {table}
+                WHERE change_type = 'moved'
+                  AND (old_value IS NULL OR json_type(old_value, '$.id') = 'integer')
+                  AND training_id IN (SELECT id FROM training_instances WHERE date BETWEEN ? AND ?)
+                """,
+                (start.isoformat(), end.isoformat()),
             )
+            result.update(row[0] for row in await cur.fetchall() if row[0] is not None)
+            await cur.close()
         return result
 
-    def get_all(self, limit: int = 100) -> List[ScheduleChangeLog]:
-        cur = self.conn.cursor()
-        rows = cur.execute(
-            f"""
+    async def get_all(self, limit: int = 100) -> List[ScheduleChangeLog]:
+        cur = await self.conn.execute(
+            """
             SELECT id, training_id, admin_user_id, change_type,
-                   old_value, new_value, timestamp
+                   old_value, new_value, timestamp, prev_log_id
             FROM schedule_change_log
-            ORDER BY timestamp DESC
+            ORDER BY timestamp DESC, id DESC
             LIMIT ?
             """,
             (limit,),
-        ).fetchall()
+        )
+        rows = await cur.fetchall()
+        await cur.close()
+
+        return [self._decode(row) for row in rows]
+
+    # ----------------- keyset-пагинация -----------------
+    @staticmethod
+    def _keyset_where(before: Optional[LogCursor], training_id: Optional[int]) -> Tuple[str, tuple]:
+        """
+        WHERE для страницы «старше курсора». Отдельное timestamp <= ? даёт
+        SQLite диапазон по индексу (timestamp) / (training_id, timestamp) —
+        страница читается с курсора, без OFFSET и без скана всего журнала.
+        """
+        clauses, params = [], []
+        if training_id is not None:
+            clauses.append("l.training_id = ?")
+            params.append(training_id)
+        if before is not None:
+            ts, log_id = before
+            clauses.append("l.timestamp <= ? AND (l.timestamp < ? OR l.id < ?)")
+            params += [ts, ts, log_id]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, tuple(params)
+
+    async def get_page(
+        self,
+        limit: int = 20,
+        before: Optional[LogCursor] = None,
+        training_id: Optional[int] = None,
+    ) -> Tuple[List[ScheduleChangeLog], Optional[LogCursor]]:
+        """
+        Страница журнала (новые первыми) с payload.
+        Возвращает (записи, курсор следующей страницы или None).
+        """
+        where, params = self._keyset_where(before, training_id)
+        cur = await self.conn.execute(
+            f"""
+            SELECT l.id, l.training_id, l.admin_user_id, l.change_type,
+                   l.old_value, l.new_value, l.timestamp, l.prev_log_id
+            FROM schedule_change_log l
+            {where}
+            ORDER BY l.timestamp DESC, l.id DESC
+            LIMIT ?
+            """,
+            params + (limit + 1,),
+        )
+        rows = await cur.fetchall()
+        await cur.close()
+
+        next_cursor = (rows[limit - 1][6], rows[limit - 1][0]) if len(rows) > limit else None
+        return [self._decode(row) for row in rows[:limit]], next_cursor
+
+    async def get_summary_page(
+        self,
+        limit: int = 20,
+        before: Optional[LogCursor] = None,
+        training_id: Optional[int] = None,
+    ) -> Tuple[List[ScheduleChangeSummary], Optional[LogCursor]]:
+        """
+        То же, что get_page, но без old_value/new_value: payload не читается
+        и не декодируется. Дата и время занятия берутся из training_instances.
+        """
+        where, params = self._keyset_where(before, training_id)
+        cur = await self.conn.execute(
+            f"""
+            SELECT l.id, l.training_id, l.admin_user_id, l.change_type, l.timestamp,
+                   i.date, i.start_time
+            FROM schedule_change_log l
+            LEFT JOIN training_instances i ON i.id = l.training_id
+            {where}
+            ORDER BY l.timestamp DESC, l.id DESC
+            LIMIT ?
+            """,
+            params + (limit + 1,),
+        )
+        rows = await cur.fetchall()
+        await cur.close()
 
+        next_cursor = (rows[limit - 1][4], rows[limit - 1][0]) if len(rows) > limit else None
         return [
-            ScheduleChangeLog(
+            ScheduleChangeSummary(
                 id=row[0],
                 training_id=row[1],
                 admin_user_id=row[2],
                 change_type=row[3],
-                old_value=json.loads(row[4]) if row[4] else None,
-                new_value=json.loads(row[5]) if row[5] else None,
-                timestamp=datetime.fromisoformat(row[6]),
+                timestamp=datetime.fromisoformat(row[4]),
+                training_date=parse_date(row[5]) if row[5] else None,
+                training_start_time=parse_time(row[6]) if row[6] else None,
             )
-            for row in rows
-        ]
+            for row in rows[:limit]
+        ], next_cursor
+
+    # ----------------- архив -----------------
+    async def archive_tables(self) -> List[str]:
+        cur = await self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ? ORDER BY name",
+            (ARCHIVE_TABLE_PREFIX + "[0-9][0-9][0-9][0-9]_[0-9][0-9]",),
+        )
+        rows = await cur.fetchall()
+        await cur.close()
+        return [row[0] for row in rows]
+
+    async def archive_before(self, cutoff: datetime) -> Dict[str, int]:
+        """
+        Перенести записи старше cutoff в помесячные таблицы.
+        Вызывать внутри UnitOfWork.transaction(): перенос и удаление атомарны.
+        Возвращает {таблица архива: перенесено строк}.
+        """
+        cutoff_iso = cutoff.isoformat()
+        cur = await self.conn.execute(
+            "SELECT DISTINCT substr(timestamp, 1, 7) FROM schedule_change_log WHERE timestamp < ?",
+            (cutoff_iso,),
+        )
+        months = [row[0] for row in await cur.fetchall()]
+        await cur.close()
+        if not months:
+            return {}
+
+        moved: Dict[str, int] = {}
+        for month in months:
+            table = archive_table_name(month)
+            await self.conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY,
+                    training_id INTEGER NOT NULL,
+                    admin_user_id INTEGER NOT NULL,
+                    change_type TEXT NOT NULL,
+                    old_value TEXT,
+                    new_value TEXT,
+                    timestamp TEXT NOT NULL,
+                    prev_log_id INTEGER
+                )
+                """
+            )
+            await self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_training ON {table}(training_id, timestamp)"
+            )
+            cur = await self.conn.execute(
+                f"""
+                INSERT OR IGNORE INTO {table}
+                SELECT id, training_id, admin_user_id, change_type,
+                       old_value, new_value, timestamp, prev_log_id
+                FROM schedule_change_log
+                WHERE timestamp >= ? AND timestamp < ? AND timestamp < ?
+                """,
+                (month, _next_month(month), cutoff_iso),
+            )
+            moved[table] = cur.rowcount
+            await cur.close()
+
+        await self.conn.execute("DELETE FROM schedule_change_log WHERE timestamp < ?", (cutoff_iso,))
+        return moved
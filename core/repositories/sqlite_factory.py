@@ -0,0 +1,72 @@
+# core/repositories/sqlite_factory.py
+"""
+Общая фабрика aiosqlite-соединений для users.db и club_schedule.db.
+
+Все хранилища открываются через open_connection(), чтобы настройки
+(WAL, synchronous, mmap, кеш, busy_timeout, temp_store) задавались
+в одном месте — в config.py.
+"""
+import logging
+from pathlib import Path
+from typing import Dict, Any
+
+import aiosqlite
+
+from config import (
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_MMAP_SIZE,
+    SQLITE_CACHE_SIZE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_TEMP_STORE,
+)
+
+logger = logging.getLogger(__name__)
+
+SYNCHRONOUS_NAMES = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+TEMP_STORE_NAMES = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+
+
+async def read_settings(conn: aiosqlite.Connection) -> Dict[str, Any]:
+    """Фактические значения PRAGMA для соединения."""
+    settings = {}
+    for name in ("journal_mode", "synchronous", "mmap_size", "cache_size", "busy_timeout", "temp_store"):
+        cur = await conn.execute(f"PRAGMA {name}")
+        row = await cur.fetchone()
+        await cur.close()
+        settings[name] = row[0] if row else None
+
+    settings["synchronous"] = SYNCHRONOUS_NAMES.get(settings["synchronous"], settings["synchronous"])
+    settings["temp_store"] = TEMP_STORE_NAMES.get(settings["temp_store"], settings["temp_store"])
+    return settings
+
+
+async def open_connection(db_path) -> aiosqlite.Connection:
+    """Открыть соединение и применить PRAGMA из config.py."""
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = await aiosqlite.connect(db_path)
+
+    # busy_timeout первым: смена journal_mode требует блокировки файла
+    await conn.execute(f"PRAGMA busy_timeout = {int(SQLITE_BUSY_TIMEOUT_MS)}")
+    await conn.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+    await conn.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    await conn.execute(f"PRAGMA mmap_size = {int(SQLITE_MMAP_SIZE)}")
+    await conn.execute(f"PRAGMA cache_size = {int(SQLITE_CACHE_SIZE)}")
+    await conn.execute(f"PRAGMA temp_store = {SQLITE_TEMP_STORE}")
+
+    settings = await read_settings(conn)
+    logger.info(
+        "SQLite %s: %s",
+        Path(db_path).name,
+        ", ".join(f"{k}={v}" for k, v in settings.items()),
+    )
+    return conn
+
+
+async def close_connection(conn: aiosqlite.Connection):
+    """PRAGMA optimize перед закрытием, затем закрыть соединение."""
+    try:
+        await conn.execute("PRAGMA optimize")
+    except Exception as e:
+        logger.warning("PRAGMA optimize failed: %s", e)
+    await conn.close()
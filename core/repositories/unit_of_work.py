@@ -0,0 +1,54 @@
+# core/repositories/unit_of_work.py
+"""
+Единица работы для репозиториев расписания на общем aiosqlite-соединении.
+
+Репозитории сами не делают commit: операция сервиса открывает
+transaction(), выполняет все записи и фиксирует их одним commit
+(или откатывает целиком при исключении).
+
+Соединение одно на весь бот, поэтому транзакции сериализуются
+asyncio.Lock — иначе записи чужой корутины попали бы в нашу транзакцию
+(и в её rollback). Вложенный transaction() в той же задаче просто
+присоединяется к внешней.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiosqlite
+
+
+class UnitOfWork:
+    def __init__(self, conn: aiosqlite.Connection):
+        self.conn = conn
+        self._lock = asyncio.Lock()
+        self._owner: Optional[asyncio.Task] = None
+        self.commits = 0
+        self.rollbacks = 0
+
+    @property
+    def active(self) -> bool:
+        """Идёт ли сейчас транзакция (её незафиксированные записи видны на соединении)."""
+        return self._owner is not None
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        task = asyncio.current_task()
+        if self._owner is task:
+            yield self.conn
+            return
+
+        async with self._lock:
+            self._owner = task
+            try:
+                await self.conn.execute("BEGIN")
+                try:
+                    yield self.conn
+                except BaseException:
+                    await self.conn.rollback()
+                    self.rollbacks += 1
+                    raise
+                await self.conn.commit()
+                self.commits += 1
+            finally:
+                self._owner = None
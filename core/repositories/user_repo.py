@@ -1,11 +1,35 @@
 # core/repositories/user_repo.py
 # core/repositories/user_repo.py
 import aiosqlite
-from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple, Dict, Iterable, AsyncIterator
 from datetime import datetime, timezone
 
 from core.models.user import User
+from core.repositories.sqlite_factory import open_connection, close_connection
+
+
+# максимум параметров в одном IN (...) — с запасом до SQLITE_MAX_VARIABLE_NUMBER
+MAX_SQL_PARAMS = 500
+
+USER_COLUMNS = """user_id, username, full_name,
+                   fio, birth_date, gender, phone, email,
+                   created_at, updated_at"""
+
+
+def user_from_row(_cursor, row) -> User:
+    """row_factory курсора: строка SELECT {USER_COLUMNS} → User."""
+    return User(
+        user_id=row[0],
+        username=row[1],
+        full_name=row[2],
+        fio=row[3],
+        birth_date=row[4],
+        gender=row[5],
+        phone=row[6],
+        email=row[7],
+        created_at=row[8],
+        updated_at=row[9]
+    )
 
 
 def utc_now_iso() -> str:
@@ -22,8 +46,7 @@ class UserRepository:
 
     @classmethod
     async def create(cls, db_path: str):
-        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        conn = await aiosqlite.connect(db_path)
+        conn = await open_connection(db_path)
 
         await conn.execute(
             """
@@ -47,62 +70,96 @@ class UserRepository:
 
     async def get_all_users(self) -> List[User]:
         cursor = await self.conn.execute(
-            """
-            SELECT user_id, username, full_name,
-                   fio, birth_date, gender, phone, email,
-                   created_at, updated_at
+            f"""
+            SELECT {USER_COLUMNS}
             FROM users
             ORDER BY fio ASC, full_name ASC, username ASC
             """
         )
-        rows = await cursor.fetchall()
+        cursor.row_factory = user_from_row
+        users = await cursor.fetchall()
         await cursor.close()
+        return users
 
-        users = [
-            User(
-                user_id=row[0],
-                username=row[1],
-                full_name=row[2],
-                fio=row[3],
-                birth_date=row[4],
-                gender=row[5],
-                phone=row[6],
-                email=row[7],
-                created_at=row[8],
-                updated_at=row[9]
-            )
-            for row in rows
-        ]
+    async def iter_users(self, batch_size: int = 500) -> AsyncIterator[User]:
+        """
+        Потоковое чтение всех пользователей (в порядке fio, full_name, username)
+        пачками по batch_size строк — без загрузки таблицы в память.
+        """
+        cursor = await self.conn.execute(
+            f"""
+            SELECT {USER_COLUMNS}
+            FROM users
+            ORDER BY fio ASC, full_name ASC, username ASC
+            """
+        )
+        cursor.row_factory = user_from_row
+        try:
+            while True:
+                users = await cursor.fetchmany(batch_size)
+                if not users:
+                    break
+                for user in users:
+                    yield user
+        finally:
+            await cursor.close()
+
+    async def count(self) -> int:
+        cur = await self.conn.execute("SELECT COUNT(*) FROM users")
+        row = await cur.fetchone()
+        await cur.close()
+        return row[0]
+
+    async def get_page(self, offset: int, limit: int) -> List[User]:
+        """Страница списка пользователей в том же порядке, что и get_all_users."""
+        cursor = await self.conn.execute(
+            f"""
+            SELECT {USER_COLUMNS}
+            FROM users
+            ORDER BY fio ASC, full_name ASC, username ASC
+            LIMIT ? OFFSET ?
+            """,
+            (limit, offset)
+        )
+        cursor.row_factory = user_from_row
+        users = await cursor.fetchall()
+        await cursor.close()
         return users
 
     async def get(self, user_id: int) -> Optional[User]:
         cur = await self.conn.execute(
-            """
-            SELECT user_id, username, full_name,
-                   fio, birth_date, gender, phone, email,
-                   created_at, updated_at
+            f"""
+            SELECT {USER_COLUMNS}
             FROM users WHERE user_id = ?
             """,
             (user_id,)
         )
-        row = await cur.fetchone()
+        cur.row_factory = user_from_row
+        user = await cur.fetchone()
         await cur.close()
+        return user
 
-        if not row:
-            return None
-
-        return User(
-            user_id=row[0],
-            username=row[1],
-            full_name=row[2],
-            fio=row[3],
-            birth_date=row[4],
-            gender=row[5],
-            phone=row[6],
-            email=row[7],
-            created_at=row[8],
-            updated_at=row[9]
-        )
+    async def get_many(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Пользователи по списку ID одним запросом WHERE user_id IN (...)."""
+        ids = list(dict.fromkeys(user_ids))
+        result: Dict[int, User] = {}
+
+        # SQLite ограничивает число параметров запроса — режем на пачки
+        for i in range(0, len(ids), MAX_SQL_PARAMS):
+            chunk = ids[i:i + MAX_SQL_PARAMS]
+            placeholders = ", ".join("?" for _ in chunk)
+            cur = await self.conn.execute(
+                f"""
+                SELECT {USER_COLUMNS}
+                FROM users WHERE user_id IN ({placeholders})
+                """,
+                chunk
+            )
+            cur.row_factory = user_from_row
+            for user in await cur.fetchall():
+                result[user.user_id] = user
+            await cur.close()
+        return result
 
     async def upsert(self, user: User):
         """
@@ -171,6 +228,72 @@ class UserRepository:
         await self.conn.execute(sql, values)
         await self.conn.commit()
 
+    async def update_profiles(self, profiles: List[Tuple[int, Optional[str], Optional[str]]]):
+        """
+        Пакетное обновление Telegram-полей (user_id, username, full_name)
+        одной транзакцией.
+        """
+        if not profiles:
+            return
+
+        now = utc_now_iso()
+        await self.conn.executemany(
+            "UPDATE users SET username = ?, full_name = ?, updated_at = ? WHERE user_id = ?",
+            [(username, full_name, now, user_id) for user_id, username, full_name in profiles]
+        )
+        await self.conn.commit()
+
+    async def upsert_many(self, users: List[User]) -> int:
+        """
+        Пакетная вставка/обновление одной транзакцией (executemany).
+        При конфликте по user_id пустые поля из пачки не затирают
+        уже сохранённые значения, created_at существующей записи не меняется.
+        """
+        if not users:
+            return 0
+
+        now = utc_now_iso()
+        try:
+            await self.conn.executemany(
+                """
+                INSERT INTO users(
+                    user_id, username, full_name,
+                    fio, birth_date, gender, phone, email,
+                    created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    username=COALESCE(excluded.username, users.username),
+                    full_name=COALESCE(excluded.full_name, users.full_name),
+                    fio=COALESCE(excluded.fio, users.fio),
+                    birth_date=COALESCE(excluded.birth_date, users.birth_date),
+                    gender=COALESCE(excluded.gender, users.gender),
+                    phone=COALESCE(excluded.phone, users.phone),
+                    email=COALESCE(excluded.email, users.email),
+                    updated_at=excluded.updated_at
+                """,
+                [
+                    (
+                        u.user_id,
+                        u.username,
+                        u.full_name,
+                        u.fio,
+                        u.birth_date,
+                        u.gender,
+                        u.phone,
+                        u.email,
+                        u.created_at or now,
+                        u.updated_at or now
+                    )
+                    for u in users
+                ]
+            )
+            await self.conn.commit()
+        except Exception:
+            await self.conn.rollback()
+            raise
+        return len(users)
+
     async def close(self):
-        await self.conn.close()
+        await close_connection(self.conn)
 
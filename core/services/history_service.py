@@ -1,5 +1,34 @@
-﻿\"\"\"History service.\"\"\"
+﻿# core/services/history_service.py
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from core.models.schedule import ScheduleChangeLog, ScheduleChangeSummary
+from core.repositories.schedule_repo import ScheduleChangeLogRepo, LogCursor
+from core.repositories.unit_of_work import UnitOfWork
+
 
 class HistoryService:
-    def __init__(self, repo):
+    """Просмотр журнала изменений расписания и его архивирование."""
+
+    def __init__(self, repo: ScheduleChangeLogRepo, uow: Optional[UnitOfWork] = None):
         self.repo = repo
+        self.uow = uow or UnitOfWork(repo.conn)
+
+    async def recent(
+        self,
+        page_size: int = 20,
+        before: Optional[LogCursor] = None,
+        training_id: Optional[int] = None,
+    ) -> Tuple[List[ScheduleChangeSummary], Optional[LogCursor]]:
+        """Страница сводки (без payload), новые первыми, и курсор следующей."""
+        return await self.repo.get_summary_page(page_size, before=before, training_id=training_id)
+
+    async def details(self, training_id: int, include_archive: bool = False) -> List[ScheduleChangeLog]:
+        """Полная история одного занятия с old/new значениями (включая групповые операции)."""
+        return await self.repo.get_by_training(training_id, include_archive=include_archive, include_groups=True)
+
+    async def archive_old(self, retention_days: int, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Перенести в помесячные архивы записи старше retention_days."""
+        cutoff = (now or datetime.now()) - timedelta(days=retention_days)
+        async with self.uow.transaction():
+            return await self.repo.archive_before(cutoff)
@@ -1,18 +1,137 @@
-﻿\"\"\"Poll service.\"\"\"
-
-from core.models.poll import Poll
+﻿# core/services/poll_service.py
+import logging
 from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from core.models.poll import Poll, PollVote, POLL_ANSWERS
+from core.repositories.poll_repo import PollRepository
+from core.repositories.unit_of_work import UnitOfWork
+
+logger = logging.getLogger(__name__)
+
 
 class PollService:
-    def __init__(self, history_repo):
-        self.history_repo = history_repo
+    """
+    Опросы посещаемости в групповых чатах.
+
+    - активные опросы держатся в памяти, голоса — dict по user_id:
+      повторный голос отсекается за O(1) без обращения к БД;
+    - новый или изменённый голос — одна дописанная строка poll_votes;
+    - сообщение опроса на каждый голос не правится: изменённые опросы
+      копятся в dirty-наборе, telegram/tasks/poll_updater.py раз в
+      интервал перерисовывает каждое сообщение не больше одного раза.
+    """
+
+    def __init__(self, repo: PollRepository, uow: Optional[UnitOfWork] = None):
+        self.repo = repo
+        # общий UnitOfWork соединения club_schedule.db (см. ScheduleService)
+        self.uow = uow or UnitOfWork(repo.conn)
+        self._polls: Dict[int, Poll] = {}
+        # закрытые опросы, чьё финальное сообщение ещё не перерисовано
+        self._closed: Dict[int, Poll] = {}
+        self._dirty: Set[int] = set()
+
+    async def load_active(self) -> int:
+        """Поднять активные опросы из БД (после рестарта бота)."""
+        self._polls = {p.id: p for p in await self.repo.get_active()}
+        return len(self._polls)
 
-    def create_poll(self, chat_id, command, expires_at):
-        poll = Poll(chat_id=chat_id, message_id=None, command=command, expires_at=expires_at)
-        self.history_repo.add_poll(poll)
+    def get(self, poll_id: int) -> Optional[Poll]:
+        return self._polls.get(poll_id)
+
+    async def create_poll(self, chat_id: int, command: str, expires_at: datetime) -> Poll:
+        poll = Poll(id=None, chat_id=chat_id, message_id=None, command=command, expires_at=expires_at)
+        async with self.uow.transaction():
+            poll.id = await self.repo.add(poll)
+        self._polls[poll.id] = poll
         return poll
 
-    def add_vote(self, poll, user):
-        if user not in poll.participants:
-            poll.participants.append(user)
-            self.history_repo.update_poll(poll)
+    async def attach_message(self, poll_id: int, message_id: int):
+        """Запомнить сообщение опроса — его будет править poll_updater."""
+        async with self.uow.transaction():
+            await self.repo.set_message_id(poll_id, message_id)
+        poll = self._polls.get(poll_id)
+        if poll is not None:
+            poll.message_id = message_id
+
+    async def add_vote(
+        self,
+        poll_id: int,
+        user_id: int,
+        username: Optional[str],
+        full_name: Optional[str],
+        answer: str,
+        now: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Учесть голос. False — пользователь уже голосовал так же (ничего не пишется).
+        ValueError — опроса нет, он закрыт или ответ неизвестен.
+        """
+        if answer not in POLL_ANSWERS:
+            raise ValueError(f"Unknown poll answer: {answer}")
+        now = now or datetime.now()
+        poll = self._polls.get(poll_id)
+        if poll is None or not poll.active or now >= poll.expires_at:
+            raise ValueError("Poll not found or closed")
+
+        current = poll.votes.get(user_id)
+        if current is not None and current.answer == answer:
+            return False
+
+        vote = PollVote(
+            poll_id=poll_id,
+            user_id=user_id,
+            username=username,
+            full_name=full_name,
+            answer=answer,
+            voted_at=now,
+        )
+        async with self.uow.transaction():
+            # под блокировкой заново: тот же пользователь мог нажать дважды
+            current = poll.votes.get(user_id)
+            if current is not None and current.answer == answer:
+                return False
+            vote.id = await self.repo.add_vote(vote)
+        # транзакции сериализованы, а между commit и этой строкой нет await —
+        # порядок голосов в памяти совпадает с порядком id в poll_votes
+        poll.votes[user_id] = vote
+        self._dirty.add(poll_id)
+        return True
+
+    async def close_expired(self, now: Optional[datetime] = None) -> List[Poll]:
+        """Закрыть истёкшие опросы одной транзакцией; их сообщения перерисуются как закрытые."""
+        now = now or datetime.now()
+        expired = [p for p in self._polls.values() if now >= p.expires_at]
+        if not expired:
+            return []
+        async with self.uow.transaction():
+            for poll in expired:
+                await self.repo.close(poll.id)
+        for poll in expired:
+            poll.active = False
+            del self._polls[poll.id]
+            self._closed[poll.id] = poll
+            self._dirty.add(poll.id)
+        return expired
+
+    def pop_dirty(self) -> List[Poll]:
+        """
+        Опросы, изменившиеся с прошлого вызова и уже имеющие сообщение.
+        Опрос без message_id остаётся в наборе до attach_message.
+        """
+        ready: List[Poll] = []
+        for poll_id in list(self._dirty):
+            poll = self._polls.get(poll_id) or self._closed.get(poll_id)
+            if poll is None:
+                self._dirty.discard(poll_id)
+            elif poll.message_id is not None:
+                ready.append(poll)
+                self._dirty.discard(poll_id)
+                self._closed.pop(poll_id, None)
+        return ready
+
+    def mark_dirty(self, poll: Poll):
+        """Вернуть опрос в очередь перерисовки — например, если правка сообщения не удалась."""
+        if not poll.active:
+            self._closed[poll.id] = poll
+        self._dirty.add(poll.id)
@@ -0,0 +1,110 @@
+# core/services/schedule_conflicts.py
+"""
+Проверка пересечений занятий: один тренер или один зал в одно время.
+
+ConflictIndex строится по занятиям окна дат и держит два IntervalIndex —
+по тренеру и по залу. Время занятия переводится в минуты от начала эры
+(date.toordinal() * 1440 + минуты), поэтому занятие, заходящее за
+полночь, корректно пересекается со следующим днём.
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Collection, Hashable, Iterable, List, Optional, Set, Tuple
+
+from core.models.schedule import TrainingInstance
+from core.utils.intervals import IntervalIndex
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleConflict:
+    kind: str                 # trainer / place
+    key: Hashable             # id тренера или название зала
+    inst_id: Optional[int]    # проверяемое занятие (None — ещё не сохранено)
+    other_id: int             # занятие, с которым пересекается
+
+
+class ScheduleConflictError(ValueError):
+    """Тренер или зал уже заняты в это время."""
+
+    def __init__(self, conflicts: List[ScheduleConflict]):
+        self.conflicts = conflicts
+        details = ", ".join(f"{c.kind} {c.key} busy (#{c.other_id})" for c in conflicts)
+        super().__init__(f"Schedule conflict: {details}")
+
+
+def interval_of(inst: TrainingInstance) -> Tuple[int, int]:
+    start = inst.date.toordinal() * MINUTES_PER_DAY + inst.start_time.hour * 60 + inst.start_time.minute
+    return start, start + inst.duration_minutes
+
+
+class ConflictIndex:
+    """
+    Занятия окна дат [start, end] по тренеру и по залу.
+
+    Время занимают все занятия, кроме отменённых и перенесённых «оригиналов».
+    Статус moved носят и оригинал, и его копия, поэтому оригиналы передаются
+    явно — moved_away (id из журнала, см. ScheduleChangeLogRepo.moved_away_ids).
+    """
+
+    def __init__(
+        self,
+        start: date,
+        end: date,
+        instances: Iterable[TrainingInstance] = (),
+        moved_away: Iterable[int] = (),
+    ):
+        self.start = start
+        self.end = end
+        self.moved_away: Set[int] = set(moved_away)
+        self.by_trainer = IntervalIndex()
+        self.by_place = IntervalIndex()
+        for inst in instances:
+            self.add(inst)
+
+    def covers(self, d: date) -> bool:
+        return self.start <= d <= self.end
+
+    def is_busy(self, inst: TrainingInstance) -> bool:
+        return inst.status != "canceled" and inst.id not in self.moved_away
+
+    def add(self, inst: TrainingInstance):
+        if inst.id is None or not self.is_busy(inst):
+            return
+        start, end = interval_of(inst)
+        self.by_trainer.add(inst.trainer_id, start, end, inst.id)
+        self.by_place.add(inst.place, start, end, inst.id)
+
+    def remove(self, inst: TrainingInstance):
+        if inst.id is None:
+            return
+        start, end = interval_of(inst)
+        self.by_trainer.remove(inst.trainer_id, start, end, inst.id)
+        self.by_place.remove(inst.place, start, end, inst.id)
+
+    def conflicts_for(self, inst: TrainingInstance, ignore: Collection[int] = ()) -> List[ScheduleConflict]:
+        """Пересечения занятия с уже учтёнными (само занятие и ignore не считаются)."""
+        if not self.is_busy(inst):
+            return []
+        start, end = interval_of(inst)
+        skip = set(ignore)
+        if inst.id is not None:
+            skip.add(inst.id)
+        return [
+            ScheduleConflict(kind, key, inst.id, other_id)
+            for kind, key, index in (
+                ("trainer", inst.trainer_id, self.by_trainer),
+                ("place", inst.place, self.by_place),
+            )
+            for other_id in index.overlapping(key, start, end)
+            if other_id not in skip
+        ]
+
+    def report(self) -> List[ScheduleConflict]:
+        """Все пересечения окна: каждая пара один раз для тренера и один — для зала."""
+        return [
+            ScheduleConflict(kind, key, inst_id, other_id)
+            for kind, index in (("trainer", self.by_trainer), ("place", self.by_place))
+            for key, inst_id, other_id in index.overlapping_pairs()
+        ]
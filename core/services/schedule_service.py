@@ -2,22 +2,32 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime
-from typing import List, Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import SCHEDULE_CACHE_SIZE, SCHEDULE_CACHE_TTL
 
 from core.models.schedule import (
     BaseScheduleTemplate,
     TrainingInstance,
     ScheduleChangeLog,
+    GROUP_LOG_TRAINING_ID,
+    log_diff,
 )
 from core.repositories.schedule_repo import (
     BaseScheduleTemplateRepo,
     TrainingInstanceRepo,
     ScheduleChangeLogRepo,
 )
+from core.repositories.unit_of_work import UnitOfWork
+from core.services.schedule_conflicts import ConflictIndex, ScheduleConflict, ScheduleConflictError
+from core.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# индекс пересечений строится на ± столько дней вокруг редактируемой даты
+CONFLICT_WINDOW_DAYS = 31
+
 
 class ScheduleService:
     """
@@ -25,6 +35,8 @@ class ScheduleService:
     - построение актуального расписания
     - создание/изменение/отмена занятий
     - ведение журнала действий
+
+    Каждая изменяющая операция — одна транзакция UnitOfWork (один commit).
     """
 
     def __init__(
@@ -32,20 +44,39 @@ class ScheduleService:
         base_repo: BaseScheduleTemplateRepo,
         inst_repo: TrainingInstanceRepo,
         log_repo: ScheduleChangeLogRepo,
+        uow: Optional[UnitOfWork] = None,
+        cache_size: int = SCHEDULE_CACHE_SIZE,
+        cache_ttl: float = SCHEDULE_CACHE_TTL,
     ):
         self.base_repo = base_repo
         self.inst_repo = inst_repo
         self.log_repo = log_repo
+        # один UnitOfWork на соединение: его нужно передать всем сервисам этой БД
+        self.uow = uow or UnitOfWork(inst_repo.conn)
+        # индекс активных шаблонов {weekday: [шаблоны по времени]} и версия, для которой он построен
+        self._templates_by_weekday: Dict[int, List[BaseScheduleTemplate]] = {}
+        self._templates_key: Optional[Tuple[int, int]] = None
+        # (начало, конец, base_repo.version) — диапазон, заранее заполненный materialize_ahead
+        self._materialized: Optional[Tuple[date, date, int]] = None
+        # снимки расписания по датам для get_schedule_range; сбрасываются
+        # изменяющими операциями (только затронутые даты) и сменой шаблонов
+        self.snapshots: TTLCache[Tuple[TrainingInstance, ...]] = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._snapshots_version = base_repo.version
+        # растёт при каждом сбросе: чтение, начатое до сброса, не кладёт в кеш старые данные
+        self._snapshots_epoch = 0
+        # индекс пересечений по тренеру/залу для окна дат и (uow.rollbacks, base_repo.version) его построения
+        self._conflicts: Optional[ConflictIndex] = None
+        self._conflicts_key: Optional[Tuple[int, int]] = None
 
     # =====================================================================
     #                           ЧТЕНИЕ РАСПИСАНИЯ
     # =====================================================================
 
-    def get_instances_for_date(self, d: date) -> List[TrainingInstance]:
+    async def get_instances_for_date(self, d: date) -> List[TrainingInstance]:
         """Возвращает занятия на дату — то, что есть в базе."""
-        return self.inst_repo.get_by_date(d)
+        return await self.inst_repo.get_by_date(d)
 
-    def build_daily_schedule(self, d: date) -> List[TrainingInstance]:
+    async def build_daily_schedule(self, d: date) -> List[TrainingInstance]:
         """
         Собрать актуальное расписание на день:
         1. Берём недельные шаблоны (для этого weekday)
@@ -56,41 +87,235 @@ class ScheduleService:
             TrainingInstance — это уже финальная форма.
             Логи влияют только на историю.
         """
-        logger.info("Building schedule for %s", d)
+        return (await self.build_schedule_range(d, d))[d]
+
+    async def build_schedule_range(self, start: date, end: date) -> Dict[date, List[TrainingInstance]]:
+        """
+        Собрать расписание на диапазон дат [start, end] (включительно).
+        Шаблоны читаются один раз, существующие занятия — одним запросом
+        BETWEEN, недостающие занятия из шаблонов вставляются одной транзакцией.
+        Возвращает словарь {дата: занятия, отсортированные по времени}
+        для каждой даты диапазона (в том числе пустых).
+        """
+        if end < start:
+            raise ValueError("end date is before start date")
+
+        logger.info("Building schedule for %s..%s", start, end)
+
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        schedule, missing = await self._collect_range(start, end, days)
+
+        if missing:
+            async with self.uow.transaction():
+                # под блокировкой заново: параллельный запрос мог уже вставить занятия
+                schedule, missing = await self._collect_range(start, end, days)
+                for inst, inst_id in zip(missing, await self.inst_repo.add_many(missing)):
+                    inst.id = inst_id
+                    schedule[inst.date].append(inst)
+
+        # Сортировка
+        for instances in schedule.values():
+            instances.sort(key=lambda x: x.start_time)
+
+        return schedule
+
+    async def get_schedule_range(self, start: date, end: date) -> Dict[date, List[TrainingInstance]]:
+        """
+        То же, что build_schedule_range, но для экранов просмотра:
+        - даты, уже лежащие в кеше снимков, отдаются без обращения к БД;
+        - если диапазон заполнен фоновой задачей (materialize_ahead) и шаблоны
+          с тех пор не менялись — только чтение;
+        - иначе обычная сборка с дозаписью недостающих занятий.
+        Возвращённые занятия общие с кешем — их нельзя изменять.
+        """
+        if end < start:
+            raise ValueError("end date is before start date")
+
+        if self.base_repo.version != self._snapshots_version:
+            self.snapshots.clear()
+            self._snapshots_version = self.base_repo.version
+
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        schedule: Dict[date, List[TrainingInstance]] = {}
+        for d in days:
+            snapshot = self.snapshots.get(d)
+            if snapshot is None:
+                break
+            schedule[d] = list(snapshot)
+        else:
+            return schedule
+
+        epoch = self._snapshots_epoch
+        if self._is_materialized(start, end):
+            schedule = {d: [] for d in days}
+            # get_by_date_range уже отсортирован по (date, start_time)
+            for inst in await self.inst_repo.get_by_date_range(start, end):
+                schedule[inst.date].append(inst)
+        else:
+            schedule = await self.build_schedule_range(start, end)
+
+        # во время чужой транзакции соединение видит её незафиксированные записи
+        if epoch == self._snapshots_epoch and not self.uow.active:
+            for d, instances in schedule.items():
+                self.snapshots.set(d, tuple(instances))
+        return schedule
+
+    def _invalidate_dates(self, dates: Iterable[date]):
+        self._snapshots_epoch += 1
+        for d in dates:
+            self.snapshots.invalidate(d)
+
+    def _invalidate_range(self, start: date, end: date):
+        self._invalidate_dates(start + timedelta(days=i) for i in range((end - start).days + 1))
+
+    def snapshot_stats(self) -> dict:
+        """Счётчики кеша снимков расписания (hits, misses, hit_rate, ...)."""
+        return self.snapshots.stats()
+
+    def _is_materialized(self, start: date, end: date) -> bool:
+        if self._materialized is None:
+            return False
+        m_start, m_end, version = self._materialized
+        return version == self.base_repo.version and m_start <= start and end <= m_end
+
+    async def materialize_ahead(self, start: date, end: date, chunk_days: int = 7) -> int:
+        """
+        Создать недостающие занятия из шаблонов на [start, end]. Идемпотентно:
+        уже существующие (в том числе отменённые и перенесённые) не трогаются.
+        Пишет кусками по chunk_days дней — каждая транзакция коротко держит
+        блокировку UnitOfWork и не задерживает админские операции.
+        Возвращает число созданных занятий.
+        """
+        if end < start:
+            raise ValueError("end date is before start date")
+
+        version = self.base_repo.version
+        inserted = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end)
+            days = [chunk_start + timedelta(days=i) for i in range((chunk_end - chunk_start).days + 1)]
+            async with self.uow.transaction():
+                _, missing = await self._collect_range(chunk_start, chunk_end, days)
+                inserted += await self.inst_repo.add_missing(missing)
+            chunk_start = chunk_end + timedelta(days=1)
+
+        self._materialized = (start, end, version)
+        logger.info("Materialized %s..%s: %s new trainings", start, end, inserted)
+        return inserted
+
+    async def _collect_range(self, start: date, end: date, days: List[date]):
+        """Существующие занятия по датам и недостающие занятия из шаблонов."""
+        schedule: Dict[date, List[TrainingInstance]] = {d: [] for d in days}
 
         # 1. Берём то, что уже есть (ручные, переносы, отмены)
-        instances = self.inst_repo.get_by_date(d)
-        has_instances = {i.source_template_id for i in instances if i.source_template_id}
+        for inst in await self.inst_repo.get_by_date_range(start, end):
+            schedule[inst.date].append(inst)
 
         # 2. Подтягиваем weekly templates, если их нет в instances
-        base_templates = self.base_repo.get_active()
+        templates_by_weekday = await self._template_index()
 
-        for t in base_templates:
-            if t.weekday != d.weekday():
-                continue
+        missing: List[TrainingInstance] = []
+        for d in days:
+            has_instances = {i.source_template_id for i in schedule[d] if i.source_template_id}
+            for t in templates_by_weekday.get(d.weekday(), []):
+                if t.id not in has_instances:
+                    missing.append(TrainingInstance.from_template(t, d))
 
-            if t.id not in has_instances:
-                inst = TrainingInstance.from_template(t, d)
-                inst.id = self.inst_repo.add(inst)
-                instances.append(inst)
+        return schedule, missing
 
-        # Сортировка
-        instances.sort(key=lambda x: x.start_time)
+    async def _template_index(self) -> Dict[int, List[BaseScheduleTemplate]]:
+        """
+        Активные шаблоны по дням недели. Строится один раз и перестраивается,
+        только когда меняется base_repo.version (add/set_active) или
+        откатывается транзакция — её изменения шаблонов могли попасть в индекс.
+        Шаблоны, изменённые в БД в обход репозитория (другим процессом),
+        подхватятся после перезапуска бота.
+        """
+        key = (self.base_repo.version, self.uow.rollbacks)
+        if key != self._templates_key:
+            index: Dict[int, List[BaseScheduleTemplate]] = {}
+            for t in await self.base_repo.get_active():
+                index.setdefault(t.weekday, []).append(t)
+            for templates in index.values():
+                templates.sort(key=lambda t: t.start_time)
+            self._templates_by_weekday = index
+            self._templates_key = key
+        return self._templates_by_weekday
+
+    # =====================================================================
+    #                        ПЕРЕСЕЧЕНИЯ ЗАНЯТИЙ
+    # =====================================================================
 
-        return instances
+    async def _conflict_index(self, d: date) -> ConflictIndex:
+        """
+        Индекс пересечений для окна вокруг d (с соседними днями — занятие
+        может заходить за полночь). Вызывается внутри транзакции операции;
+        одиночные правки дальше обновляют его на месте, а откат транзакции
+        или смена шаблонов приводят к перестроению.
+        """
+        key = (self.uow.rollbacks, self.base_repo.version)
+        index = self._conflicts
+        if (
+            index is None
+            or key != self._conflicts_key
+            or not (index.covers(d - timedelta(days=1)) and index.covers(d + timedelta(days=1)))
+        ):
+            start = d - timedelta(days=CONFLICT_WINDOW_DAYS)
+            end = d + timedelta(days=CONFLICT_WINDOW_DAYS)
+            schedule = await self.build_schedule_range(start, end)
+            index = ConflictIndex(
+                start, end,
+                (i for day in schedule.values() for i in day),
+                await self.log_repo.moved_away_ids(start, end),
+            )
+            self._conflicts, self._conflicts_key = index, key
+        return index
+
+    async def _check_conflicts(self, inst: TrainingInstance, ignore: Tuple[int, ...] = ()) -> ConflictIndex:
+        index = await self._conflict_index(inst.date)
+        conflicts = index.conflicts_for(inst, ignore)
+        if conflicts:
+            raise ScheduleConflictError(conflicts)
+        return index
+
+    async def conflict_report(
+        self, year: int, month: int
+    ) -> Tuple[List[ScheduleConflict], Dict[int, TrainingInstance]]:
+        """
+        Все пересечения по тренерам и залам за месяц: (конфликты, занятия по id).
+        Индекс строится один раз на месяц — O(n log n + k) вместо попарного сравнения.
+        """
+        start = date(year, month, 1)
+        end = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+        schedule = await self.get_schedule_range(start, end)
+        instances = {i.id: i for day in schedule.values() for i in day}
+        index = ConflictIndex(start, end, instances.values(), await self.log_repo.moved_away_ids(start, end))
+        report = index.report()
+        report.sort(key=lambda c: (instances[c.inst_id].date, instances[c.inst_id].start_time, c.kind))
+        return report, instances
 
     # =====================================================================
     #                         ЛОГИРОВАНИЕ ИЗМЕНЕНИЙ
     # =====================================================================
 
-    def _log(
+    async def _log(
         self,
         training_id: int,
         admin_user_id: int,
         change_type: str,
-        old_value: dict | None,
-        new_value: dict | None,
+        before: dict | None,
+        after: dict | None,
     ):
+        """
+        В журнал пишутся только изменённые поля. before=None — создание
+        занятия: new_value содержит полный снимок (начальная версия).
+        """
+        if before is None:
+            old_value, new_value = None, after
+        else:
+            old_value, new_value = log_diff(before, after or {})
+
         log_entry = ScheduleChangeLog(
             id=None,
             training_id=training_id,
@@ -100,33 +325,87 @@ class ScheduleService:
             new_value=new_value,
             timestamp=datetime.now(),
         )
-        self.log_repo.add(log_entry)
+        await self.log_repo.add(log_entry)
 
-    # =====================================================================
-    #                        УПРАВЛЕНИЕ ЗАНЯТИЯМИ
-    # =====================================================================
+    async def _log_group(
+        self,
+        admin_user_id: int,
+        change_type: str,
+        old_values: Dict[int, dict],
+        new_value: dict,
+    ):
+        """Одна запись на операцию над диапазоном: старые значения по каждому id."""
+        await self.log_repo.add(ScheduleChangeLog(
+            id=None,
+            training_id=GROUP_LOG_TRAINING_ID,
+            admin_user_id=admin_user_id,
+            change_type=change_type,
+            old_value={str(inst_id): values for inst_id, values in old_values.items()},
+            new_value={**new_value, "ids": sorted(old_values)},
+            timestamp=datetime.now(),
+        ))
 
-    def cancel(self, inst_id: int, admin_id: int, reason: str = ""):
-        """Отменить занятие."""
-        inst = self.inst_repo.get_by_id(inst_id)
-        if not inst:
+    async def get_version(
+        self,
+        inst_id: int,
+        *,
+        at: Optional[datetime] = None,
+        log_id: Optional[int] = None,
+    ) -> Optional[TrainingInstance]:
+        """
+        Состояние занятия в прошлом: на момент at или сразу после записи
+        журнала log_id. Восстанавливается от текущей строки назад — к ней
+        по очереди применяются old_value более поздних записей.
+        None — занятие в тот момент ещё не существовало.
+        """
+        inst = await self.inst_repo.get_by_id(inst_id)
+        if inst is None:
             raise ValueError("TrainingInstance not found")
 
-        old = inst.__dict__.copy()
+        entries = await self.log_repo.get_by_training(inst_id, include_archive=True, include_groups=True)
+        for entry in entries:
+            if entry.id == log_id or (at is not None and entry.timestamp <= at):
+                return inst
+            if entry.training_id == GROUP_LOG_TRAINING_ID:
+                inst = inst.with_log_values(entry.old_value[str(inst_id)])
+                continue
+            if entry.old_value is None:
+                return None
+            inst = inst.with_log_values(entry.old_value)
 
-        inst.status = "canceled"
-        inst.comment = reason
-        self.inst_repo.update(inst)
+        if log_id is not None:
+            raise ValueError(f"Log entry {log_id} does not belong to training {inst_id}")
+        return inst
 
-        self._log(
-            training_id=inst_id,
-            admin_user_id=admin_id,
-            change_type="canceled",
-            old_value=old,
-            new_value=inst.__dict__.copy(),
-        )
+    # =====================================================================
+    #                        УПРАВЛЕНИЕ ЗАНЯТИЯМИ
+    # =====================================================================
 
-    def add_extra(
+    async def cancel(self, inst_id: int, admin_id: int, reason: str = ""):
+        """Отменить занятие."""
+        async with self.uow.transaction():
+            inst = await self.inst_repo.get_by_id(inst_id)
+            if not inst:
+                raise ValueError("TrainingInstance not found")
+
+            before = inst.to_log_dict()
+            self._invalidate_dates([inst.date])
+            if self._conflicts is not None:
+                self._conflicts.remove(inst)
+
+            inst.status = "canceled"
+            inst.comment = reason
+            await self.inst_repo.update(inst)
+
+            await self._log(
+                training_id=inst_id,
+                admin_user_id=admin_id,
+                change_type="canceled",
+                before=before,
+                after=inst.to_log_dict(),
+            )
+
+    async def add_extra(
         self,
         d: date,
         start_time,
@@ -151,19 +430,23 @@ class ScheduleService:
             comment=comment,
         )
 
-        inst.id = self.inst_repo.add(inst)
+        async with self.uow.transaction():
+            index = await self._check_conflicts(inst)
+            self._invalidate_dates([d])
+            inst.id = await self.inst_repo.add(inst)
+            index.add(inst)
 
-        self._log(
-            training_id=inst.id,
-            admin_user_id=admin_id,
-            change_type="added",
-            old_value=None,
-            new_value=inst.__dict__.copy(),
-        )
+            await self._log(
+                training_id=inst.id,
+                admin_user_id=admin_id,
+                change_type="added",
+                before=None,
+                after=inst.to_log_dict(),
+            )
 
-        return inst
+            return inst
 
-    def move(
+    async def move(
         self,
         inst_id: int,
         *,
@@ -175,71 +458,202 @@ class ScheduleService:
         comment: str = "",
     ) -> TrainingInstance:
         """Перенос существующего занятия (создаёт moved-копию)."""
-        inst = self.inst_repo.get_by_id(inst_id)
-        if not inst:
-            raise ValueError("TrainingInstance not found")
-
-        old = inst.__dict__.copy()
-
-        # Создаём новый instance
-        new_inst = inst.moved_copy(
-            new_time=new_time,
-            new_duration=new_duration,
-            new_trainer=new_trainer,
-            new_place=new_place,
-        )
-        new_inst.comment = comment
-
-        new_inst.id = self.inst_repo.add(new_inst)
-
-        # А исходное делаем canceled
-        inst.status = "moved"
-        self.inst_repo.update(inst)
-
-        self._log(
-            training_id=new_inst.id,
-            admin_user_id=admin_id,
-            change_type="moved",
-            old_value=old,
-            new_value=new_inst.__dict__.copy(),
-        )
-
-        return new_inst
+        async with self.uow.transaction():
+            inst = await self.inst_repo.get_by_id(inst_id)
+            if not inst:
+                raise ValueError("TrainingInstance not found")
+
+            before = inst.to_log_dict()
+            # копия остаётся на ту же дату (moved_copy не меняет date)
+            self._invalidate_dates([inst.date])
+
+            # Создаём новый instance
+            new_inst = inst.moved_copy(
+                new_time=new_time,
+                new_duration=new_duration,
+                new_trainer=new_trainer,
+                new_place=new_place,
+            )
+            new_inst.comment = comment
+            # исходное занятие освобождает время — с ним копия не конфликтует
+            index = await self._check_conflicts(new_inst, ignore=(inst.id,))
+
+            new_inst.id = await self.inst_repo.add(new_inst)
+
+            # А исходное помечаем moved
+            index.remove(inst)
+            index.moved_away.add(inst.id)
+            inst.status = "moved"
+            await self.inst_repo.update(inst)
+            index.add(new_inst)
+
+            # две записи: смена статуса исходного и создание копии (со ссылкой на исходное)
+            await self._log(
+                training_id=inst_id,
+                admin_user_id=admin_id,
+                change_type="moved",
+                before=before,
+                after=inst.to_log_dict(),
+            )
+            await self._log(
+                training_id=new_inst.id,
+                admin_user_id=admin_id,
+                change_type="moved",
+                before=None,
+                after={**new_inst.to_log_dict(), "moved_from": inst_id},
+            )
+
+            return new_inst
+
+    async def change_trainer(self, inst_id: int, trainer_id: int, admin_id: int):
+        async with self.uow.transaction():
+            inst = await self.inst_repo.get_by_id(inst_id)
+            if not inst:
+                raise ValueError("TrainingInstance not found")
+
+            before = inst.to_log_dict()
+            self._invalidate_dates([inst.date])
+
+            index = await self._conflict_index(inst.date)
+            index.remove(inst)
+            inst.trainer_id = trainer_id
+            conflicts = index.conflicts_for(inst)
+            if conflicts:
+                raise ScheduleConflictError(conflicts)
+            await self.inst_repo.update(inst)
+            index.add(inst)
+
+            await self._log(
+                training_id=inst_id,
+                admin_user_id=admin_id,
+                change_type="trainer_changed",
+                before=before,
+                after=inst.to_log_dict(),
+            )
+
+    async def change_time(self, inst_id: int, new_time, new_duration: int, admin_id: int):
+        async with self.uow.transaction():
+            inst = await self.inst_repo.get_by_id(inst_id)
+            if not inst:
+                raise ValueError("TrainingInstance not found")
+
+            before = inst.to_log_dict()
+            self._invalidate_dates([inst.date])
+
+            index = await self._conflict_index(inst.date)
+            index.remove(inst)
+            inst.start_time = new_time
+            inst.duration_minutes = new_duration
+            conflicts = index.conflicts_for(inst)
+            if conflicts:
+                raise ScheduleConflictError(conflicts)
+
+            await self.inst_repo.update(inst)
+            index.add(inst)
+
+            await self._log(
+                training_id=inst_id,
+                admin_user_id=admin_id,
+                change_type="time_changed",
+                before=before,
+                after=inst.to_log_dict(),
+            )
 
-    def change_trainer(self, inst_id: int, trainer_id: int, admin_id: int):
-        inst = self.inst_repo.get_by_id(inst_id)
-        if not inst:
-            raise ValueError("TrainingInstance not found")
-
-        old = inst.__dict__.copy()
-
-        inst.trainer_id = trainer_id
-        self.inst_repo.update(inst)
-
-        self._log(
-            training_id=inst_id,
-            admin_user_id=admin_id,
-            change_type="trainer_changed",
-            old_value=old,
-            new_value=inst.__dict__.copy(),
-        )
-
-    def change_time(self, inst_id: int, new_time, new_duration: int, admin_id: int):
-        inst = self.inst_repo.get_by_id(inst_id)
-        if not inst:
-            raise ValueError("TrainingInstance not found")
-
-        old = inst.__dict__.copy()
-
-        inst.start_time = new_time
-        inst.duration_minutes = new_duration
-
-        self.inst_repo.update(inst)
+    # =====================================================================
+    #                     ОПЕРАЦИИ НАД ДИАПАЗОНОМ ДАТ
+    # =====================================================================
+    # Каждая — одна транзакция: занятия из шаблонов на диапазон сначала
+    # материализуются, затем один UPDATE по фильтру и одна групповая
+    # запись журнала (training_id=0, старые значения по каждому id).
+    # Перенесённые оригиналы (moved_away_ids) в фильтр не попадают.
 
-        self._log(
-            training_id=inst_id,
-            admin_user_id=admin_id,
-            change_type="time_changed",
-            old_value=old,
-            new_value=inst.__dict__.copy(),
-        )
+    async def cancel_range(
+        self,
+        start: date,
+        end: date,
+        admin_id: int,
+        reason: str = "",
+        place: Optional[str] = None,
+    ) -> List[int]:
+        """Отменить все занятия диапазона (например, зал закрыт на праздники)."""
+        if end < start:
+            raise ValueError("end date is before start date")
+
+        async with self.uow.transaction():
+            self._invalidate_range(start, end)
+            self._conflicts = None
+            await self.build_schedule_range(start, end)
+            old = await self.inst_repo.cancel_range(
+                start, end, reason, place=place,
+                exclude_ids=await self.log_repo.moved_away_ids(start, end),
+            )
+            if old:
+                await self._log_group(
+                    admin_id, "range_canceled", old,
+                    {"status": "canceled", "comment": reason,
+                     "start": start.isoformat(), "end": end.isoformat(), "place": place},
+                )
+        return sorted(old)
+
+    async def shift_range(
+        self,
+        start: date,
+        end: date,
+        minutes: int,
+        admin_id: int,
+        place: Optional[str] = None,
+        trainer_id: Optional[int] = None,
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Сдвинуть время занятий диапазона на minutes.
+        Возвращает (сдвинутые id, пропущенные id — сдвиг перешёл бы через полночь).
+        """
+        if end < start:
+            raise ValueError("end date is before start date")
+        if not minutes:
+            raise ValueError("shift must be non-zero")
+
+        async with self.uow.transaction():
+            self._invalidate_range(start, end)
+            self._conflicts = None
+            await self.build_schedule_range(start, end)
+            old, skipped = await self.inst_repo.shift_range(
+                start, end, minutes, place=place, trainer_id=trainer_id,
+                exclude_ids=await self.log_repo.moved_away_ids(start, end),
+            )
+            if old:
+                await self._log_group(
+                    admin_id, "range_shifted", old,
+                    {"shift_minutes": minutes, "start": start.isoformat(), "end": end.isoformat(),
+                     "place": place, "trainer_id": trainer_id},
+                )
+        return sorted(old), skipped
+
+    async def reassign_trainer_range(
+        self,
+        start: date,
+        end: date,
+        from_trainer: int,
+        to_trainer: int,
+        admin_id: int,
+        place: Optional[str] = None,
+    ) -> List[int]:
+        """Передать все занятия тренера в диапазоне другому тренеру."""
+        if end < start:
+            raise ValueError("end date is before start date")
+
+        async with self.uow.transaction():
+            self._invalidate_range(start, end)
+            self._conflicts = None
+            await self.build_schedule_range(start, end)
+            old = await self.inst_repo.reassign_trainer_range(
+                start, end, from_trainer, to_trainer, place=place,
+                exclude_ids=await self.log_repo.moved_away_ids(start, end),
+            )
+            if old:
+                await self._log_group(
+                    admin_id, "range_trainer_changed", old,
+                    {"trainer_id": to_trainer, "start": start.isoformat(), "end": end.isoformat(),
+                     "place": place},
+                )
+        return sorted(old)
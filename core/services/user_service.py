@@ -1,7 +1,13 @@
 ﻿# core/services/user_service.py
 from core.models.user import User
 from core.repositories.user_repo import UserRepository
+from core.utils.cache import TTLCache
+from config import USER_CACHE_SIZE, USER_CACHE_TTL
 from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def utc_now_iso() -> str:
@@ -9,23 +15,92 @@ def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
 
+def profile_fingerprint(username: Optional[str], full_name: Optional[str]) -> int:
+    """Компактный отпечаток Telegram-профиля (username, full_name)."""
+    return hash((username, full_name))
+
+
 class UserService:
     """Сервис логики пользователей."""
 
-    def __init__(self, repo: UserRepository):
+    def __init__(
+        self,
+        repo: UserRepository,
+        cache_size: int = USER_CACHE_SIZE,
+        cache_ttl: float = USER_CACHE_TTL,
+    ):
         self.repo = repo
+        # read-through кеш User по user_id; сбрасывается при записи
+        self.cache: TTLCache[User] = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        # последний известный отпечаток профиля по user_id
+        self._profile_fingerprints: Dict[int, int] = {}
+        # изменённые профили, ожидающие записи: user_id -> (username, full_name)
+        self._pending_profiles: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
 
     async def get_all_users(self):
         """Вернуть список всех пользователей, отсортированных по fio, full_name, username."""
         return await self.repo.get_all_users()
 
+    async def count_users(self) -> int:
+        return await self.repo.count()
+
+    async def get_users_page(self, offset: int, limit: int):
+        """Страница пользователей в порядке fio, full_name, username."""
+        return await self.repo.get_page(offset, limit)
+
+    async def get_user(self, user_id: int) -> User | None:
+        """Пользователь по ID: сначала из кеша, при промахе — из базы."""
+        user = self.cache.get(user_id)
+        if user is not None:
+            return user
+
+        user = await self.repo.get(user_id)
+        if user is not None:
+            self.cache.set(user_id, user)
+        return user
+
+    async def get_users(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Пачка пользователей: попадания из кеша, промахи — одним запросом."""
+        result: Dict[int, User] = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            user = self.cache.get(user_id)
+            if user is not None:
+                result[user_id] = user
+            else:
+                missing.append(user_id)
+
+        if missing:
+            for user_id, user in (await self.repo.get_many(missing)).items():
+                self.cache.set(user_id, user)
+                result[user_id] = user
+        return result
+
+    @staticmethod
+    def display_name(user: User | None, user_id: int) -> str:
+        """Отображаемое имя: fio → username → full_name → #id."""
+        if not user:
+            return f"#{user_id}"
+        return user.fio or user.username or user.full_name or f"#{user_id}"
+
+    async def resolve_display_names(self, user_ids: Iterable[int]) -> Dict[int, str]:
+        """Отображаемые имена для списка ID за один запрос к базе."""
+        ids = list(dict.fromkeys(user_ids))
+        users = await self.get_users(ids)
+        return {user_id: self.display_name(users.get(user_id), user_id) for user_id in ids}
+
+    def cache_stats(self) -> dict:
+        """Счётчики кеша пользователей (hits/misses/hit_rate/...)."""
+        return self.cache.stats()
+
     async def register_if_needed(self, tg_user):
         """
         Автоматическая регистрация (только Telegram поля).
         При первой регистрации created_at выставляется автоматически.
         """
-        existing = await self.repo.get(tg_user.id)
+        existing = await self.get_user(tg_user.id)
         if existing:
+            self._sync_profile(existing, tg_user)
             return existing
 
         now = utc_now_iso()
@@ -38,9 +113,65 @@ class UserService:
         )
 
         # В repo.upsert автоматически обновится created_at/updated_at при вставке
-        await self.repo.upsert(user)
+        await self.upsert(user)
         return user
 
+    async def upsert(self, user: User):
+        """Сохранить пользователя; кеш обновляется записанным объектом."""
+        try:
+            await self.repo.upsert(user)
+        except Exception:
+            self.cache.invalidate(user.user_id)
+            raise
+        self.cache.set(user.user_id, user)
+        self._profile_fingerprints[user.user_id] = profile_fingerprint(user.username, user.full_name)
+
+    # ----------------- Синхронизация Telegram-профиля -----------------
+    def _sync_profile(self, user: User, tg_user):
+        """
+        Сравнивает (username, full_name) из Telegram с известным отпечатком.
+        При изменении обновляет объект в кеше и ставит запись в очередь —
+        сам handler на commit не ждёт.
+        """
+        fp = profile_fingerprint(tg_user.username, tg_user.full_name)
+        known = self._profile_fingerprints.get(user.user_id)
+        if known is None:
+            known = profile_fingerprint(user.username, user.full_name)
+            self._profile_fingerprints[user.user_id] = known
+        if fp == known:
+            return
+
+        self._profile_fingerprints[user.user_id] = fp
+        user.username = tg_user.username
+        user.full_name = tg_user.full_name
+        self._pending_profiles[user.user_id] = (tg_user.username, tg_user.full_name)
+
+    def pending_profiles_count(self) -> int:
+        return len(self._pending_profiles)
+
+    async def flush_profiles(self) -> int:
+        """
+        Записать накопленные изменения профилей одной транзакцией.
+        Повторные изменения одного пользователя схлопываются в одну запись.
+        Возвращает количество записанных пользователей.
+        """
+        if not self._pending_profiles:
+            return 0
+
+        batch, self._pending_profiles = self._pending_profiles, {}
+        try:
+            await self.repo.update_profiles(
+                [(user_id, username, full_name) for user_id, (username, full_name) in batch.items()]
+            )
+        except Exception:
+            # вернуть в очередь то, что не перезаписано более свежими данными
+            for user_id, profile in batch.items():
+                self._pending_profiles.setdefault(user_id, profile)
+            raise
+
+        logger.debug("Flushed %s changed user profiles", len(batch))
+        return len(batch)
+
     async def update_extra_info(
         self,
         user_id: int,
@@ -68,4 +199,8 @@ class UserService:
         fields_to_update = {k: v for k, v in fields_to_update.items() if v is not None}
 
         if fields_to_update:
-            await self.repo.update_extra(user_id=user_id, **fields_to_update)
+            try:
+                await self.repo.update_extra(user_id=user_id, **fields_to_update)
+            finally:
+                # частичное обновление: кешированная копия устарела
+                self.cache.invalidate(user_id)
@@ -0,0 +1,47 @@
+# core/utils/intervals.py
+"""Индекс полуоткрытых интервалов [start, end) по ключу на отсортированных списках."""
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Hashable, Iterator, List, Tuple
+
+Interval = Tuple[int, int, int]  # (start, end, item_id)
+
+
+class IntervalIndex:
+    """
+    Для каждого ключа — интервалы, отсортированные по началу. Запрос
+    пересечения ищет бинарным поиском кандидатов с началом в
+    (start - max_length, end): O(log n + k), где k — число кандидатов.
+    Для расписания max_length — самое длинное занятие, поэтому k мал.
+    """
+
+    def __init__(self):
+        self._intervals: Dict[Hashable, List[Interval]] = {}
+        self.max_length = 0
+
+    def add(self, key: Hashable, start: int, end: int, item_id: int):
+        insort(self._intervals.setdefault(key, []), (start, end, item_id))
+        self.max_length = max(self.max_length, end - start)
+
+    def remove(self, key: Hashable, start: int, end: int, item_id: int):
+        items = self._intervals.get(key, [])
+        i = bisect_left(items, (start, end, item_id))
+        if i < len(items) and items[i] == (start, end, item_id):
+            del items[i]
+
+    def overlapping(self, key: Hashable, start: int, end: int) -> List[int]:
+        """item_id интервалов ключа, пересекающихся с [start, end)."""
+        items = self._intervals.get(key)
+        if not items:
+            return []
+        lo = bisect_right(items, (start - self.max_length,))
+        hi = bisect_left(items, (end,))
+        return [item_id for s, e, item_id in items[lo:hi] if e > start and s < end]
+
+    def overlapping_pairs(self) -> Iterator[Tuple[Hashable, int, int]]:
+        """Все пересекающиеся пары (ключ, id раньше, id позже) — проход по отсортированным спискам."""
+        for key, items in self._intervals.items():
+            for i, (start, end, item_id) in enumerate(items):
+                for s, _, other_id in items[i + 1:]:
+                    if s >= end:
+                        break
+                    yield key, item_id, other_id
@@ -0,0 +1,132 @@
+# core/utils/validators.py
+"""
+Валидаторы полей регистрации (ФИО, дата рождения, пол, телефон, email).
+
+- регулярные выражения компилируются один раз при импорте;
+- телефон и email сначала проходят дешёвый префильтр: очевидный мусор
+  отбрасывается без вызова phonenumbers / email_validator;
+- результаты тяжёлых проверок кешируются (lru_cache) по уже очищенной
+  строке — повторный ввод того же значения почти бесплатен;
+- phonenumbers и email_validator импортируются при первой проверке, а не
+  при старте бота (метаданные phonenumbers — заметная часть RSS и
+  времени импорта, а нужны они только в /register и при импорте CSV).
+
+Каждый валидатор возвращает нормализованное значение или None.
+"""
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict
+
+SKIP_SIGNAL = "-"  # сигнал для пропуска поля
+
+# размер кеша результатов для телефона и email
+CACHE_SIZE = 1024
+
+_FULL_DATE_RE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})")
+_YEAR_RE = re.compile(r"\d{4}")
+# «+», затем цифры и типичные разделители; без «+» phonenumbers.parse(text, None) всё равно падает
+_PHONE_PREFILTER_RE = re.compile(r"\+[\d\s().\-]{7,30}")
+_EMAIL_PREFILTER_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+EMAIL_MAX_LENGTH = 254
+
+_GENDERS = {
+    "м": "М", "муж": "М", "male": "М",
+    "ж": "Ж", "жен": "Ж", "female": "Ж",
+}
+
+
+def validate_full_name(text: str) -> str | None:
+    if text == SKIP_SIGNAL:
+        return None
+    parts = text.strip().split()
+    if len(parts) < 2:
+        return None
+    return " ".join(p.capitalize() for p in parts)
+
+
+def validate_birthdate(text: str) -> str | None:
+    if text == SKIP_SIGNAL:
+        return None
+    text = text.strip()
+
+    # Полная дата дд.мм.гггг
+    m = _FULL_DATE_RE.fullmatch(text)
+    if m:
+        day, month, year = map(int, m.groups())
+        try:
+            datetime(year, month, day)
+            return text
+        except ValueError:
+            return None
+
+    # Только год
+    if _YEAR_RE.fullmatch(text):
+        year = int(text)
+        current_year = datetime.now().year
+        if current_year-90 <= year <= current_year-10:
+            return text
+        return None
+
+    return None
+
+
+def validate_gender(text: str) -> str | None:
+    if text == SKIP_SIGNAL:
+        return None
+    return _GENDERS.get(text.strip().lower())
+
+
+def validate_phone(text: str) -> str | None:
+    if text == SKIP_SIGNAL:
+        return None
+    text = text.strip()
+    if not _PHONE_PREFILTER_RE.fullmatch(text):
+        return None
+    return _parse_phone(text)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_phone(text: str) -> str | None:
+    import phonenumbers
+
+    try:
+        pn = phonenumbers.parse(text, None)
+        if phonenumbers.is_valid_number(pn):
+            return phonenumbers.format_number(pn, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+    except phonenumbers.NumberParseException:
+        return None
+    return None
+
+
+def validate_email(text: str, check_deliverability: bool = True) -> str | None:
+    if text == SKIP_SIGNAL:
+        return None
+    text = text.strip()
+    if len(text) > EMAIL_MAX_LENGTH or not _EMAIL_PREFILTER_RE.fullmatch(text):
+        return None
+    return _parse_email(text, check_deliverability)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_email(text: str, check_deliverability: bool) -> str | None:
+    from email_validator import validate_email as validate_email_lib, EmailNotValidError
+
+    try:
+        v = validate_email_lib(text, check_deliverability=check_deliverability)
+        return v.email
+    except EmailNotValidError:
+        return None
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Счётчики lru_cache тяжёлых проверок."""
+    return {
+        name: func.cache_info()._asdict()
+        for name, func in (("phone", _parse_phone), ("email", _parse_email))
+    }
+
+
+def clear_caches():
+    _parse_phone.cache_clear()
+    _parse_email.cache_clear()
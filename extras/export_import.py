@@ -1 +1,200 @@
-﻿class ExportImport: pass
+# extras/export_import.py
+"""
+Экспорт и импорт пользователей в CSV (формат с разделителем ';', как в /users).
+
+Строки читаются из БД курсором пачками и сразу пишутся в файл,
+поэтому память не растёт с числом пользователей. Импорт так же читает
+CSV потоково, проверяет строки валидаторами регистрации и сохраняет их
+пачками по batch_size — одна транзакция на пачку.
+
+Запуск из корня проекта:
+    python -m extras.export_import export users.csv
+    python -m extras.export_import import users.csv --batch-size 500
+"""
+import argparse
+import asyncio
+import csv
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, TextIO, Tuple
+
+from core.models.user import User
+from core.repositories.user_repo import UserRepository
+from core.utils.validators import (
+    validate_birthdate,
+    validate_email,
+    validate_full_name,
+    validate_gender,
+    validate_phone,
+)
+
+CSV_DELIMITER = ";"
+CSV_FIELDS = [
+    "user_id", "full_name", "username", "fio",
+    "birth_date", "gender", "phone", "email",
+    "created_at", "updated_at",
+]
+
+
+async def write_users_csv(repo: UserRepository, fh: TextIO, batch_size: int = 500) -> int:
+    """Потоково записать всех пользователей в fh. Возвращает число строк."""
+    writer = csv.writer(fh, delimiter=CSV_DELIMITER)
+    writer.writerow(CSV_FIELDS)
+
+    rows = 0
+    async for u in repo.iter_users(batch_size=batch_size):
+        writer.writerow([
+            u.user_id, u.full_name, u.username, u.fio,
+            u.birth_date, u.gender, u.phone, u.email,
+            u.created_at, u.updated_at
+        ])
+        rows += 1
+    return rows
+
+
+async def export_users_to_tempfile(repo: UserRepository, batch_size: int = 500) -> Path:
+    """
+    Экспорт во временный файл с уникальным именем (параллельные выгрузки
+    не перезаписывают друг друга). Удалить файл — забота вызывающего.
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".csv", prefix="users_export_", newline="", encoding="utf-8", delete=False
+    ) as fh:
+        path = Path(fh.name)
+        try:
+            await write_users_csv(repo, fh, batch_size=batch_size)
+        except Exception:
+            fh.close()
+            path.unlink(missing_ok=True)
+            raise
+    return path
+
+
+# ----------------- импорт -----------------
+# сколько ошибок строк хранить в отчёте
+MAX_REPORTED_ERRORS = 20
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    imported: int = 0
+    rejected: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"Строк: {self.total}, импортировано: {self.imported}, "
+            f"отклонено: {self.rejected}, пачек: {self.batches}",
+            f"Время: {self.elapsed:.2f} с, {self.rows_per_sec:.0f} строк/с",
+        ]
+        for line_no, reason in self.errors:
+            lines.append(f"  строка {line_no}: {reason}")
+        if self.rejected > len(self.errors):
+            lines.append(f"  ... и ещё {self.rejected - len(self.errors)}")
+        return "\n".join(lines)
+
+
+def _optional(row: Dict[str, str], name: str, validator) -> str | None:
+    """Пустое поле — None, непустое должно пройти валидатор."""
+    raw = (row.get(name) or "").strip()
+    if not raw:
+        return None
+    value = validator(raw)
+    if value is None:
+        raise ValueError(f"некорректное поле {name}: {raw!r}")
+    return value
+
+
+def parse_user_row(row: Dict[str, str]) -> User:
+    """Строка CSV -> User. ValueError с причиной, если строка некорректна."""
+    raw_id = (row.get("user_id") or "").strip()
+    try:
+        user_id = int(raw_id)
+    except ValueError:
+        raise ValueError(f"некорректный user_id: {raw_id!r}") from None
+
+    return User(
+        user_id=user_id,
+        username=(row.get("username") or "").strip() or None,
+        full_name=(row.get("full_name") or "").strip() or None,
+        fio=_optional(row, "fio", validate_full_name),
+        birth_date=_optional(row, "birth_date", validate_birthdate),
+        gender=_optional(row, "gender", validate_gender),
+        phone=_optional(row, "phone", validate_phone),
+        # без DNS-запроса на каждую строку
+        email=_optional(row, "email", lambda v: validate_email(v, check_deliverability=False)),
+        created_at=(row.get("created_at") or "").strip() or None,
+        updated_at=(row.get("updated_at") or "").strip() or None,
+    )
+
+
+async def import_users_csv(repo: UserRepository, fh: TextIO, batch_size: int = 500) -> ImportReport:
+    """Потоково загрузить пользователей из fh пачками по batch_size."""
+    report = ImportReport()
+    started = time.perf_counter()
+
+    reader = csv.DictReader(fh, delimiter=CSV_DELIMITER)
+    if reader.fieldnames is None or "user_id" not in reader.fieldnames:
+        raise ValueError("в CSV нет колонки user_id")
+
+    batch: List[User] = []
+    for row in reader:
+        report.total += 1
+        try:
+            batch.append(parse_user_row(row))
+        except ValueError as e:
+            report.rejected += 1
+            if len(report.errors) < MAX_REPORTED_ERRORS:
+                report.errors.append((reader.line_num, str(e)))
+            continue
+
+        if len(batch) >= batch_size:
+            report.imported += await repo.upsert_many(batch)
+            report.batches += 1
+            batch = []
+
+    if batch:
+        report.imported += await repo.upsert_many(batch)
+        report.batches += 1
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+# ----------------- CLI -----------------
+async def main(args: argparse.Namespace):
+    repo = await UserRepository.create(str(args.db))
+    try:
+        if args.command == "export":
+            started = time.perf_counter()
+            with open(args.file, "w", newline="", encoding="utf-8") as fh:
+                rows = await write_users_csv(repo, fh, batch_size=args.batch_size)
+            elapsed = time.perf_counter() - started
+            print(f"Экспортировано: {rows} строк за {elapsed:.2f} с в {args.file}")
+        else:
+            # utf-8-sig: файлы, сохранённые из Excel, начинаются с BOM
+            with open(args.file, newline="", encoding="utf-8-sig") as fh:
+                report = await import_users_csv(repo, fh, batch_size=args.batch_size)
+            print(report.format())
+    finally:
+        await repo.close()
+
+
+if __name__ == "__main__":
+    from config import USERS_FILE
+
+    parser = argparse.ArgumentParser(description="Экспорт/импорт пользователей в CSV")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("file", type=Path, help="Путь к CSV-файлу")
+    parser.add_argument("--db", type=Path, default=USERS_FILE, help="База пользователей")
+    parser.add_argument("--batch-size", type=int, default=500, help="Строк в одной транзакции")
+    asyncio.run(main(parser.parse_args()))
@@ -1,12 +1,16 @@
-﻿import asyncio
+﻿import time
+
+# точка отсчёта для time-to-first-poll: до импорта aiogram и проекта
+STARTED_AT = time.perf_counter()
+
+import asyncio
 import logging
 import sqlite3
-from pathlib import Path
 
 from aiogram import Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 
-from telegram.bot import bot
+from telegram.bot import bot, outbound_limiter
+from telegram.fsm_storage import SqliteStorage
 from telegram.handlers.registration import register_registration_handlers
 from telegram.routers import register_routers
 from core.repositories.user_repo import UserRepository
@@ -15,10 +19,40 @@ from core.repositories.schedule_repo import (
     TrainingInstanceRepo,
     ScheduleChangeLogRepo
 )
+from core.repositories.migrations import migrate
+from core.repositories.poll_repo import PollRepository
+from core.repositories.sqlite_factory import open_connection, close_connection
+from core.repositories.unit_of_work import UnitOfWork
 from core.services.user_service import UserService
 from core.services.schedule_service import ScheduleService
+from core.services.history_service import HistoryService
+from core.services.poll_service import PollService
 from telegram.middlewares.user_registration import UserRegistrationMiddleware
-from config import USERS_FILE, LOGS_DIR
+from telegram.middlewares.throttling import ThrottlingMiddleware
+from telegram.tasks.profile_sync import start_profile_sync
+from telegram.tasks.schedule_materializer import start_schedule_materializer
+from telegram.tasks.poll_updater import start_poll_updater
+from telegram.renderers.poll_renderer import POLL_CALLBACK_PREFIX
+from config import (
+    DATA_DIR,
+    USERS_FILE,
+    LOGS_DIR,
+    FSM_FILE,
+    FSM_FLUSH_INTERVAL,
+    FSM_STATE_TTL,
+    PROFILE_FLUSH_INTERVAL,
+    CHANGE_LOG_RETENTION_DAYS,
+    SCHEDULE_MATERIALIZE_WEEKS,
+    SCHEDULE_MATERIALIZE_HOUR,
+    POLL_EDIT_INTERVAL,
+    THROTTLE_USER_LIMIT,
+    THROTTLE_USER_WINDOW,
+    THROTTLE_CHAT_LIMIT,
+    THROTTLE_CHAT_WINDOW,
+    THROTTLE_CALLBACK_DEBOUNCE,
+)
+
+IMPORTS_DONE_AT = time.perf_counter()
 
 # -------------------- Logging --------------------
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
@@ -34,29 +68,77 @@ logging.getLogger("aiogram").setLevel(logging.DEBUG)
 logging.getLogger("aiohttp").setLevel(logging.WARNING)
 
 # -------------------- FSM Storage --------------------
-storage = MemoryStorage()
+# SQLite + write-back кеш: состояния переживают рестарт; закрывается в dp.shutdown
+storage = SqliteStorage(FSM_FILE, flush_interval=FSM_FLUSH_INTERVAL, ttl=FSM_STATE_TTL)
 dp: Dispatcher = Dispatcher(storage=storage)
 
+
+@dp.startup()
+async def log_time_to_first_poll():
+    # startup вызывается aiogram непосредственно перед первым getUpdates
+    now = time.perf_counter()
+    logging.info(
+        "Time to first poll: %.3f s (imports %.3f s, init %.3f s)",
+        now - STARTED_AT, IMPORTS_DONE_AT - STARTED_AT, now - IMPORTS_DONE_AT,
+    )
+
 # -------------------- Main --------------------
 async def main():
+    # загружаем незавершённые FSM-состояния
+    await storage.open()
+
     # создаём асинхронный репозиторий пользователей
     user_repo = await UserRepository.create(str(USERS_FILE))
     user_service = UserService(user_repo)
 
     # создаём sqlite-соединение для расписания
-    DATA_DIR = Path("data")
-    DATA_DIR.mkdir(exist_ok=True)
-    conn = sqlite3.connect(DATA_DIR / "club_schedule.db", check_same_thread=False)
+    schedule_db = DATA_DIR / "club_schedule.db"
+
+    # миграции схемы — синхронно, один раз до старта polling
+    migration_conn = sqlite3.connect(schedule_db)
+    try:
+        migrate(migration_conn)
+    finally:
+        migration_conn.close()
+
+    # асинхронное соединение: запросы расписания не блокируют event loop
+    conn = await open_connection(schedule_db)
     base_repo = BaseScheduleTemplateRepo(conn)
     inst_repo = TrainingInstanceRepo(conn)
     log_repo = ScheduleChangeLogRepo(conn)
+    # общий для всех сервисов этой БД: транзакции на одном соединении сериализуются
+    schedule_uow = UnitOfWork(conn)
 
     # создаём сервис расписания
     schedule_service = ScheduleService(
         base_repo=base_repo,
         inst_repo=inst_repo,
-        log_repo=log_repo
+        log_repo=log_repo,
+        uow=schedule_uow,
+    )
+
+    # журнал изменений: старые записи — в помесячные архивные таблицы
+    history_service = HistoryService(log_repo, uow=schedule_uow)
+    archived = await history_service.archive_old(CHANGE_LOG_RETENTION_DAYS)
+    if archived:
+        logging.info("Change log archived: %s", archived)
+
+    # опросы посещаемости: та же БД и тот же UnitOfWork, активные опросы — в память
+    poll_service = PollService(PollRepository(conn), uow=schedule_uow)
+    await poll_service.load_active()
+
+    # outer middleware: отсекаем флуд до фильтров, регистрации и обращений к БД
+    throttling = ThrottlingMiddleware(
+        user_limit=THROTTLE_USER_LIMIT,
+        user_window=THROTTLE_USER_WINDOW,
+        chat_limit=THROTTLE_CHAT_LIMIT,
+        chat_window=THROTTLE_CHAT_WINDOW,
+        callback_debounce=THROTTLE_CALLBACK_DEBOUNCE,
+        # голоса в опросах группы идут пачкой — лимит чата к ним не применяем
+        chat_exempt_callbacks=(POLL_CALLBACK_PREFIX,),
     )
+    dp.message.outer_middleware(throttling)
+    dp.callback_query.outer_middleware(throttling)
 
     # middleware: автоматическая регистрация пользователей
     dp.message.middleware(UserRegistrationMiddleware(user_service))
@@ -65,7 +147,37 @@ async def main():
     register_registration_handlers(dp, user_service)
 
     # регистрируем остальные роутеры, включая админские
-    register_routers(dp, user_service=user_service, schedule_service=schedule_service)
+    register_routers(
+        dp,
+        user_service=user_service,
+        schedule_service=schedule_service,
+        history_service=history_service,
+        poll_service=poll_service,
+    )
+
+    # фоновая запись изменённых профилей (username / full_name)
+    profile_sync_task = asyncio.create_task(start_profile_sync(user_service, PROFILE_FLUSH_INTERVAL))
+
+    # перерисовка сообщений опросов не чаще раза в POLL_EDIT_INTERVAL
+    poll_updater_task = asyncio.create_task(start_poll_updater(bot, poll_service, POLL_EDIT_INTERVAL))
+
+    async def stop_poll_updater():
+        # финальная перерисовка опросов; shutdown вызывается aiogram
+        # до закрытия сессии бота, поэтому правки ещё доходят до Telegram
+        poll_updater_task.cancel()
+        try:
+            await poll_updater_task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logging.exception("Error flushing poll messages: %s", e)
+
+    dp.shutdown.register(stop_poll_updater)
+
+    # фоновое создание занятий из шаблонов на несколько недель вперёд
+    materializer_task = asyncio.create_task(
+        start_schedule_materializer(schedule_service, SCHEDULE_MATERIALIZE_WEEKS, SCHEDULE_MATERIALIZE_HOUR)
+    )
 
     # запуск polling
     try:
@@ -74,16 +186,36 @@ async def main():
     except KeyboardInterrupt:
         logging.info("Bot stopped by KeyboardInterrupt")
     finally:
-        # закрываем ресурсы
+        # закрываем ресурсы; материализатор — до закрытия соединения расписания
+        materializer_task.cancel()
+        try:
+            await materializer_task
+        except asyncio.CancelledError:
+            pass
+        # обычно уже остановлен в dp.shutdown; здесь — если polling не стартовал
+        if not poll_updater_task.done():
+            await stop_poll_updater()
+        profile_sync_task.cancel()
+        try:
+            await profile_sync_task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logging.exception("Error flushing user profiles: %s", e)
         try:
             await user_repo.close()
         except Exception as e:
             logging.exception("Error closing user_repo: %s", e)
+        logging.info("Outbound Telegram stats: %s", outbound_limiter.stats())
+        logging.info("Schedule snapshot cache: %s", schedule_service.snapshot_stats())
         try:
             await bot.session.close()
         except Exception:
             pass
-        conn.close()
+        try:
+            await close_connection(conn)
+        except Exception as e:
+            logging.exception("Error closing schedule db: %s", e)
         logging.info("Bot shutdown complete.")
 
 # -------------------- Entry point --------------------
@@ -0,0 +1,100 @@
+# scripts/bench_schedule_conflicts.py
+"""
+Поиск пересечений тренеров и залов:
+- naive — попарное сравнение всех занятий (так выглядела бы проверка «в лоб»);
+- index — ConflictIndex (отсортированные интервалы + bisect).
+
+Меряет проверку одной правки и отчёт за период.
+
+Запуск из корня проекта:
+    python -m scripts.bench_schedule_conflicts --days 365 --per-day 12
+"""
+import argparse
+import random
+import time as time_mod
+from datetime import date, time, timedelta
+
+from core.models.schedule import TrainingInstance
+from core.services.schedule_conflicts import ConflictIndex, interval_of
+
+
+def make_instances(days: int, per_day: int, seed: int):
+    rnd = random.Random(seed)
+    start = date(2025, 1, 1)
+    instances = []
+    for d in range(days):
+        for i in range(per_day):
+            instances.append(TrainingInstance(
+                id=len(instances) + 1,
+                date=start + timedelta(days=d),
+                start_time=time(8 + rnd.randrange(13), 30 * rnd.randrange(2)),
+                duration_minutes=rnd.choice((60, 90, 120)),
+                trainer_id=100 + rnd.randrange(per_day),
+                place=f"Зал {rnd.randrange(per_day // 2 or 1)}",
+                training_type="Сабля",
+                source_template_id=None,
+                status="planned",
+            ))
+    return instances, start, start + timedelta(days=days - 1)
+
+
+def naive_conflicts(instances, inst):
+    s, e = interval_of(inst)
+    found = []
+    for other in instances:
+        if other.id == inst.id:
+            continue
+        os_, oe = interval_of(other)
+        if os_ < e and s < oe and (other.trainer_id == inst.trainer_id or other.place == inst.place):
+            found.append(other.id)
+    return found
+
+
+def naive_report(instances):
+    found = 0
+    for i, a in enumerate(instances):
+        for b in instances[i + 1:]:
+            if a.date != b.date:
+                continue
+            (as_, ae), (bs, be) = interval_of(a), interval_of(b)
+            if as_ < be and bs < ae:
+                found += (a.trainer_id == b.trainer_id) + (a.place == b.place)
+    return found
+
+
+def timed(fn, repeat=1):
+    started = time_mod.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time_mod.perf_counter() - started) / repeat, result
+
+
+def main(days: int, per_day: int, checks: int, seed: int):
+    instances, start, end = make_instances(days, per_day, seed)
+    rnd = random.Random(seed)
+    probes = [rnd.choice(instances) for _ in range(checks)]
+    print(f"Занятий: {len(instances)}\n")
+
+    build, index = timed(lambda: ConflictIndex(start, end, instances))
+    naive_check, _ = timed(lambda: [naive_conflicts(instances, p) for p in probes])
+    index_check, _ = timed(lambda: [index.conflicts_for(p) for p in probes])
+    print(f"Построение индекса:       {build * 1000:10.1f} ms")
+    print(f"Проверка правки, naive:   {naive_check / checks * 1e6:10.1f} µs")
+    print(f"Проверка правки, index:   {index_check / checks * 1e6:10.1f} µs")
+
+    month = [i for i in instances if i.date < start + timedelta(days=31)]
+    naive_month, naive_found = timed(lambda: naive_report(month))
+    index_month, report = timed(lambda: ConflictIndex(start, start + timedelta(days=30), month).report())
+    assert naive_found == len(report)
+    print(f"Отчёт за месяц, naive:    {naive_month * 1000:10.1f} ms")
+    print(f"Отчёт за месяц, index:    {index_month * 1000:10.1f} ms   (пересечений: {len(report)})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк поиска пересечений расписания")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--per-day", type=int, default=12)
+    parser.add_argument("--checks", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    main(args.days, args.per_day, args.checks, args.seed)
@@ -0,0 +1,151 @@
+# scripts/bench_schedule_decode.py
+"""
+Загрузка года занятий (TrainingInstanceRepo.get_by_date_range):
+- legacy — как было: обычный @dataclass, fetchall кортежей и сборка
+  моделей в event loop, datetime.strptime для каждой даты и времени;
+- current — slots-модели, row_factory курсора (сборка в потоке aiosqlite),
+  кешированный date/time.fromisoformat.
+
+Печатает медиану времени загрузки, пик выделенной памяти (tracemalloc)
+и размер одной модели.
+
+Запуск из корня проекта:
+    python -m scripts.bench_schedule_decode --per-day 8 --repeat 15
+"""
+import argparse
+import asyncio
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time as time_mod
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Optional
+
+from core.repositories.migrations import migrate
+from core.repositories.schedule_repo import TrainingInstanceRepo, parse_date, parse_time
+from core.repositories.sqlite_factory import open_connection, close_connection
+
+YEAR_START = date(2025, 1, 1)
+YEAR_END = date(2025, 12, 31)
+
+
+@dataclass
+class LegacyTrainingInstance:
+    id: Optional[int]
+    date: date
+    start_time: time
+    duration_minutes: int
+    trainer_id: int
+    place: str
+    training_type: str
+    source_template_id: Optional[int]
+    status: str
+    comment: Optional[str] = None
+
+
+async def legacy_load(conn, start: date, end: date):
+    cur = await conn.execute("""
+        SELECT id, date, start_time, duration_minutes, trainer_id, place, training_type,
+               source_template_id, status, comment
+        FROM training_instances
+        WHERE date BETWEEN ? AND ?
+        ORDER BY date, start_time
+    """, (start.isoformat(), end.isoformat()))
+    rows = await cur.fetchall()
+    await cur.close()
+    return [
+        LegacyTrainingInstance(
+            id=row[0],
+            date=datetime.strptime(row[1], "%Y-%m-%d").date(),
+            start_time=datetime.strptime(row[2], "%H:%M").time(),
+            duration_minutes=row[3],
+            trainer_id=row[4],
+            place=row[5],
+            training_type=row[6],
+            source_template_id=row[7],
+            status=row[8],
+            comment=row[9],
+        )
+        for row in rows
+    ]
+
+
+def fill(db_path: Path, per_day: int) -> int:
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    rows = []
+    d = YEAR_START
+    while d <= YEAR_END:
+        for i in range(per_day):
+            rows.append((d.isoformat(), f"{9 + i % 13:02d}:{30 * (i % 2):02d}", 90, 100 + i % 6,
+                         "Малый зал" if i % 2 else "Большой зал", "Сабля", None, "planned", None))
+        d += timedelta(days=1)
+    conn.executemany("""
+        INSERT INTO training_instances
+        (date, start_time, duration_minutes, trainer_id, place, training_type,
+         source_template_id, status, comment)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    conn.commit()
+    conn.close()
+    return len(rows)
+
+
+def deep_size(inst) -> int:
+    """Сама модель (+ __dict__ у обычного dataclass); поля — общие объекты."""
+    size = sys.getsizeof(inst)
+    if hasattr(inst, "__dict__"):
+        size += sys.getsizeof(inst.__dict__)
+    return size
+
+
+async def measure(load, repeat: int):
+    times = []
+    for _ in range(repeat):
+        started = time_mod.perf_counter()
+        result = await load()
+        times.append(time_mod.perf_counter() - started)
+        del result
+
+    tracemalloc.start()
+    result = await load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak, deep_size(result[0]), len(result)
+
+
+async def main(per_day: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "schedule.db"
+        total = fill(db_path, per_day)
+        conn = await open_connection(db_path)
+        repo = TrainingInstanceRepo(conn)
+
+        print(f"Занятий за год: {total}\n")
+        print(f"{'':<10}{'median, ms':>12}{'peak, KiB':>12}{'model, B':>10}")
+        results = {}
+        for name, load in (
+            ("legacy", lambda: legacy_load(conn, YEAR_START, YEAR_END)),
+            ("current", lambda: repo.get_by_date_range(YEAR_START, YEAR_END)),
+        ):
+            median, peak, model_size, count = await measure(load, repeat)
+            assert count == total
+            results[name] = median
+            print(f"{name:<10}{median * 1000:>12.1f}{peak / 1024:>12.0f}{model_size:>10}")
+
+        await close_connection(conn)
+
+    print(f"\nУскорение: {results['legacy'] / results['current']:.1f}x")
+    print(f"Кеш разбора: date {parse_date.cache_info().currsize}, time {parse_time.cache_info().currsize}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк декодирования занятий расписания")
+    parser.add_argument("--per-day", type=int, default=8, help="Занятий в день")
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+    asyncio.run(main(args.per_day, args.repeat))
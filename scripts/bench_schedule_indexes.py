@@ -0,0 +1,176 @@
+# scripts/bench_schedule_indexes.py
+"""
+Бенчмарк запросов расписания на длинной истории: схема без индексов (v1)
+против актуальной схемы (migrations.LATEST_VERSION).
+
+Запуск из корня проекта:
+    python -m scripts.bench_schedule_indexes --years 12 --per-day 8
+"""
+import argparse
+import json
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from core.repositories.migrations import LATEST_VERSION, migrate
+
+QUERIES = {
+    "get_by_date": (
+        """
+        SELECT id, date, start_time, duration_minutes, trainer_id, place, training_type,
+               source_template_id, status, comment
+        FROM training_instances
+        WHERE date=?
+        ORDER BY start_time
+        """,
+        lambda ctx: (ctx["random_date"](),),
+    ),
+    "get_by_date_range(week)": (
+        """
+        SELECT id, date, start_time, duration_minutes, trainer_id, place, training_type,
+               source_template_id, status, comment
+        FROM training_instances
+        WHERE date BETWEEN ? AND ?
+        ORDER BY date, start_time
+        """,
+        lambda ctx: ctx["random_week"](),
+    ),
+    "log.get_by_training": (
+        """
+        SELECT id, training_id, admin_user_id, change_type,
+               old_value, new_value, timestamp
+        FROM schedule_change_log
+        WHERE training_id=?
+        ORDER BY timestamp DESC
+        """,
+        lambda ctx: (ctx["random_training"](),),
+    ),
+    "log.get_all(limit=100)": (
+        """
+        SELECT id, training_id, admin_user_id, change_type,
+               old_value, new_value, timestamp
+        FROM schedule_change_log
+        ORDER BY timestamp DESC, id DESC
+        LIMIT ?
+        """,
+        lambda ctx: (100,),
+    ),
+    "log.summary_page(keyset)": (
+        """
+        SELECT l.id, l.training_id, l.admin_user_id, l.change_type, l.timestamp,
+               i.date, i.start_time
+        FROM schedule_change_log l
+        LEFT JOIN training_instances i ON i.id = l.training_id
+        WHERE l.timestamp <= ? AND (l.timestamp < ? OR l.id < ?)
+        ORDER BY l.timestamp DESC, l.id DESC
+        LIMIT 21
+        """,
+        lambda ctx: ctx["random_cursor"](),
+    ),
+}
+
+
+def populate(conn: sqlite3.Connection, years: int, per_day: int, seed: int) -> dict:
+    rnd = random.Random(seed)
+    start = date.today() - timedelta(days=365 * years)
+    days = 365 * years
+
+    instances = []
+    for i in range(days):
+        d = (start + timedelta(days=i)).isoformat()
+        for slot in range(per_day):
+            instances.append((
+                d, f"{8 + slot:02d}:00", 90, rnd.randint(1, 20),
+                "Малый зал", "Сабля", slot + 1, "planned", None,
+            ))
+    conn.executemany(
+        """
+        INSERT INTO training_instances
+        (date, start_time, duration_minutes, trainer_id, place, training_type,
+         source_template_id, status, comment)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        instances,
+    )
+
+    total = len(instances)
+    logs = []
+    for _ in range(total // 5):
+        ts = datetime.combine(start + timedelta(days=rnd.randrange(days)), datetime.min.time())
+        payload = json.dumps({"status": "canceled"})
+        logs.append((rnd.randint(1, total), 1, "canceled", payload, payload, ts.isoformat()))
+    conn.executemany(
+        """
+        INSERT INTO schedule_change_log
+        (training_id, admin_user_id, change_type, old_value, new_value, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        logs,
+    )
+    conn.commit()
+
+    def random_cursor():
+        ts = datetime.combine(start + timedelta(days=rnd.randrange(days)), datetime.min.time()).isoformat()
+        return ts, ts, len(logs) + 1
+
+    def random_week():
+        d = start + timedelta(days=rnd.randrange(days - 7))
+        return d.isoformat(), (d + timedelta(days=6)).isoformat()
+
+    return {
+        "random_date": lambda: (start + timedelta(days=rnd.randrange(days))).isoformat(),
+        "random_week": random_week,
+        "random_training": lambda: rnd.randint(1, total),
+        "random_cursor": random_cursor,
+        "instances": total,
+        "logs": len(logs),
+    }
+
+
+def run_queries(conn: sqlite3.Connection, ctx: dict, repeat: int) -> dict:
+    results = {}
+    for name, (sql, params) in QUERIES.items():
+        plan = " | ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params(ctx)))
+        started = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, params(ctx)).fetchall()
+        elapsed = (time.perf_counter() - started) / repeat
+        results[name] = (elapsed * 1000, plan)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Латентность запросов расписания до/после индексов")
+    parser.add_argument("--years", type=int, default=12, help="Глубина истории в годах")
+    parser.add_argument("--per-day", type=int, default=8, help="Занятий в день")
+    parser.add_argument("--repeat", type=int, default=200, help="Повторов каждого запроса")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "bench.db")
+        migrate(conn, target=1)
+        ctx = populate(conn, args.years, args.per_day, args.seed)
+        print(f"История: {args.years} лет, занятий {ctx['instances']}, записей лога {ctx['logs']}")
+
+        before = run_queries(conn, ctx, args.repeat)
+        started = time.perf_counter()
+        migrate(conn)
+        migration_ms = (time.perf_counter() - started) * 1000
+        after = run_queries(conn, ctx, args.repeat)
+        conn.close()
+
+    print(f"Миграция v1 -> v{LATEST_VERSION}: {migration_ms:.1f} ms\n")
+    print(f"{'query':<26}{'v1, ms':>10}{'v' + str(LATEST_VERSION) + ', ms':>10}{'speedup':>10}")
+    for name in QUERIES:
+        b, _ = before[name]
+        a, plan = after[name]
+        print(f"{name:<26}{b:>10.3f}{a:>10.3f}{b / a if a else float('inf'):>9.1f}x")
+        print(f"    plan: {plan}")
+
+
+if __name__ == "__main__":
+    main()
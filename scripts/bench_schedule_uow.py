@@ -0,0 +1,135 @@
+# scripts/bench_schedule_uow.py
+"""
+Пропускная способность пачки админских правок расписания:
+- per-statement — как было: commit после каждого INSERT/UPDATE репозитория
+  (move = 4 commit, cancel/change_* = 2);
+- unit-of-work — один commit на операцию сервиса.
+
+БД открывается через sqlite_factory (те же PRAGMA, что у бота). На диске
+с дорогим fsync разница заметнее; проверить: SQLITE_SYNCHRONOUS=FULL.
+
+Запуск из корня проекта:
+    python -m scripts.bench_schedule_uow --ops 300
+"""
+import argparse
+import asyncio
+import random
+import sqlite3
+import tempfile
+import time as time_mod
+from contextlib import asynccontextmanager
+from datetime import date, time
+from pathlib import Path
+
+from core.repositories.migrations import migrate
+from core.repositories.schedule_repo import (
+    BaseScheduleTemplateRepo,
+    TrainingInstanceRepo,
+    ScheduleChangeLogRepo,
+)
+from core.repositories.sqlite_factory import open_connection, close_connection
+from core.services.schedule_service import ScheduleService
+
+
+class AutocommitUnitOfWork:
+    """Старое поведение: без общей транзакции, репозитории коммитят сами."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.commits = 0
+        self.rollbacks = 0
+        self.active = False
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield self.conn
+
+
+def commit_after_each_write(service: ScheduleService, uow: AutocommitUnitOfWork):
+    for repo, name in (
+        (service.inst_repo, "add"),
+        (service.inst_repo, "update"),
+        (service.log_repo, "add"),
+    ):
+        method = getattr(repo, name)
+
+        async def committing(*args, _method=method, **kwargs):
+            result = await _method(*args, **kwargs)
+            await uow.conn.commit()
+            uow.commits += 1
+            return result
+
+        setattr(repo, name, committing)
+
+
+async def run(db_path: Path, ops: int, legacy: bool, seed: int) -> tuple:
+    conn = await open_connection(db_path)
+    try:
+        return await run_ops(conn, ops, legacy, seed)
+    finally:
+        await close_connection(conn)
+
+
+async def run_ops(conn, ops: int, legacy: bool, seed: int) -> tuple:
+    service = ScheduleService(
+        base_repo=BaseScheduleTemplateRepo(conn),
+        inst_repo=TrainingInstanceRepo(conn),
+        log_repo=ScheduleChangeLogRepo(conn),
+    )
+    if legacy:
+        service.uow = AutocommitUnitOfWork(conn)
+        commit_after_each_write(service, service.uow)
+
+    rnd = random.Random(seed)
+    # 50 часовых слотов (7 дней × 12 часов, все различны) — занятия не
+    # пересекаются, а правки ниже не выходят за свой слот, поэтому проверка
+    # пересечений ничего не отклоняет; slot -> (час, id текущего занятия)
+    slots = []
+    for i in range(50):
+        hour = 8 + i % 12
+        inst = await service.add_extra(date(2025, 3, 3 + i % 7), time(hour, 0), 60, 101,
+                                       "Малый зал", "Сабля", admin_id=1)
+        slots.append([hour, inst.id])
+    commits_before = service.uow.commits
+
+    started = time_mod.perf_counter()
+    for i in range(ops):
+        slot = rnd.choice(slots)
+        hour, inst_id = slot
+        op = i % 4
+        if op == 0:
+            await service.change_trainer(inst_id, rnd.randint(100, 120), admin_id=1)
+        elif op == 1:
+            await service.change_time(inst_id, time(hour, rnd.choice((0, 15, 30))), 30, admin_id=1)
+        elif op == 2:
+            await service.cancel(inst_id, admin_id=1, reason="bench")
+        else:
+            moved = await service.move(inst_id, new_time=time(hour, 0), new_duration=60,
+                                       new_trainer=101, new_place="Большой зал", admin_id=1)
+            slot[1] = moved.id
+    elapsed = time_mod.perf_counter() - started
+    commits = service.uow.commits - commits_before
+    return ops / elapsed, commits
+
+
+async def main(ops: int, seed: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name, legacy in (("per-statement", True), ("unit-of-work", False)):
+            db_path = Path(tmp) / f"{name}.db"
+            migration_conn = sqlite3.connect(db_path)
+            migrate(migration_conn)
+            migration_conn.close()
+
+            results[name], commits = await run(db_path, ops, legacy, seed)
+            print(f"{name:<16}{results[name]:>10.0f} ops/s   commits: {commits}")
+
+        print(f"\nУскорение: {results['unit-of-work'] / results['per-statement']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк транзакций админских правок расписания")
+    parser.add_argument("--ops", type=int, default=300, help="Операций сервиса в пачке")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main(args.ops, args.seed))
@@ -0,0 +1,65 @@
+# scripts/bench_throttling.py
+"""
+Микро-бенчмарк накладных расходов ThrottlingMiddleware на один апдейт.
+
+Запуск из корня проекта:
+    python -m scripts.bench_throttling --updates 200000 --users 5000
+"""
+import argparse
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+
+from telegram.middlewares.throttling import ThrottlingMiddleware
+
+
+async def noop_handler(event, data):
+    return None
+
+
+async def run(updates: int, users: int, chats: int, seed: int):
+    rnd = random.Random(seed)
+    events = [
+        SimpleNamespace(
+            from_user=SimpleNamespace(id=rnd.randrange(users)),
+            chat=SimpleNamespace(id=-rnd.randrange(1, chats + 1)),
+        )
+        for _ in range(min(updates, 50_000))
+    ]
+
+    # базовая линия: вызов handler без middleware
+    started = time.perf_counter()
+    for i in range(updates):
+        await noop_handler(events[i % len(events)], {})
+    baseline = time.perf_counter() - started
+
+    middleware = ThrottlingMiddleware(user_limit=10**9, chat_limit=10**9)
+    started = time.perf_counter()
+    for i in range(updates):
+        await middleware(noop_handler, events[i % len(events)], {})
+    elapsed = time.perf_counter() - started
+
+    debouncer = middleware.debouncer
+    started = time.perf_counter()
+    for i in range(updates):
+        debouncer.is_duplicate(i % users, f"cancel:{i % 97}")
+    debounce_elapsed = time.perf_counter() - started
+
+    per_update = (elapsed - baseline) / updates * 1e6
+    print(f"updates={updates}, users={users}, chats={chats}")
+    print(f"handler only:          {baseline / updates * 1e6:8.2f} µs/update")
+    print(f"with throttling:       {elapsed / updates * 1e6:8.2f} µs/update")
+    print(f"throttling overhead:   {per_update:8.2f} µs/update")
+    print(f"callback debounce:     {debounce_elapsed / updates * 1e6:8.2f} µs/check")
+    print(f"state: {middleware.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Накладные расходы ThrottlingMiddleware")
+    parser.add_argument("--updates", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--chats", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(run(args.updates, args.users, args.chats, args.seed))
@@ -0,0 +1,59 @@
+# scripts/bench_user_upsert.py
+"""
+Пропускная способность UserRepository.upsert: настройки SQLite по умолчанию
+(rollback journal, synchronous=FULL) против фабрики sqlite_factory (WAL и т.д.).
+
+Запуск из корня проекта:
+    python -m scripts.bench_user_upsert --rows 2000
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import aiosqlite
+
+from core.models.user import User
+from core.repositories.sqlite_factory import read_settings
+from core.repositories.user_repo import UserRepository
+
+
+async def default_repo(db_path: Path) -> UserRepository:
+    """Репозиторий на «голом» aiosqlite.connect — как было до фабрики."""
+    repo = await UserRepository.create(str(db_path))
+    await repo.conn.close()
+    conn = await aiosqlite.connect(db_path)
+    await conn.execute("PRAGMA journal_mode = DELETE")
+    return UserRepository(str(db_path), conn)
+
+
+async def run(repo: UserRepository, rows: int) -> float:
+    started = time.perf_counter()
+    for i in range(rows):
+        await repo.upsert(User(user_id=i, username=f"user{i}", full_name=f"User {i}"))
+    return rows / (time.perf_counter() - started)
+
+
+async def main(rows: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name, factory in (
+            ("defaults", default_repo),
+            ("factory", lambda path: UserRepository.create(str(path))),
+        ):
+            repo = await factory(Path(tmp) / f"{name}.db")
+            settings = await read_settings(repo.conn)
+            results[name] = await run(repo, rows)
+            await repo.close()
+            print(f"{name:<10}{results[name]:>10.0f} upsert/s   "
+                  + ", ".join(f"{k}={v}" for k, v in settings.items()))
+
+        print(f"\nУскорение: {results['factory'] / results['defaults']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк UserRepository.upsert")
+    parser.add_argument("--rows", type=int, default=2000, help="Количество upsert (каждый со своим commit)")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows))
@@ -0,0 +1,66 @@
+# scripts/bench_validators.py
+"""
+Стоимость валидаторов регистрации на одно сообщение:
+- cold    — уникальные корректные значения (кеш не помогает);
+- cached  — повтор одного и того же ввода (lru_cache);
+- garbage — мусор, отсекаемый префильтром без тяжёлых библиотек;
+- direct  — тот же мусор прямо в phonenumbers / email_validator (как было раньше).
+
+Запуск из корня проекта:
+    python -m scripts.bench_validators --calls 2000
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from core.utils import validators
+from core.utils.validators import (
+    validate_birthdate,
+    validate_email,
+    validate_full_name,
+    validate_gender,
+    validate_phone,
+)
+
+
+def per_call_us(func: Callable[[str], object], inputs: List[str]) -> float:
+    started = time.perf_counter()
+    for value in inputs:
+        func(value)
+    return (time.perf_counter() - started) / len(inputs) * 1e6
+
+
+def main(calls: int):
+    email = lambda v: validate_email(v, check_deliverability=False)
+    email_direct = lambda v: validators._parse_email.__wrapped__(v.strip(), False)
+    phone_direct = lambda v: validators._parse_phone.__wrapped__(v.strip())
+
+    cases = [
+        ("full_name", validate_full_name,
+         [f"иван иванов{i}" for i in range(calls)], ["Иван Иванов"], ["привет"], None),
+        ("birthdate", validate_birthdate,
+         [f"{1 + i % 28}.{1 + i % 12}.{1950 + i % 50}" for i in range(calls)], ["12.11.1990"], ["вчера"], None),
+        ("gender", validate_gender,
+         ["муж", "жен"] * (calls // 2), ["М"], ["не скажу"], None),
+        ("phone", validate_phone,
+         [f"+7 912 {i % 1000:03} {i // 1000 % 100:02} {i % 97:02}" for i in range(calls)],
+         ["+7 912 345-67-89"], ["позвоните мне"], phone_direct),
+        ("email", email,
+         [f"user{i}@mail.ru" for i in range(calls)], ["anna@mail.ru"], ["моя почта"], email_direct),
+    ]
+
+    print(f"{'validator':<12}{'cold':>10}{'cached':>10}{'garbage':>10}{'direct':>10}   мкс/вызов")
+    for name, func, unique, repeated, garbage, direct in cases:
+        validators.clear_caches()
+        cold = per_call_us(func, unique)
+        cached = per_call_us(func, repeated * calls)
+        rejected = per_call_us(func, garbage * calls)
+        raw = f"{per_call_us(direct, garbage * calls):>10.2f}" if direct else f"{'-':>10}"
+        print(f"{name:<12}{cold:>10.2f}{cached:>10.2f}{rejected:>10.2f}{raw}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк валидаторов регистрации")
+    parser.add_argument("--calls", type=int, default=2000, help="Вызовов на каждый сценарий")
+    args = parser.parse_args()
+    main(args.calls)
@@ -1,11 +1,12 @@
 # scripts/populate_base_schedule.py
+import asyncio
 from datetime import time
-import sqlite3
+
+import aiosqlite
+
 from core.models.schedule import BaseScheduleTemplate
 from core.repositories.schedule_repo import BaseScheduleTemplateRepo
-
-conn = sqlite3.connect("data/club_schedule.db")
-repo = BaseScheduleTemplateRepo(conn)
+from core.repositories.unit_of_work import UnitOfWork
 
 # пример базового расписания
 templates = [
@@ -57,8 +58,19 @@ templates = [
     ),
 ]
 
-for t in templates:
-    repo.add(t)
 
-print("Базовое расписание создано ✅")
-conn.close()
+async def main():
+    conn = await aiosqlite.connect("data/club_schedule.db")
+    repo = BaseScheduleTemplateRepo(conn)
+    try:
+        async with UnitOfWork(conn).transaction():
+            for t in templates:
+                await repo.add(t)
+    finally:
+        await conn.close()
+
+    print("Базовое расписание создано ✅")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
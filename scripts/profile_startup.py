@@ -0,0 +1,111 @@
+# scripts/profile_startup.py
+"""
+Профиль холодного старта бота:
+- разбивка времени импорта main.py (python -X importtime) по пакетам
+  верхнего уровня и самые тяжёлые модули;
+- RSS процесса после импорта и какие тяжёлые библиотеки уже загружены;
+- time-to-first-poll: main.main() запускается до хука dp.startup
+  (aiogram вызывает его прямо перед первым getUpdates) и сразу
+  останавливается — запросов к Telegram не делается.
+
+Каждый замер — в отдельном процессе, чтобы модули не были уже в sys.modules.
+Процессы получают DATA_DIR и LOGS_DIR во временном каталоге: полный старт
+(миграции, фоновые задачи, в том числе материализация расписания) работает
+с пустыми БД и не трогает рабочие файлы из data/ и logs/bot.log.
+
+Запуск из корня проекта:
+    python -m scripts.profile_startup --top 15
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("phonenumbers", "email_validator", "aiohttp", "pydantic")
+
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+MEMORY_CODE = (
+    "import resource, sys, main; "
+    f"print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, *[m in sys.modules for m in {HEAVY_MODULES!r}])"
+)
+
+FIRST_POLL_CODE = """
+import asyncio, main
+
+@main.dp.startup()
+async def _stop_after_startup(dispatcher):
+    asyncio.get_running_loop().create_task(dispatcher.stop_polling())
+
+asyncio.run(main.main())
+"""
+
+
+def run_python(*args: str, data_dir: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env.setdefault("BOT_TOKEN", "1:profile")
+    env["DATA_DIR"] = data_dir
+    env["LOGS_DIR"] = os.path.join(data_dir, "logs")
+    return subprocess.run(
+        [sys.executable, *args], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(модуль, self мкс, cumulative мкс, глубина вложенности) по строкам -X importtime."""
+    rows = []
+    for line in stderr.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return rows
+
+
+def report_imports(top: int, data_dir: str):
+    rows = parse_importtime(run_python("-X", "importtime", "-c", "import main", data_dir=data_dir).stderr)
+
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    total = sum(by_package.values())
+
+    print(f"Импорт main.py: {total / 1000:.1f} мс, модулей: {len(rows)}\n")
+    print(f"{'пакет':<30}{'мс':>10}{'доля':>8}")
+    for package, us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"{package:<30}{us / 1000:>10.1f}{us / total:>8.0%}")
+
+    print(f"\n{'модуль (cumulative)':<50}{'мс':>10}")
+    for name, _, cumulative, _ in sorted(rows, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"{name:<50}{cumulative / 1000:>10.1f}")
+
+
+def report_memory(data_dir: str):
+    rss_kb, *loaded = run_python("-c", MEMORY_CODE, data_dir=data_dir).stdout.split()
+    print(f"\nRSS после импорта: {int(rss_kb) / 1024:.1f} МБ")
+    for module, flag in zip(HEAVY_MODULES, loaded):
+        print(f"  {module:<20}{'загружен' if flag == 'True' else 'не загружен'}")
+
+
+def report_first_poll(data_dir: str):
+    proc = run_python("-c", FIRST_POLL_CODE, data_dir=data_dir)
+    lines = [line for line in (proc.stdout + proc.stderr).splitlines() if "Time to first poll" in line]
+    print("\n" + (lines[-1].split("|")[-1].strip() if lines else "Time to first poll: не найдено в логе"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Профиль холодного старта бота")
+    parser.add_argument("--top", type=int, default=15, help="Сколько пакетов/модулей показать")
+    parser.add_argument("--no-poll", action="store_true", help="Не запускать main() для time-to-first-poll")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="profile_startup_") as data_dir:
+        report_imports(args.top, data_dir)
+        report_memory(data_dir)
+        if not args.no_poll:
+            report_first_poll(data_dir)
@@ -1,7 +1,13 @@
 ﻿# telegram/bot.py
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
-from config import BOT_TOKEN
+from config import (
+    BOT_TOKEN,
+    OUTBOUND_GLOBAL_RATE,
+    OUTBOUND_GROUP_PER_MINUTE,
+    OUTBOUND_PRIVATE_PER_SECOND,
+)
+from telegram.middlewares.outbound import OutboundRateLimiter
 
 # bot = Bot(token=BOT_TOKEN, parse_mode="HTML")
 bot = Bot(
@@ -10,4 +16,12 @@ bot = Bot(
     default=DefaultBotProperties(parse_mode="HTML")
 )
 
+# все исходящие запросы проходят через лимитер (rate limit, retry_after, схлопывание правок)
+outbound_limiter = OutboundRateLimiter(
+    global_rate=OUTBOUND_GLOBAL_RATE,
+    group_per_minute=OUTBOUND_GROUP_PER_MINUTE,
+    private_per_second=OUTBOUND_PRIVATE_PER_SECOND,
+)
+bot.session.middleware(outbound_limiter)
+
 dp = Dispatcher()
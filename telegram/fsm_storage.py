@@ -0,0 +1,220 @@
+# telegram/fsm_storage.py
+"""
+FSM-хранилище aiogram на SQLite с write-back кешем в памяти.
+
+- get_state/get_data/set_* работают только с памятью (без await на БД);
+- изменённые ключи раз в flush_interval секунд пишутся в БД одной
+  транзакцией (последнее значение ключа — одна строка);
+- состояния, не менявшиеся дольше ttl секунд, считаются брошенными и
+  удаляются из памяти и из БД;
+- при старте незавершённые состояния загружаются из БД, поэтому
+  регистрация и админские диалоги переживают рестарт бота.
+"""
+import asyncio
+import json
+import logging
+import time
+from copy import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Set
+
+import aiosqlite
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from core.repositories.sqlite_factory import open_connection, close_connection
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FSMRecord:
+    state: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    updated_at: float = 0.0
+
+    def is_empty(self) -> bool:
+        return self.state is None and not self.data
+
+
+def storage_key_to_str(key: StorageKey) -> str:
+    return ":".join(
+        str(part) if part is not None else ""
+        for part in (
+            key.bot_id,
+            key.chat_id,
+            key.user_id,
+            key.thread_id,
+            key.business_connection_id,
+            key.destiny,
+        )
+    )
+
+
+class SqliteStorage(BaseStorage):
+    def __init__(self, db_path, flush_interval: float = 2.0, ttl: float = 24 * 3600):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.ttl = ttl
+
+        self.conn: Optional[aiosqlite.Connection] = None
+        self._records: Dict[str, FSMRecord] = {}
+        self._dirty: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    # ----------------- жизненный цикл -----------------
+    async def open(self):
+        """Открыть БД, загрузить живые состояния и запустить фоновую запись."""
+        self.conn = await open_connection(self.db_path)
+        await self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fsm_states (
+                key TEXT PRIMARY KEY,
+                state TEXT,
+                data TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        await self.conn.execute("DELETE FROM fsm_states WHERE updated_at < ?", (time.time() - self.ttl,))
+        await self.conn.commit()
+
+        cur = await self.conn.execute("SELECT key, state, data, updated_at FROM fsm_states")
+        rows = await cur.fetchall()
+        await cur.close()
+        for key, state, data, updated_at in rows:
+            self._records[key] = FSMRecord(
+                state=state,
+                data=json.loads(data) if data else {},
+                updated_at=updated_at,
+            )
+        logger.info("FSM storage loaded %s states from %s", len(self._records), self.db_path)
+
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        if self.conn is not None:
+            await self.flush()
+            await close_connection(self.conn)
+            self.conn = None
+
+    # ----------------- BaseStorage -----------------
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = self._touch(key)
+        record.state = state.state if isinstance(state, State) else state
+        self._cleanup(key)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = self._get(key)
+        return record.state if record else None
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            raise DataNotDictLikeError(
+                f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            )
+        record = self._touch(key)
+        record.data = data.copy()
+        self._cleanup(key)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = self._get(key)
+        return record.data.copy() if record else {}
+
+    async def get_value(self, storage_key: StorageKey, dict_key: str, default: Optional[Any] = None) -> Optional[Any]:
+        record = self._get(storage_key)
+        return copy(record.data.get(dict_key, default)) if record else default
+
+    # ----------------- память -----------------
+    def _get(self, key: StorageKey) -> Optional[FSMRecord]:
+        skey = storage_key_to_str(key)
+        record = self._records.get(skey)
+        if record is not None and record.updated_at < time.time() - self.ttl:
+            del self._records[skey]
+            self._dirty.add(skey)
+            return None
+        return record
+
+    def _touch(self, key: StorageKey) -> FSMRecord:
+        skey = storage_key_to_str(key)
+        record = self._records.get(skey)
+        if record is None:
+            record = self._records[skey] = FSMRecord()
+        record.updated_at = time.time()
+        self._dirty.add(skey)
+        return record
+
+    def _cleanup(self, key: StorageKey):
+        skey = storage_key_to_str(key)
+        record = self._records.get(skey)
+        if record is not None and record.is_empty():
+            del self._records[skey]
+
+    # ----------------- запись в БД -----------------
+    async def flush(self) -> int:
+        """Записать изменённые ключи одной транзакцией. Возвращает число ключей."""
+        async with self._flush_lock:
+            if self.conn is None:
+                return 0
+
+            now = time.time()
+            for skey in [k for k, r in self._records.items() if r.updated_at < now - self.ttl]:
+                del self._records[skey]
+                self._dirty.add(skey)
+
+            if not self._dirty:
+                return 0
+
+            dirty, self._dirty = self._dirty, set()
+            upserts, deletes = [], []
+            for skey in dirty:
+                record = self._records.get(skey)
+                if record is None:
+                    deletes.append((skey,))
+                    continue
+                try:
+                    payload = json.dumps(record.data, ensure_ascii=False) if record.data else None
+                except (TypeError, ValueError):
+                    logger.exception("FSM data for %s is not JSON-serializable, kept in memory only", skey)
+                    continue
+                upserts.append((skey, record.state, payload, record.updated_at))
+
+            try:
+                if upserts:
+                    await self.conn.executemany(
+                        """
+                        INSERT INTO fsm_states (key, state, data, updated_at)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT(key) DO UPDATE SET
+                            state=excluded.state,
+                            data=excluded.data,
+                            updated_at=excluded.updated_at
+                        """,
+                        upserts,
+                    )
+                if deletes:
+                    await self.conn.executemany("DELETE FROM fsm_states WHERE key = ?", deletes)
+                await self.conn.commit()
+            except Exception:
+                await self.conn.rollback()
+                self._dirty |= dirty
+                raise
+
+            return len(upserts) + len(deletes)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("FSM storage flush failed, will retry")
@@ -1,64 +1,108 @@
 # telegram/handlers/admin.py
-from aiogram import Router
-from aiogram.types import Message, FSInputFile
+from aiogram import Router, F
+from aiogram.types import Message, FSInputFile, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.filters import Command
+from aiogram.exceptions import TelegramAPIError
+from html import escape
+from typing import List
 
 from config import ADMINS
 from core.services.user_service import UserService
-import csv
-from pathlib import Path
+from core.models.user import User
+from extras.export_import import export_users_to_tempfile
+from telegram.renderers.poll_renderer import tg_length
+from telegram.renderers.schedule_renderer import MESSAGE_LIMIT
+
+# пользователей на одной странице текстового списка
+USERS_PAGE_SIZE = 50
+# страницы отсчитываются смещением, поэтому их размер фиксирован, а длинные
+# имена обрезаются: USERS_PAGE_SIZE строк с заголовком всегда влезают в сообщение
+USER_LINE_LIMIT = (MESSAGE_LIMIT - 200) // USERS_PAGE_SIZE - 1
+
+
+def shorten(text: str, limit: int) -> str:
+    """Экранированный text не длиннее limit (в единицах UTF-16); обрезанный — с «…»."""
+    escaped = escape(text)
+    if tg_length(escaped) <= limit:
+        return escaped
+    cut = text[:limit]
+    while cut and tg_length(escape(cut)) + 1 > limit:
+        cut = cut[:-1]
+    return escape(cut) + "…"
+
+
+def user_line(idx: int, user: User) -> str:
+    prefix = f"{idx}. {user.user_id} — "
+    room = max(USER_LINE_LIMIT - len(prefix) - 3, 2)
+    fio = user.fio or ""
+    # ФИО получает не больше половины места, остаток — Telegram-имени
+    fio_room = min(tg_length(escape(fio)), room // 2)
+    name = shorten(user.full_name or "Без имени", room - fio_room)
+    return f"{prefix}{name} - {shorten(fio, room - tg_length(name))}"
+
+
+def render_users_text(users: List[User], total: int, start: int) -> str:
+    text_lines = [f"📋 <b>Список пользователей</b> (всего {total}):\n"]
+    text_lines.extend(user_line(idx, u) for idx, u in enumerate(users, start=start))
+    return "\n".join(text_lines)
+
+
+def users_page_keyboard(page: int, pages: int) -> InlineKeyboardMarkup | None:
+    if pages <= 1:
+        return None
+    nav = []
+    if page > 0:
+        nav.append(InlineKeyboardButton(text="◀", callback_data=f"users_page:{page - 1}"))
+    nav.append(InlineKeyboardButton(text=f"{page + 1}/{pages}", callback_data="noop"))
+    if page < pages - 1:
+        nav.append(InlineKeyboardButton(text="▶", callback_data=f"users_page:{page + 1}"))
+    return InlineKeyboardMarkup(inline_keyboard=[nav])
+
 
 def register_admin_handlers(dp, user_service: UserService):
 
     router = Router()
 
+    async def render_users_page(page: int) -> tuple[str, InlineKeyboardMarkup | None]:
+        total = await user_service.count_users()
+        pages = max(1, (total + USERS_PAGE_SIZE - 1) // USERS_PAGE_SIZE)
+        page = min(max(page, 0), pages - 1)
+        users = await user_service.get_users_page(page * USERS_PAGE_SIZE, USERS_PAGE_SIZE)
+
+        text = render_users_text(users, total, page * USERS_PAGE_SIZE + 1)
+        return text, users_page_keyboard(page, pages)
+
     @router.message(Command("users"))
     async def cmd_users(message: Message):
         # Проверяем, что это админ
         if message.from_user.id not in ADMINS:
             return await message.answer("❌ Команда доступна только администраторам.")
 
-        users = await user_service.get_all_users()
-        if not users:
+        if not await user_service.count_users():
             return await message.answer("Пока нет зарегистрированных пользователей.")
 
-        # ---------- Сортировка ----------
-        users_sorted = sorted(
-            users,
-            key=lambda u: (
-                u.fio.lower() if u.fio else "",
-                u.full_name.lower() if u.full_name else "",
-                u.username.lower() if u.username else ""
-            )
-        )
-
-                # ---------- 1) Вывод в текст ----------
-        text_lines = ["📋 <b>Список пользователей:</b>\n"]
-        for idx, u in enumerate(users_sorted, start=1):
-            text_lines.append(
-                f"{idx}. {u.user_id} — {u.full_name or 'Без имени'} - {u.fio or ''}"
-            )
-
-
-        await message.answer("\n".join(text_lines))
-
-        # ---------- 2) Выдача CSV ----------
-        csv_path = Path("users_export.csv")
-
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f, delimiter=";")
-            writer.writerow([
-                "user_id", "full_name", "username", "fio",
-                "birth_date", "gender", "phone", "email",
-                "created_at", "updated_at"
-            ])
-            for u in users_sorted:
-                writer.writerow([
-                    u.user_id, u.full_name, u.username, u.fio,
-                    u.birth_date, u.gender, u.phone, u.email,
-                    u.created_at, u.updated_at
-                ])
-
-        await message.answer_document(FSInputFile(csv_path))
+        # ---------- 1) Вывод в текст (постранично) ----------
+        text, keyboard = await render_users_page(0)
+        await message.answer(text, reply_markup=keyboard)
+
+        # ---------- 2) Выдача CSV (потоково во временный файл) ----------
+        csv_path = await export_users_to_tempfile(user_service.repo)
+        try:
+            await message.answer_document(FSInputFile(csv_path, filename="users_export.csv"))
+        finally:
+            csv_path.unlink(missing_ok=True)
+
+    @router.callback_query(F.data.startswith("users_page:"))
+    async def users_page(query: CallbackQuery):
+        if query.from_user.id not in ADMINS:
+            return await query.answer("❌ Только для администраторов.", show_alert=True)
+
+        text, keyboard = await render_users_page(int(query.data.split(":")[1]))
+        try:
+            await query.message.edit_text(text, reply_markup=keyboard)
+        except TelegramAPIError as e:
+            if "message is not modified" not in str(e):
+                raise
+        await query.answer()
 
     dp.include_router(router)
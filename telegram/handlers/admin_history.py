@@ -0,0 +1,95 @@
+# telegram/handlers/admin_history.py
+from aiogram import Router, F
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.filters import Command, CommandObject
+from aiogram.exceptions import TelegramAPIError
+from html import escape
+from typing import List, Optional
+
+from config import ADMINS
+from core.models.schedule import ScheduleChangeSummary, GROUP_LOG_TRAINING_ID
+from core.repositories.schedule_repo import LogCursor
+from core.services.history_service import HistoryService
+from core.services.user_service import UserService
+
+# записей журнала на одной странице
+HISTORY_PAGE_SIZE = 15
+
+CHANGE_TYPE_LABELS = {
+    "added": "добавлено",
+    "canceled": "отменено",
+    "moved": "перенесено",
+    "time_changed": "изменено время",
+    "trainer_changed": "сменён тренер",
+    "range_canceled": "отмена диапазона",
+    "range_shifted": "сдвиг диапазона",
+    "range_trainer_changed": "замена тренера в диапазоне",
+}
+
+
+def history_keyboard(training_id: Optional[int], cursor: Optional[LogCursor]) -> InlineKeyboardMarkup | None:
+    if cursor is None:
+        return None
+    ts, log_id = cursor
+    # history:<training_id|0>:<id>:<timestamp> — timestamp сам содержит ':'
+    return InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text="Далее ▶", callback_data=f"history:{training_id or 0}:{log_id}:{ts}")
+    ]])
+
+
+def render_history(entries: List[ScheduleChangeSummary], names: dict, training_id: Optional[int]) -> str:
+    title = f"🕓 <b>История занятия #{training_id}</b>" if training_id else "🕓 <b>История изменений</b>"
+    lines = [title, ""]
+    for e in entries:
+        if e.training_id == GROUP_LOG_TRAINING_ID:
+            target = "группа занятий"
+        else:
+            when = f"{e.training_date:%d.%m} {e.training_start_time:%H:%M}" if e.training_date and e.training_start_time else "—"
+            target = f"#{e.training_id} ({when})"
+        lines.append(
+            f"{e.timestamp:%d.%m %H:%M} · {CHANGE_TYPE_LABELS.get(e.change_type, e.change_type)} · "
+            f"{target} · {escape(names.get(e.admin_user_id, str(e.admin_user_id)))}"
+        )
+    return "\n".join(lines)
+
+
+def get_admin_history_router(history_service: HistoryService, user_service: UserService) -> Router:
+    router = Router()
+
+    async def page(training_id: Optional[int], before: Optional[LogCursor]):
+        entries, cursor = await history_service.recent(HISTORY_PAGE_SIZE, before=before, training_id=training_id)
+        names = await user_service.resolve_display_names(e.admin_user_id for e in entries)
+        return entries, render_history(entries, names, training_id), history_keyboard(training_id, cursor)
+
+    # /history — весь журнал, /history <id> — одно занятие
+    @router.message(Command("history"))
+    async def cmd_history(message: Message, command: CommandObject):
+        if message.from_user.id not in ADMINS:
+            return await message.answer("❌ Команда доступна только администраторам.")
+
+        training_id = None
+        if command.args:
+            if not command.args.strip().isdigit():
+                return await message.answer("Использование: /history или /history <id занятия>")
+            training_id = int(command.args)
+
+        entries, text, keyboard = await page(training_id, None)
+        if not entries:
+            return await message.answer("Журнал изменений пуст.")
+        await message.answer(text, reply_markup=keyboard)
+
+    @router.callback_query(F.data.startswith("history:"))
+    async def history_next(query: CallbackQuery):
+        if query.from_user.id not in ADMINS:
+            return await query.answer("❌ Только для администраторов.", show_alert=True)
+
+        _, training_id, log_id, ts = query.data.split(":", 3)
+        _, text, keyboard = await page(int(training_id) or None, (ts, int(log_id)))
+        try:
+            await query.message.edit_text(text, reply_markup=keyboard)
+        except TelegramAPIError as e:
+            if "message is not modified" not in str(e):
+                raise
+        await query.answer()
+
+    return router
@@ -1,86 +1,149 @@
 # telegram/handlers/admin_schedule.py
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
-from aiogram.filters import Command
+from aiogram.filters import Command, CommandObject
 from aiogram.fsm.context import FSMContext
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from html import escape
 import logging
 
 from aiogram.exceptions import TelegramAPIError  # Aiogram 3
 
+from config import ADMINS
 from core.services.schedule_service import ScheduleService
 from core.services.user_service import UserService
-from telegram.keyboards.schedule_admin_keyboards import (
-    admin_session_keyboard,
-    extra_session_keyboard,
-)
+from telegram.keyboards.schedule_admin_keyboards import schedule_admin_keyboard
+from telegram.renderers.schedule_renderer import answer_schedule
 from .admin_schedule_states import MoveSessionStates, AddExtraSessionStates
 
 router = Router()
 logger = logging.getLogger(__name__)
 
+# строк отчёта /conflicts в одном сообщении
+CONFLICTS_SHOWN = 40
+
+
+def parse_admin_date(text: str) -> date:
+    """YYYY-MM-DD или ДД.ММ.ГГГГ."""
+    for fmt in ("%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Некорректная дата: {text}")
+
+
+def parse_range_args(command: CommandObject, extra: int) -> tuple:
+    """<начало> <конец> и ещё extra аргументов; остаток строки — последним элементом."""
+    parts = (command.args or "").split(maxsplit=2 + extra)
+    if len(parts) < 2 + extra:
+        raise ValueError("Недостаточно аргументов")
+    start, end = parse_admin_date(parts[0]), parse_admin_date(parts[1])
+    rest = parts[2 + extra] if len(parts) > 2 + extra else ""
+    return start, end, parts[2:2 + extra], rest
+
 def get_admin_schedule_router(
     schedule_service: ScheduleService,
     user_service: UserService
 ) -> Router:
 
-    RU_WEEKDAYS = ["Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресенье"]
-
-    async def format_trainer_name(user_id: int) -> str:
-        user = await user_service.repo.get(user_id)
-        if not user:
-            return f"#{user_id}"
-        if user.fio:
-            return user.fio
-        elif user.username:
-            return user.username
-        elif user.full_name:
-            return user.full_name
-        else:
-            return f"#{user_id}"
-
     # ----------------- Расписание на сегодня -----------------
     @router.message(Command("schedule_today"))
     async def schedule_today(message: Message):
         today = date.today()
-        instances = schedule_service.build_daily_schedule(today)
+        schedule = await schedule_service.get_schedule_range(today, today)
 
-        if not instances:
+        if not schedule[today]:
             await message.answer("Сегодня занятий нет.")
             return
 
-        weekday_name = RU_WEEKDAYS[today.weekday()]
-
-        for inst in instances:
-            trainer_name = await format_trainer_name(inst.trainer_id)
-            await message.answer(
-                f"{inst.id}) {inst.training_type} {inst.start_time.strftime('%H:%M')} "
-                f"({inst.duration_minutes} мин), тренер: {trainer_name}, зал: {inst.place}, статус: {inst.status}",
-                reply_markup=admin_session_keyboard(inst.id)
-            )
-
-        await message.answer("Управление занятиями:", reply_markup=extra_session_keyboard())
+        trainer_names = await user_service.resolve_display_names(i.trainer_id for i in schedule[today])
+        await answer_schedule(message, schedule, trainer_names, page_key=f"{today.isoformat()}:1")
 
     # ----------------- Расписание на неделю -----------------
     @router.message(Command("schedule_week"))
     async def schedule_week(message: Message):
         today = date.today()
-        for i in range(7):
-            day = today + timedelta(days=i)
-            weekday_name = RU_WEEKDAYS[day.weekday()]
-            instances = schedule_service.build_daily_schedule(day)
-            text = f"📅 {day.isoformat()} ({weekday_name})"
-            if not instances:
-                await message.answer(f"{text}\n  Занятий нет")
-            else:
-                for inst in instances:
-                    trainer_name = await format_trainer_name(inst.trainer_id)
-                    await message.answer(
-                        f"{inst.id}) {inst.training_type} {inst.start_time.strftime('%H:%M')} "
-                        f"({inst.duration_minutes} мин), тренер: {trainer_name}, зал: {inst.place}, статус: {inst.status}",
-                        reply_markup=admin_session_keyboard(inst.id)
-                    )
-        await message.answer("Управление занятиями:", reply_markup=extra_session_keyboard())
+        week = await schedule_service.get_schedule_range(today, today + timedelta(days=6))
+        trainer_names = await user_service.resolve_display_names(
+            i.trainer_id for instances in week.values() for i in instances
+        )
+        await answer_schedule(message, week, trainer_names, page_key=f"{today.isoformat()}:7")
+
+    # ----------------- Операции над диапазоном дат -----------------
+    # /cancel_range 2025-12-31 2026-01-08 [причина]
+    @router.message(Command("cancel_range"))
+    async def cancel_range(message: Message, command: CommandObject):
+        if message.from_user.id not in ADMINS:
+            return await message.answer("❌ Команда доступна только администраторам.")
+        try:
+            start, end, _, reason = parse_range_args(command, 0)
+            ids = await schedule_service.cancel_range(start, end, admin_id=message.from_user.id, reason=reason)
+        except ValueError as e:
+            return await message.answer(f"❌ {e}\nИспользование: /cancel_range <начало> <конец> [причина]")
+        await message.answer(f"Отменено занятий: {len(ids)} ({start:%d.%m.%Y}–{end:%d.%m.%Y}) ✅")
+
+    # /shift_range 2025-03-01 2025-03-31 +30
+    @router.message(Command("shift_range"))
+    async def shift_range(message: Message, command: CommandObject):
+        if message.from_user.id not in ADMINS:
+            return await message.answer("❌ Команда доступна только администраторам.")
+        try:
+            start, end, (minutes,), _ = parse_range_args(command, 1)
+            shifted, skipped = await schedule_service.shift_range(
+                start, end, int(minutes), admin_id=message.from_user.id
+            )
+        except ValueError as e:
+            return await message.answer(f"❌ {e}\nИспользование: /shift_range <начало> <конец> <±минуты>")
+        text = f"Сдвинуто занятий: {len(shifted)} на {int(minutes):+d} мин ✅"
+        if skipped:
+            text += f"\nНе сдвинуты (переход через полночь): {', '.join(f'#{i}' for i in skipped)}"
+        await message.answer(text)
+
+    # /reassign_trainer 2025-03-01 2025-03-31 <id старого> <id нового>
+    @router.message(Command("reassign_trainer"))
+    async def reassign_trainer(message: Message, command: CommandObject):
+        if message.from_user.id not in ADMINS:
+            return await message.answer("❌ Команда доступна только администраторам.")
+        try:
+            start, end, (from_id, to_id), _ = parse_range_args(command, 2)
+            ids = await schedule_service.reassign_trainer_range(
+                start, end, int(from_id), int(to_id), admin_id=message.from_user.id
+            )
+        except ValueError as e:
+            return await message.answer(
+                f"❌ {e}\nИспользование: /reassign_trainer <начало> <конец> <id тренера> <id нового тренера>"
+            )
+        await message.answer(f"Передано занятий: {len(ids)} ✅")
+
+    # ----------------- Отчёт о пересечениях -----------------
+    # /conflicts [2025-03] — двойная занятость тренеров и залов за месяц
+    @router.message(Command("conflicts"))
+    async def conflicts(message: Message, command: CommandObject):
+        if message.from_user.id not in ADMINS:
+            return await message.answer("❌ Команда доступна только администраторам.")
+        try:
+            month = datetime.strptime(command.args.strip(), "%Y-%m") if command.args else datetime.today()
+        except ValueError:
+            return await message.answer("Использование: /conflicts [ГГГГ-ММ]")
+
+        report, instances = await schedule_service.conflict_report(month.year, month.month)
+        if not report:
+            return await message.answer(f"Пересечений за {month:%m.%Y} нет ✅")
+
+        names = await user_service.resolve_display_names(
+            c.key for c in report if c.kind == "trainer"
+        )
+        lines = [f"⚠️ <b>Пересечения за {month:%m.%Y}</b>: {len(report)}", ""]
+        for c in report[:CONFLICTS_SHOWN]:
+            a, b = instances[c.inst_id], instances[c.other_id]
+            who = f"тренер {escape(names.get(c.key, str(c.key)))}" if c.kind == "trainer" else f"зал {escape(c.key)}"
+            lines.append(
+                f"{a.date:%d.%m} {a.start_time:%H:%M} #{a.id} ↔ {b.start_time:%H:%M} #{b.id} · {who}"
+            )
+        if len(report) > CONFLICTS_SHOWN:
+            lines.append(f"… и ещё {len(report) - CONFLICTS_SHOWN}")
+        await message.answer("\n".join(lines))
 
     # ----------------- Обработка inline callback -----------------
     @router.callback_query(F.data)
@@ -91,15 +154,30 @@ def get_admin_schedule_router(
         try:
             if data.startswith("cancel:"):
                 inst_id = int(data.split(":")[1])
-                schedule_service.cancel(inst_id=inst_id, admin_id=user_id, reason="Через телеграм")
+                await schedule_service.cancel(inst_id=inst_id, admin_id=user_id, reason="Через телеграм")
                 await query.answer("Занятие отменено ✅")
+
+            elif data.startswith("sched_page:"):
+                # sched_page:<start>:<days>:<page> — листание сводной клавиатуры
+                _, start_iso, days, page = data.split(":")
+                start = date.fromisoformat(start_iso)
+                schedule = await schedule_service.get_schedule_range(
+                    start, start + timedelta(days=int(days) - 1)
+                )
+                instances = [inst for day in schedule.values() for inst in day]
                 try:
-                    await query.message.edit_reply_markup(reply_markup=admin_session_keyboard(inst_id))
+                    await query.message.edit_reply_markup(
+                        reply_markup=schedule_admin_keyboard(instances, int(page), f"{start_iso}:{days}")
+                    )
                 except TelegramAPIError as e:
                     if "message is not modified" in str(e):
                         pass
                     else:
                         raise
+                await query.answer()
+
+            elif data == "noop":
+                await query.answer()
 
             elif data.startswith("move:"):
                 inst_id = int(data.split(":")[1])
@@ -0,0 +1,45 @@
+# telegram/handlers/polls.py
+from datetime import datetime, timedelta
+
+from aiogram import Router, F
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message, CallbackQuery
+
+from config import ADMINS, POLL_DURATION_HOURS
+from core.services.poll_service import PollService
+from telegram.renderers.poll_renderer import POLL_CALLBACK_PREFIX, poll_keyboard, render_poll
+
+DEFAULT_POLL_TITLE = "Кто придёт на тренировку?"
+
+
+def get_poll_router(poll_service: PollService) -> Router:
+    router = Router()
+
+    # /poll [заголовок] — опрос посещаемости в групповом чате
+    @router.message(Command("poll"))
+    async def cmd_poll(message: Message, command: CommandObject):
+        if message.chat.type == "private":
+            return await message.answer("Опрос посещаемости создаётся в групповом чате.")
+        if message.from_user.id not in ADMINS:
+            return await message.answer("❌ Команда доступна только администраторам.")
+
+        title = (command.args or "").strip() or DEFAULT_POLL_TITLE
+        poll = await poll_service.create_poll(
+            message.chat.id, title, datetime.now() + timedelta(hours=POLL_DURATION_HOURS)
+        )
+        sent = await message.answer(render_poll(poll), reply_markup=poll_keyboard(poll))
+        await poll_service.attach_message(poll.id, sent.message_id)
+
+    # poll:<id>:<yes|no> — сообщение правит poll_updater, здесь только ответ на нажатие
+    @router.callback_query(F.data.startswith(POLL_CALLBACK_PREFIX))
+    async def poll_vote(query: CallbackQuery):
+        user = query.from_user
+        try:
+            # устаревшая или испорченная кнопка — тот же ответ, что и для закрытого опроса
+            _, poll_id, answer = query.data.split(":")
+            changed = await poll_service.add_vote(int(poll_id), user.id, user.username, user.full_name, answer)
+        except ValueError:
+            return await query.answer("Голосование закрыто.", show_alert=True)
+        await query.answer("Голос учтён ✅" if changed else "Ваш голос уже учтён.")
+
+    return router
@@ -4,13 +4,16 @@ from aiogram.types import Message
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.context import FSMContext
 from core.services.user_service import UserService
-import re
-from datetime import datetime
-import phonenumbers
-from email_validator import validate_email as validate_email_lib, EmailNotValidError
+from core.utils.validators import (
+    SKIP_SIGNAL,
+    validate_birthdate,
+    validate_email,
+    validate_full_name,
+    validate_gender,
+    validate_phone,
+)
 
 router = Router()
-SKIP_SIGNAL = "-"  # сигнал для пропуска поля
 
 
 class RegistrationStates(StatesGroup):
@@ -21,76 +24,6 @@ class RegistrationStates(StatesGroup):
     email = State()
 
 
-# ----------------- Helper validators -----------------
-def validate_full_name(text: str) -> str | None:
-    if text == SKIP_SIGNAL:
-        return None
-    parts = text.strip().split()
-    if len(parts) < 2:
-        return None
-    return " ".join(p.capitalize() for p in parts)
-
-
-def validate_birthdate(text: str) -> str | None:
-    if text == SKIP_SIGNAL:
-        return None
-    text = text.strip()
-
-    # Полная дата дд.мм.гггг
-    if re.fullmatch(r"\d{1,2}\.\d{1,2}\.\d{4}", text):
-        day, month, year = map(int, text.split("."))
-        try:
-            datetime(year, month, day)
-            return text
-        except ValueError:
-            return None
-
-    # Только год
-    if re.fullmatch(r"\d{4}", text):
-        year = int(text)
-        current_year = datetime.now().year
-        if current_year-90 <= year <= current_year-10:
-            return text
-        return None
-
-    return None
-
-
-def validate_gender(text: str) -> str | None:
-    if text == SKIP_SIGNAL:
-        return None
-    g = text.strip().lower()
-    if g in ["м", "муж", "male"]:
-        return "М"
-    elif g in ["ж", "жен", "female"]:
-        return "Ж"
-    return None
-
-
-def validate_phone(text: str) -> str | None:
-    if text == SKIP_SIGNAL:
-        return None
-    text = text.strip()
-    try:
-        pn = phonenumbers.parse(text, None)
-        if phonenumbers.is_valid_number(pn):
-            return phonenumbers.format_number(pn, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
-    except phonenumbers.NumberParseException:
-        return None
-    return None
-
-
-def validate_email(text: str) -> str | None:
-    if text == SKIP_SIGNAL:
-        return None
-    text = text.strip()
-    try:
-        v = validate_email_lib(text)
-        return v.email
-    except EmailNotValidError:
-        return None
-
-
 # ----------------- FSM Handlers -----------------
 def register_registration_handlers(router: Router, user_service: UserService):
     
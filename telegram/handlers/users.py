@@ -22,8 +22,8 @@ def get_router(user_service: UserService) -> Router:
 
     @router.message(Command("profile"))
     async def cmd_profile(message: Message):
-        # get - асинхронный, надо await
-        u = await user_service.repo.get(message.from_user.id)
+        # get_user - асинхронный (кеш + база), надо await
+        u = await user_service.get_user(message.from_user.id)
         if not u:
             return await message.reply("Профиль не найден. Отправьте /register")
 
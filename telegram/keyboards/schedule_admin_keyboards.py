@@ -1,6 +1,13 @@
 # telegram/keyboards/schedule_admin_keyboards.py
+from typing import List
+
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from core.models.schedule import TrainingInstance
+
+# занятий на одной странице сводной клавиатуры (3 кнопки на занятие)
+SCHEDULE_PAGE_SIZE = 8
+
 def admin_session_keyboard(inst_id: int) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -18,3 +25,37 @@ def extra_session_keyboard() -> InlineKeyboardMarkup:
             [InlineKeyboardButton(text="Добавить доп. занятие", callback_data="add_extra")]
         ]
     )
+
+def schedule_admin_keyboard(
+    instances: List[TrainingInstance],
+    page: int,
+    page_key: str,
+    page_size: int = SCHEDULE_PAGE_SIZE,
+) -> InlineKeyboardMarkup:
+    """
+    Одна клавиатура на всё сообщение с расписанием: по строке кнопок
+    на занятие текущей страницы, навигация ◀/▶ (callback sched_page:<page_key>:<page>)
+    и кнопка доп. занятия.
+    """
+    pages = max(1, (len(instances) + page_size - 1) // page_size)
+    page = min(max(page, 0), pages - 1)
+
+    rows = []
+    for inst in instances[page * page_size:(page + 1) * page_size]:
+        rows.append([
+            InlineKeyboardButton(text=f"❌ {inst.id}", callback_data=f"cancel:{inst.id}"),
+            InlineKeyboardButton(text=f"↪ {inst.id}", callback_data=f"move:{inst.id}"),
+            InlineKeyboardButton(text=f"👤 {inst.id}", callback_data=f"change_trainer:{inst.id}"),
+        ])
+
+    if pages > 1:
+        nav = []
+        if page > 0:
+            nav.append(InlineKeyboardButton(text="◀", callback_data=f"sched_page:{page_key}:{page - 1}"))
+        nav.append(InlineKeyboardButton(text=f"{page + 1}/{pages}", callback_data="noop"))
+        if page < pages - 1:
+            nav.append(InlineKeyboardButton(text="▶", callback_data=f"sched_page:{page_key}:{page + 1}"))
+        rows.append(nav)
+
+    rows.append([InlineKeyboardButton(text="Добавить доп. занятие", callback_data="add_extra")])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
@@ -0,0 +1,195 @@
+# telegram/middlewares/outbound.py
+"""
+Исходящий диспетчер запросов к Telegram (request-middleware сессии бота).
+
+- token bucket на весь бот (~30 сообщений/с) и на каждый чат
+  (группы ~20/мин, личные чаты ~1/с);
+- при TelegramRetryAfter чат ставится на паузу
+  на retry_after секунд, запрос повторяется;
+- правки одного и того же сообщения схлопываются: если пока запрос ждал
+  очереди пришла более новая правка, старая не отправляется;
+- счётчики: глубина очереди, задержка ожидания, повторы, схлопывания.
+
+Ограничиваются только методы с chat_id (send*/edit*/delete*...);
+getUpdates, answerCallbackQuery и т.п. проходят без ожидания.
+"""
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Tuple
+
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    EditMessageCaption,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    Response,
+    TelegramMethod,
+)
+from aiogram.methods.base import TelegramType
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+EDIT_METHODS = (EditMessageText, EditMessageReplyMarkup, EditMessageCaption)
+
+
+class TokenBucket:
+    """Token bucket с FIFO-ожиданием: rate токенов в секунду, не больше capacity."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def refund(self):
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, self._clock() + seconds)
+
+    def idle(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity and not self._lock.locked()
+
+
+class OutboundRateLimiter(BaseRequestMiddleware):
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        group_per_minute: float = 20.0,
+        private_per_second: float = 1.0,
+        max_retries: int = 3,
+        max_idle_buckets: int = 1000,
+    ):
+        self.global_bucket = TokenBucket(rate=global_rate, capacity=global_rate)
+        self.group_rate = group_per_minute / 60.0
+        self.group_capacity = max(1.0, group_per_minute / 4)
+        self.private_rate = private_per_second
+        self.private_capacity = max(1.0, private_per_second * 3)
+        self.max_retries = max_retries
+        self.max_idle_buckets = max_idle_buckets
+
+        self._chat_buckets: Dict[Hashable, TokenBucket] = {}
+        # последняя «версия» правки по (chat_id, message_id)
+        self._edit_versions: Dict[Tuple[Hashable, int], int] = {}
+
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.sent = 0
+        self.retries = 0
+        self.coalesced = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    # ----------------- buckets -----------------
+    def _chat_bucket(self, chat_id: Hashable) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= self.max_idle_buckets:
+                self._prune_buckets()
+            if isinstance(chat_id, int) and chat_id > 0:
+                bucket = TokenBucket(rate=self.private_rate, capacity=self.private_capacity)
+            else:
+                bucket = TokenBucket(rate=self.group_rate, capacity=self.group_capacity)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _prune_buckets(self):
+        for chat_id in [k for k, b in self._chat_buckets.items() if b.idle()]:
+            del self._chat_buckets[chat_id]
+
+    # ----------------- middleware -----------------
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        edit_key = None
+        version = 0
+        if isinstance(method, EDIT_METHODS) and method.message_id is not None:
+            edit_key = (chat_id, method.message_id)
+            version = self._edit_versions.get(edit_key, 0) + 1
+            self._edit_versions[edit_key] = version
+
+        chat_bucket = self._chat_bucket(chat_id)
+        started = time.monotonic()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        attempt = 0
+        try:
+            while True:
+                await chat_bucket.acquire()
+                if edit_key is not None and self._edit_versions.get(edit_key) != version:
+                    # пока ждали, пришла более свежая правка того же сообщения
+                    chat_bucket.refund()
+                    self.coalesced += 1
+                    return Response[Any](ok=True, result=True)
+                await self.global_bucket.acquire()
+
+                if attempt == 0:
+                    self._record_wait(time.monotonic() - started)
+                try:
+                    response = await make_request(bot, method)
+                    self.sent += 1
+                    return response
+                except TelegramRetryAfter as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    attempt += 1
+                    self.retries += 1
+                    logger.warning(
+                        "Flood control for chat %s: retry after %ss (attempt %s)",
+                        chat_id, e.retry_after, attempt,
+                    )
+                    chat_bucket.pause(e.retry_after)
+        finally:
+            self.queue_depth -= 1
+            if edit_key is not None and self._edit_versions.get(edit_key) == version:
+                del self._edit_versions[edit_key]
+
+    def _record_wait(self, waited: float):
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "sent": self.sent,
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "avg_wait_ms": (self.total_wait / self.sent * 1000) if self.sent else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+            "chat_buckets": len(self._chat_buckets),
+        }
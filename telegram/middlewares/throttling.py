@@ -1,4 +1,172 @@
-﻿\"\"\"Throttling middleware placeholder.\"\"\"
+# telegram/middlewares/throttling.py
+"""
+Защита от флуда входящими апдейтами.
 
-class ThrottlingMiddleware:
-    pass
+- лимит на пользователя и на чат: скользящее окно (приближение двумя
+  соседними фиксированными окнами) — O(1) по времени и памяти на ключ;
+- повторный callback_query.data от того же пользователя в течение
+  debounce секунд отбрасывается (двойное нажатие на inline-кнопку);
+- callback'и с префиксами из chat_exempt_callbacks (голосование в опросе)
+  не учитываются в лимите чата: сотня участников группы голосует
+  за секунды, и это не флуд — лимит на пользователя при этом действует;
+- состояние хранится в OrderedDict по времени последнего обращения,
+  протухшие ключи вычищаются с головы при каждом апдейте.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery
+
+# сколько протухших ключей вычищать за один апдейт (амортизированное O(1))
+PRUNE_PER_CALL = 4
+
+
+class SlidingWindowLimiter:
+    """Не больше limit событий за window секунд на ключ."""
+
+    def __init__(self, limit: int, window: float, clock: Callable[[], float] = time.monotonic):
+        self.limit = limit
+        self.window = window
+        self._clock = clock
+        # key -> [номер окна, счётчик текущего окна, счётчик предыдущего окна]
+        self._state: "OrderedDict[Hashable, List[float]]" = OrderedDict()
+
+    def hit(self, key: Hashable) -> bool:
+        """Учесть событие; False — если лимит превышен."""
+        now = self._clock()
+        current = int(now // self.window)
+        self._prune(current)
+
+        state = self._state.get(key)
+        if state is None:
+            state = self._state[key] = [current, 0, 0]
+        else:
+            self._state.move_to_end(key)
+            if state[0] != current:
+                state[2] = state[1] if state[0] == current - 1 else 0
+                state[1] = 0
+                state[0] = current
+
+        state[1] += 1
+        elapsed = (now % self.window) / self.window
+        return state[2] * (1 - elapsed) + state[1] <= self.limit
+
+    def _prune(self, current: int):
+        for _ in range(PRUNE_PER_CALL):
+            if not self._state:
+                return
+            key, state = next(iter(self._state.items()))
+            if state[0] >= current - 1:
+                return
+            del self._state[key]
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+
+class CallbackDebouncer:
+    """Отбрасывает одинаковые callback-данные от пользователя чаще, чем раз в interval."""
+
+    def __init__(self, interval: float, clock: Callable[[], float] = time.monotonic):
+        self.interval = interval
+        self._clock = clock
+        self._seen: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def is_duplicate(self, user_id: int, data: str) -> bool:
+        now = self._clock()
+        for _ in range(PRUNE_PER_CALL):
+            if not self._seen:
+                break
+            key, ts = next(iter(self._seen.items()))
+            if now - ts < self.interval:
+                break
+            del self._seen[key]
+
+        key = (user_id, data)
+        last = self._seen.get(key)
+        if last is not None and now - last < self.interval:
+            return True
+
+        self._seen[key] = now
+        self._seen.move_to_end(key)
+        return False
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    def __init__(
+        self,
+        user_limit: int = 10,
+        user_window: float = 5.0,
+        chat_limit: int = 60,
+        chat_window: float = 10.0,
+        callback_debounce: float = 1.0,
+        chat_exempt_callbacks: Tuple[str, ...] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        self.users = SlidingWindowLimiter(user_limit, user_window, clock)
+        self.chats = SlidingWindowLimiter(chat_limit, chat_window, clock)
+        self.debouncer = CallbackDebouncer(callback_debounce, clock)
+        self.chat_exempt_callbacks = chat_exempt_callbacks
+        self.dropped = 0
+        self.debounced = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = getattr(event, "from_user", None)
+        chat_id = self._chat_id(event)
+
+        if isinstance(event, CallbackQuery) and user and event.data:
+            if self.debouncer.is_duplicate(user.id, event.data):
+                self.debounced += 1
+                await event.answer()
+                return None
+
+        allowed = True
+        if user:
+            allowed = self.users.hit(user.id)
+        # отклонённые по пользователю апдейты в лимит чата не идут —
+        # иначе один флудер забивает окно чата и глушит остальных
+        if allowed and chat_id is not None and not self._chat_exempt(event):
+            allowed = self.chats.hit(chat_id)
+
+        if not allowed:
+            self.dropped += 1
+            if isinstance(event, CallbackQuery):
+                await event.answer("Слишком часто, попробуйте чуть позже ⏳")
+            return None
+
+        return await handler(event, data)
+
+    def _chat_exempt(self, event: Any) -> bool:
+        return (
+            isinstance(event, CallbackQuery)
+            and bool(event.data)
+            and event.data.startswith(self.chat_exempt_callbacks)
+        )
+
+    @staticmethod
+    def _chat_id(event: Any) -> Optional[int]:
+        chat = getattr(event, "chat", None)
+        if chat is None:
+            message = getattr(event, "message", None)
+            chat = getattr(message, "chat", None)
+        return chat.id if chat is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "dropped": self.dropped,
+            "debounced": self.debounced,
+            "tracked_users": len(self.users),
+            "tracked_chats": len(self.chats),
+            "tracked_callbacks": len(self.debouncer),
+        }
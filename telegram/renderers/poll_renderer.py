@@ -0,0 +1,80 @@
+# telegram/renderers/poll_renderer.py
+from html import escape
+from typing import List, Optional
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from core.models.poll import ANSWER_NO, ANSWER_YES, Poll, PollVote
+
+# лимит длины текста сообщения Telegram
+MAX_MESSAGE_LENGTH = 4096
+# имён на вариант ответа; остальные — строкой «и ещё K»
+VOTERS_SHOWN = 50
+TITLE_MAX_LENGTH = 200
+# callback_data кнопок: poll:<id>:<yes|no>
+POLL_CALLBACK_PREFIX = "poll:"
+
+
+def tg_length(text: str) -> int:
+    """Длина так, как её считает Telegram, — в кодовых единицах UTF-16."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def voter_name(vote: PollVote) -> str:
+    if vote.full_name:
+        return escape(vote.full_name)
+    if vote.username:
+        return f"@{escape(vote.username)}"
+    return f"#{vote.user_id}"
+
+
+def voter_lines(votes: List[PollVote], numbered: bool, budget: int) -> List[str]:
+    """
+    Строки списка голосовавших: не больше VOTERS_SHOWN имён и не больше
+    budget символов (с учётом переводов строк), остаток — «и ещё K».
+    """
+    lines: List[str] = []
+    used = 0
+    for i, vote in enumerate(votes[:VOTERS_SHOWN], 1):
+        line = f"  {i}. {voter_name(vote)}" if numbered else f"  {voter_name(vote)}"
+        # резерв под строку «и ещё K»
+        length = tg_length(line) + 1
+        if used + length > budget - 20:
+            break
+        lines.append(line)
+        used += length
+    if len(lines) < len(votes):
+        lines.append(f"  … и ещё {len(votes) - len(lines)}")
+    return lines
+
+
+def render_poll(poll: Poll) -> str:
+    going, not_going = poll.voters(ANSWER_YES), poll.voters(ANSWER_NO)
+    title = poll.command if len(poll.command) <= TITLE_MAX_LENGTH else poll.command[:TITLE_MAX_LENGTH] + "…"
+    header = [f"📋 <b>{escape(title)}</b>", ""]
+    if poll.active:
+        footer = ["", f"Голосование до {poll.expires_at:%d.%m %H:%M}"]
+    else:
+        footer = ["", "Голосование закрыто"]
+    going_title = f"✅ Идут ({len(going)}):"
+    not_going_title = f"❌ Не идут ({len(not_going)}):"
+
+    # остаток лимита делится поровну между вариантами ответа
+    fixed = sum(tg_length(line) + 1 for line in header + footer + [going_title, not_going_title])
+    budget = (MAX_MESSAGE_LENGTH - fixed) // 2
+
+    lines = header + [going_title]
+    lines.extend(voter_lines(going, True, budget))
+    lines.append(not_going_title)
+    lines.extend(voter_lines(not_going, False, budget))
+    lines.extend(footer)
+    return "\n".join(lines)
+
+
+def poll_keyboard(poll: Poll) -> Optional[InlineKeyboardMarkup]:
+    if not poll.active:
+        return None
+    return InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text="✅ Иду", callback_data=f"{POLL_CALLBACK_PREFIX}{poll.id}:{ANSWER_YES}"),
+        InlineKeyboardButton(text="❌ Не иду", callback_data=f"{POLL_CALLBACK_PREFIX}{poll.id}:{ANSWER_NO}"),
+    ]])
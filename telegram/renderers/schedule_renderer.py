@@ -0,0 +1,98 @@
+# telegram/renderers/schedule_renderer.py
+"""
+Сборка расписания в минимальное число сообщений Telegram.
+
+День/неделя рендерятся в текстовые блоки (по блоку на день), блоки
+упаковываются в сообщения не длиннее MESSAGE_LIMIT, а кнопки управления
+занятиями собираются в одну постраничную клавиатуру у последнего сообщения.
+"""
+from datetime import date
+from html import escape
+from typing import Dict, Iterable, List
+
+from aiogram.types import Message
+
+from core.models.schedule import TrainingInstance
+from telegram.keyboards.schedule_admin_keyboards import schedule_admin_keyboard
+
+MESSAGE_LIMIT = 4096
+
+RU_WEEKDAYS = ["Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресенье"]
+
+
+def format_instance(inst: TrainingInstance, trainer_name: str) -> str:
+    return (
+        f"{inst.id}) {escape(inst.training_type)} {inst.start_time.strftime('%H:%M')} "
+        f"({inst.duration_minutes} мин), тренер: {escape(trainer_name)}, "
+        f"зал: {escape(inst.place)}, статус: {inst.status}"
+    )
+
+
+def render_day(d: date, instances: List[TrainingInstance], trainer_names: Dict[int, str]) -> str:
+    lines = [f"📅 {d.isoformat()} ({RU_WEEKDAYS[d.weekday()]})"]
+    if not instances:
+        lines.append("  Занятий нет")
+    for inst in instances:
+        lines.append(format_instance(inst, trainer_names.get(inst.trainer_id, f"#{inst.trainer_id}")))
+    return "\n".join(lines)
+
+
+def pack_messages(blocks: Iterable[str], limit: int = MESSAGE_LIMIT, separator: str = "\n\n") -> List[str]:
+    """
+    Жадно складывает блоки в сообщения не длиннее limit.
+    Блок длиннее limit режется по строкам (а строка — по символам).
+    """
+    messages: List[str] = []
+    current = ""
+
+    def push(piece: str, sep: str):
+        nonlocal current
+        if not current:
+            current = piece
+        elif len(current) + len(sep) + len(piece) <= limit:
+            current += sep + piece
+        else:
+            messages.append(current)
+            current = piece
+
+    for block in blocks:
+        if len(block) <= limit:
+            push(block, separator)
+            continue
+        for i, line in enumerate(block.split("\n")):
+            sep = separator if i == 0 else "\n"
+            while len(line) > limit:
+                push(line[:limit], sep)
+                line, sep = line[limit:], "\n"
+            push(line, sep)
+
+    if current:
+        messages.append(current)
+    return messages
+
+
+def render_schedule(
+    schedule: Dict[date, List[TrainingInstance]],
+    trainer_names: Dict[int, str],
+    limit: int = MESSAGE_LIMIT,
+) -> List[str]:
+    return pack_messages((render_day(d, inst, trainer_names) for d, inst in schedule.items()), limit)
+
+
+async def answer_schedule(
+    message: Message,
+    schedule: Dict[date, List[TrainingInstance]],
+    trainer_names: Dict[int, str],
+    page_key: str,
+) -> int:
+    """
+    Отправить расписание: тексты пачками + одна постраничная клавиатура.
+    Возвращает число исходящих запросов к Telegram API.
+    """
+    texts = render_schedule(schedule, trainer_names) or ["Занятий нет"]
+    instances = [inst for day in schedule.values() for inst in day]
+
+    for text in texts[:-1]:
+        await message.answer(text)
+    await message.answer(texts[-1], reply_markup=schedule_admin_keyboard(instances, 0, page_key))
+    return len(texts)
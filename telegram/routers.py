@@ -4,9 +4,18 @@ from telegram.handlers import users
 from telegram.handlers import registration
 from telegram.handlers import admin  # legacy admin handlers
 
+from telegram.handlers.admin_history import get_admin_history_router
 from telegram.handlers.admin_schedule import get_admin_schedule_router
+from telegram.handlers.polls import get_poll_router
 
-def register_routers(dp: Dispatcher, *, user_service=None, schedule_service=None):
+def register_routers(
+    dp: Dispatcher,
+    *,
+    user_service=None,
+    schedule_service=None,
+    history_service=None,
+    poll_service=None,
+):
     # -------------------- users router --------------------
     if user_service is not None:
         dp.include_router(users.get_router(user_service))
@@ -28,6 +37,16 @@ def register_routers(dp: Dispatcher, *, user_service=None, schedule_service=None
     except Exception:
         pass
 
+    # -------------------- admin_history router --------------------
+    # до admin_schedule: тот ловит все callback_query с data
+    if history_service is not None and user_service is not None:
+        dp.include_router(get_admin_history_router(history_service=history_service, user_service=user_service))
+
+    # -------------------- polls router --------------------
+    # тоже до admin_schedule: callback poll:<id>:<ответ>
+    if poll_service is not None:
+        dp.include_router(get_poll_router(poll_service))
+
     # -------------------- admin_schedule router --------------------
     if schedule_service is not None and user_service is not None:
         dp.include_router(get_admin_schedule_router(schedule_service=schedule_service, user_service=user_service))
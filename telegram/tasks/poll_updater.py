@@ -1,3 +1,59 @@
-﻿async def start_poll_updater():
-    while True:
-        await asyncio.sleep(5)
+﻿# telegram/tasks/poll_updater.py
+import asyncio
+import logging
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest, TelegramForbiddenError
+
+from core.services.poll_service import PollService
+from telegram.renderers.poll_renderer import poll_keyboard, render_poll
+
+logger = logging.getLogger(__name__)
+
+
+async def flush_poll_messages(bot: Bot, poll_service: PollService) -> int:
+    """
+    Перерисовать сообщения изменившихся опросов — по одной правке на опрос.
+    При временной ошибке (сеть, 5xx, flood wait) опрос возвращается в очередь
+    и перерисуется на следующем проходе; BadRequest/Forbidden (сообщение
+    удалено, бота убрали из чата) не повторяются.
+    """
+    edited = 0
+    for poll in poll_service.pop_dirty():
+        try:
+            await bot.edit_message_text(
+                text=render_poll(poll),
+                chat_id=poll.chat_id,
+                message_id=poll.message_id,
+                reply_markup=poll_keyboard(poll),
+            )
+            edited += 1
+        except TelegramAPIError as e:
+            if "message is not modified" in str(e):
+                continue
+            if isinstance(e, (TelegramBadRequest, TelegramForbiddenError)):
+                logger.warning("Poll %s message edit failed: %s", poll.id, e)
+            else:
+                logger.warning("Poll %s message edit failed, will retry: %s", poll.id, e)
+                poll_service.mark_dirty(poll)
+    return edited
+
+
+async def start_poll_updater(bot: Bot, poll_service: PollService, interval: float):
+    """
+    Фоновая перерисовка опросов: раз в interval секунд закрывает истёкшие
+    опросы и правит сообщения тех, где были новые голоса. Сотня голосов
+    за интервал — одна правка сообщения.
+    При отмене делает финальную перерисовку, чтобы последние голоса не потерялись.
+    """
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await poll_service.close_expired()
+                await flush_poll_messages(bot, poll_service)
+            except Exception:
+                logger.exception("Poll update failed, will retry")
+    except asyncio.CancelledError:
+        await flush_poll_messages(bot, poll_service)
+        raise
@@ -0,0 +1,25 @@
+# telegram/tasks/profile_sync.py
+import asyncio
+import logging
+
+from core.services.user_service import UserService
+
+logger = logging.getLogger(__name__)
+
+
+async def start_profile_sync(user_service: UserService, interval: float):
+    """
+    Фоновый flusher: раз в interval секунд записывает изменённые
+    Telegram-профили, накопленные UserService.register_if_needed.
+    При отмене делает финальный flush, чтобы ничего не потерять.
+    """
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await user_service.flush_profiles()
+            except Exception:
+                logger.exception("Profile sync flush failed, will retry")
+    except asyncio.CancelledError:
+        await user_service.flush_profiles()
+        raise
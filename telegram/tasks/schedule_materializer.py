@@ -0,0 +1,40 @@
+# telegram/tasks/schedule_materializer.py
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from core.services.schedule_service import ScheduleService
+
+logger = logging.getLogger(__name__)
+
+
+def seconds_until(hour: int, now: datetime) -> float:
+    """Секунд до ближайшего наступления hour:00 (локальное время)."""
+    target = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+async def materialize_once(schedule_service: ScheduleService, weeks_ahead: int, today: Optional[date] = None) -> int:
+    """Заполнить расписание на weeks_ahead недель начиная с today."""
+    today = today or date.today()
+    return await schedule_service.materialize_ahead(today, today + timedelta(weeks=weeks_ahead, days=-1))
+
+
+async def start_schedule_materializer(schedule_service: ScheduleService, weeks_ahead: int, hour: int):
+    """
+    Фоновое создание занятий из шаблонов на weeks_ahead недель вперёд,
+    чтобы /schedule_today и /schedule_week только читали базу.
+    Первый проход — при старте бота, дальше раз в сутки в hour:00
+    (тихие часы; окно сдвигается на день вперёд).
+    Отмена прерывает ожидание или текущую транзакцию — UnitOfWork её
+    откатывает, а повторный проход просто доделает недостающее.
+    """
+    while True:
+        try:
+            await materialize_once(schedule_service, weeks_ahead)
+        except Exception:
+            logger.exception("Schedule materialization failed, will retry at next run")
+        await asyncio.sleep(seconds_until(hour, datetime.now()))
@@ -0,0 +1,73 @@
+# tests/conftest.py
+"""
+Общие фикстуры тестов расписания и опросов: временная БД со всеми
+миграциями и запуск асинхронного сценария на соединении с ней.
+"""
+import asyncio
+import sqlite3
+
+import aiosqlite
+import pytest
+
+from core.repositories.migrations import migrate
+from core.repositories.schedule_repo import (
+    BaseScheduleTemplateRepo,
+    TrainingInstanceRepo,
+    ScheduleChangeLogRepo,
+)
+from core.services.schedule_service import ScheduleService
+
+# (weekday, hour) шаблонов фикстуры schedule_templates: 90 минут, тренер 101, Малый зал
+TEMPLATE_SLOTS = [(0, 20), (0, 18), (2, 20), (6, 14)]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "club_schedule.db"
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def schedule_templates(db_path):
+    """Шаблоны TEMPLATE_SLOTS в db_path: пн 18:00 и 20:00, ср 20:00, вс 14:00."""
+    conn = sqlite3.connect(db_path)
+    for weekday, hour in TEMPLATE_SLOTS:
+        conn.execute(
+            """
+            INSERT INTO base_schedule_templates
+            (weekday, start_time, duration_minutes, trainer_id, place, training_type, active)
+            VALUES (?, ?, 90, 101, 'Малый зал', 'Сабля', 1)
+            """,
+            (weekday, f"{hour:02d}:00"),
+        )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def run_in_db(db_path):
+    """run_in_db(scenario) — asyncio.run(scenario(conn)) на новом соединении с db_path."""
+    def run(scenario):
+        async def wrapper():
+            async with aiosqlite.connect(db_path) as conn:
+                return await scenario(conn)
+        return asyncio.run(wrapper())
+    return run
+
+
+@pytest.fixture
+def run_service(run_in_db):
+    """run_service(scenario, **kwargs) — scenario(ScheduleService(..., **kwargs)) на db_path."""
+    def run(scenario, **kwargs):
+        async def with_service(conn):
+            return await scenario(ScheduleService(
+                base_repo=BaseScheduleTemplateRepo(conn),
+                inst_repo=TrainingInstanceRepo(conn),
+                log_repo=ScheduleChangeLogRepo(conn),
+                **kwargs,
+            ))
+        return run_in_db(with_service)
+    return run
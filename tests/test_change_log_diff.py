@@ -0,0 +1,104 @@
+import json
+import random
+from dataclasses import asdict
+from datetime import date, datetime, time
+
+from core.services.schedule_conflicts import ScheduleConflictError
+
+
+def legacy_payload_size(inst) -> int:
+    # так журнал писался раньше: полный inst.__dict__ через json.dumps(default=str)
+    return len(json.dumps(asdict(inst), default=str))
+
+
+def test_diff_log_is_compact_and_rebuilds_every_version(run_service):
+    rnd = random.Random(7)
+
+    async def scenario(service):
+        conn = service.uow.conn
+        ids = []
+        for i in range(5):
+            inst = await service.add_extra(
+                date(2025, 3, 3 + i), time(18, 0), 90, 101, "Малый зал", "Сабля",
+                admin_id=1, comment="Доп. тренировка перед турниром",
+            )
+            ids.append(inst.id)
+
+        versions, legacy_bytes = [], 0
+        for step in range(200):
+            inst_id = rnd.choice(ids)
+            before = await service.inst_repo.get_by_id(inst_id)
+            op = rnd.randrange(4)
+            try:
+                if op == 0:
+                    await service.change_trainer(inst_id, rnd.randint(100, 120), admin_id=1)
+                elif op == 1:
+                    await service.change_time(inst_id, time(rnd.randint(8, 21), 30), 60 + 30 * rnd.randrange(3), admin_id=1)
+                elif op == 2:
+                    await service.cancel(inst_id, admin_id=1, reason=f"Причина {step}")
+                else:
+                    moved = await service.move(
+                        inst_id, new_time=time(19, 0), new_duration=90,
+                        new_trainer=before.trainer_id, new_place="Большой зал", admin_id=1,
+                    )
+            except ScheduleConflictError:
+                # правка отклонена целиком — в журнале её нет
+                continue
+            if op == 3:
+                ids.append(moved.id)
+                versions.append((moved.id, await service.log_repo.latest_id(moved.id), moved))
+                legacy_bytes += legacy_payload_size(before) + legacy_payload_size(moved)
+            after = await service.inst_repo.get_by_id(inst_id)
+            versions.append((inst_id, await service.log_repo.latest_id(inst_id), after))
+            if op != 3:
+                legacy_bytes += legacy_payload_size(before) + legacy_payload_size(after)
+
+        rebuilt = [
+            (await service.get_version(inst_id, log_id=log_id), expected)
+            for inst_id, log_id, expected in versions
+        ]
+        before_creation = await service.get_version(ids[0], at=datetime(2000, 1, 1))
+
+        cur = await conn.execute(
+            "SELECT SUM(LENGTH(old_value)) + SUM(LENGTH(new_value)) FROM schedule_change_log "
+            "WHERE old_value IS NOT NULL"
+        )
+        diff_bytes = (await cur.fetchone())[0]
+        cur = await conn.execute(
+            "SELECT COUNT(*) FROM schedule_change_log l WHERE prev_log_id IS NOT NULL AND NOT EXISTS ("
+            "SELECT 1 FROM schedule_change_log p WHERE p.id = l.prev_log_id AND p.training_id = l.training_id)"
+        )
+        broken_links = (await cur.fetchone())[0]
+        return rebuilt, before_creation, diff_bytes, legacy_bytes, broken_links
+
+    rebuilt, before_creation, diff_bytes, legacy_bytes, broken_links = run_service(scenario)
+
+    for got, expected in rebuilt:
+        assert got == expected
+    assert before_creation is None
+    assert broken_links == 0
+    assert diff_bytes < legacy_bytes * 0.25
+
+
+def test_legacy_full_snapshot_entries_are_still_reconstructible(run_service):
+    async def scenario(service):
+        conn = service.uow.conn
+        inst = await service.add_extra(
+            date(2025, 3, 3), time(18, 0), 90, 101, "Малый зал", "Сабля", admin_id=1,
+        )
+        legacy_old = {**asdict(inst), "trainer_id": 55}
+        await conn.execute(
+            "INSERT INTO schedule_change_log "
+            "(training_id, admin_user_id, change_type, old_value, new_value, timestamp) "
+            "VALUES (?, 1, 'trainer_changed', ?, ?, ?)",
+            (inst.id, json.dumps(legacy_old, default=str), json.dumps(asdict(inst), default=str),
+             datetime.now().isoformat()),
+        )
+        await conn.commit()
+        log = await service.log_repo.get_by_training(inst.id)
+        return inst, await service.get_version(inst.id, log_id=log[1].id)
+
+    inst, old = run_service(scenario)
+
+    assert old.trainer_id == 55
+    assert (old.date, old.start_time, old.place) == (inst.date, inst.start_time, inst.place)
@@ -0,0 +1,118 @@
+from datetime import date, datetime, time, timedelta
+
+from core.models.schedule import ScheduleChangeLog, TrainingInstance
+from core.repositories.schedule_repo import ScheduleChangeLogRepo, TrainingInstanceRepo
+from core.repositories.unit_of_work import UnitOfWork
+from core.services.history_service import HistoryService
+
+START = datetime(2025, 1, 30, 12, 0)
+
+
+async def fill_log(conn, entries: int) -> int:
+    async with UnitOfWork(conn).transaction():
+        return await _fill_log(conn, entries)
+
+
+async def _fill_log(conn, entries: int) -> int:
+    training_id = await TrainingInstanceRepo(conn).add(TrainingInstance(
+        id=None, date=date(2025, 2, 3), start_time=time(20, 0), duration_minutes=90,
+        trainer_id=101, place="Малый зал", training_type="Сабля",
+        source_template_id=None, status="extra",
+    ))
+    repo = ScheduleChangeLogRepo(conn)
+    for i in range(entries):
+        await repo.add(ScheduleChangeLog(
+            id=None, training_id=training_id if i % 2 else 999, admin_user_id=7,
+            change_type="trainer_changed", old_value={"trainer_id": i}, new_value={"trainer_id": i + 1},
+            # по две записи с одинаковым timestamp — курсор обязан учитывать id
+            timestamp=START + timedelta(days=i // 2),
+        ))
+    return training_id
+
+
+def test_keyset_pages_cover_log_without_gaps(run_in_db):
+    async def scenario(conn):
+        training_id = await fill_log(conn, 11)
+        service = HistoryService(ScheduleChangeLogRepo(conn))
+
+        pages, before = [], None
+        while True:
+            entries, before = await service.recent(page_size=3, before=before)
+            pages.append(entries)
+            if before is None:
+                break
+        only_one, _ = await service.recent(page_size=10, training_id=training_id)
+        full = await ScheduleChangeLogRepo(conn).get_all(limit=100)
+        return pages, only_one, full, training_id
+
+    pages, only_one, full, training_id = run_in_db(scenario)
+
+    assert [len(p) for p in pages] == [3, 3, 3, 2]
+    assert [e.id for p in pages for e in p] == [e.id for e in full]
+    assert len(only_one) == 5
+    assert {e.training_id for e in only_one} == {training_id}
+    assert (only_one[0].training_date, only_one[0].training_start_time) == (date(2025, 2, 3), time(20, 0))
+
+
+def test_archive_moves_old_entries_to_monthly_tables(run_in_db):
+    async def scenario(conn):
+        training_id = await fill_log(conn, 10)
+        repo = ScheduleChangeLogRepo(conn)
+        service = HistoryService(repo)
+
+        moved = await service.archive_old(retention_days=30, now=datetime(2025, 3, 4))
+        again = await service.archive_old(retention_days=30, now=datetime(2025, 3, 4))
+        live = await repo.get_all(limit=100)
+        live_only = await repo.get_by_training(training_id)
+        with_archive = await repo.get_by_training(training_id, include_archive=True)
+        return moved, again, await repo.archive_tables(), live, live_only, with_archive
+
+    moved, again, tables, live, live_only, with_archive = run_in_db(scenario)
+
+    # cutoff 2025-02-02: январские 30/31 и 1 февраля уходят в архив
+    assert moved == {"schedule_change_log_2025_01": 4, "schedule_change_log_2025_02": 2}
+    assert again == {}
+    assert tables == ["schedule_change_log_2025_01", "schedule_change_log_2025_02"]
+    assert all(e.timestamp >= datetime(2025, 2, 2) for e in live)
+    assert len(live) == 4
+    assert len(live_only) == 2
+    assert len(with_archive) == 5
+    assert [e.timestamp for e in with_archive] == sorted((e.timestamp for e in with_archive), reverse=True)
+
+
+def test_prev_log_id_lookup_skips_archives_when_main_table_has_history(run_in_db):
+    async def scenario(conn):
+        training_id = await fill_log(conn, 10)
+        repo = ScheduleChangeLogRepo(conn)
+
+        def entry(tid, old_value, timestamp=datetime(2025, 3, 4)):
+            return ScheduleChangeLog(
+                id=None, training_id=tid, admin_user_id=7, change_type="trainer_changed",
+                old_value=old_value, new_value={"trainer_id": 1}, timestamp=timestamp,
+            )
+
+        last_archived = await repo.add(entry(777, {"trainer_id": 0}, START))
+        await conn.commit()
+        await HistoryService(repo).archive_old(retention_days=30, now=datetime(2025, 3, 4))
+        last_live = (await repo.get_by_training(training_id))[0].id
+
+        statements = []
+        await conn.set_trace_callback(statements.append)
+
+        edit, created = entry(training_id, {"trainer_id": 0}), entry(12345, None)
+        await repo.add(edit)
+        await repo.add(created)
+        edit_queries = [s for s in statements if "sqlite_master" in s]
+
+        archived_edit = entry(777, {"trainer_id": 1})
+        await repo.add(archived_edit)
+        await conn.set_trace_callback(None)
+        return last_live, last_archived, edit, created, archived_edit, edit_queries
+
+    last_live, last_archived, edit, created, archived_edit, edit_queries = run_in_db(scenario)
+
+    assert edit.prev_log_id == last_live
+    assert created.prev_log_id is None
+    assert edit_queries == []
+    # по 777 в основной таблице записей не осталось — цепочка продолжается из архива
+    assert archived_edit.prev_log_id == last_archived
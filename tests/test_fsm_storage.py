@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+from aiogram.fsm.storage.base import StorageKey
+
+from telegram.fsm_storage import SqliteStorage
+from telegram.handlers.admin_schedule_states import MoveSessionStates
+
+KEY = StorageKey(bot_id=1, chat_id=10, user_id=10)
+
+
+def test_state_survives_restart(tmp_path):
+    db = tmp_path / "fsm.db"
+
+    async def first_run():
+        storage = SqliteStorage(db, flush_interval=60)
+        await storage.open()
+        await storage.set_state(KEY, MoveSessionStates.waiting_for_new_time)
+        await storage.update_data(KEY, {"inst_id": 42})
+        await storage.close()       # финальный flush
+
+    async def second_run():
+        storage = SqliteStorage(db, flush_interval=60)
+        await storage.open()
+        try:
+            return await storage.get_state(KEY), await storage.get_data(KEY)
+        finally:
+            await storage.close()
+
+    asyncio.run(first_run())
+    state, data = asyncio.run(second_run())
+
+    assert state == MoveSessionStates.waiting_for_new_time.state
+    assert data == {"inst_id": 42}
+
+
+def test_cleared_state_is_deleted_from_db(tmp_path):
+    async def scenario():
+        storage = SqliteStorage(tmp_path / "fsm.db", flush_interval=60)
+        await storage.open()
+        await storage.set_state(KEY, "Reg:full_name")
+        await storage.flush()
+        await storage.set_state(KEY, None)
+        await storage.set_data(KEY, {})
+        written = await storage.flush()
+        cur = await storage.conn.execute("SELECT COUNT(*) FROM fsm_states")
+        (count,) = await cur.fetchone()
+        await cur.close()
+        await storage.close()
+        return written, count
+
+    assert asyncio.run(scenario()) == (1, 0)
+
+
+def test_abandoned_states_expire(tmp_path):
+    async def scenario():
+        storage = SqliteStorage(tmp_path / "fsm.db", flush_interval=60, ttl=0.05)
+        await storage.open()
+        await storage.set_state(KEY, "Reg:email")
+        await asyncio.sleep(0.1)
+        state = await storage.get_state(KEY)
+        await storage.close()
+        return state
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_hot_path_stays_in_memory(tmp_path):
+    async def scenario():
+        storage = SqliteStorage(tmp_path / "fsm.db", flush_interval=60)
+        await storage.open()
+        started = time.perf_counter()
+        for i in range(1000):
+            await storage.set_data(KEY, {"step": i})
+            await storage.get_state(KEY)
+        elapsed = (time.perf_counter() - started) / 1000
+        await storage.close()
+        return elapsed
+
+    assert asyncio.run(scenario()) < 0.001
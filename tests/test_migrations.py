@@ -0,0 +1,53 @@
+import sqlite3
+
+import pytest
+
+from core.repositories.migrations import LATEST_VERSION, get_version, migrate
+
+
+def _insert_instance(conn, d, template_id):
+    conn.execute(
+        """
+        INSERT INTO training_instances
+        (date, start_time, duration_minutes, trainer_id, place, training_type,
+         source_template_id, status)
+        VALUES (?, '20:00', 90, 1, 'Малый зал', 'Сабля', ?, 'planned')
+        """,
+        (d, template_id),
+    )
+
+
+def test_migrate_fresh_db_to_latest():
+    conn = sqlite3.connect(":memory:")
+
+    assert migrate(conn) == LATEST_VERSION
+    assert get_version(conn) == LATEST_VERSION
+
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert {
+        "idx_training_instances_date_time",
+        "uq_training_instances_date_template",
+        "idx_change_log_training_ts",
+        "idx_change_log_ts",
+    } <= indexes
+
+    # повторный запуск ничего не делает
+    assert migrate(conn) == LATEST_VERSION
+
+
+def test_migration_removes_duplicates_and_enforces_uniqueness():
+    conn = sqlite3.connect(":memory:")
+    migrate(conn, target=1)
+    _insert_instance(conn, "2025-01-06", 1)
+    _insert_instance(conn, "2025-01-06", 1)
+    _insert_instance(conn, "2025-01-06", None)
+    _insert_instance(conn, "2025-01-06", None)
+    conn.commit()
+
+    migrate(conn)
+
+    rows = conn.execute("SELECT id, source_template_id FROM training_instances ORDER BY id").fetchall()
+    assert rows == [(1, 1), (3, None), (4, None)]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        _insert_instance(conn, "2025-01-06", 1)
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import EditMessageText, GetUpdates, Response, SendMessage
+
+from telegram.middlewares.outbound import OutboundRateLimiter
+
+
+class FakeApi:
+    def __init__(self, flood_times=0):
+        self.calls = []
+        self.flood_times = flood_times
+
+    async def __call__(self, bot, method):
+        if self.flood_times:
+            self.flood_times -= 1
+            raise TelegramRetryAfter(method=method, message="Too Many Requests", retry_after=0)
+        self.calls.append(method)
+        return Response(ok=True, result=True)
+
+
+def test_requests_without_chat_are_not_limited():
+    limiter = OutboundRateLimiter(global_rate=1, group_per_minute=1)
+    api = FakeApi()
+
+    async def scenario():
+        await asyncio.gather(*(limiter(api, None, GetUpdates()) for _ in range(20)))
+
+    started = time.monotonic()
+    asyncio.run(scenario())
+
+    assert len(api.calls) == 20
+    assert time.monotonic() - started < 0.5
+    assert limiter.stats()["sent"] == 0
+
+
+def test_group_chat_is_paced_by_its_bucket():
+    limiter = OutboundRateLimiter(global_rate=1000, group_per_minute=600)  # 10/с, burst 150
+    limiter.group_capacity = 1
+    api = FakeApi()
+
+    async def scenario():
+        await asyncio.gather(*(limiter(api, None, SendMessage(chat_id=-100, text=str(i))) for i in range(4)))
+
+    started = time.monotonic()
+    asyncio.run(scenario())
+
+    assert [m.text for m in api.calls] == ["0", "1", "2", "3"]
+    assert time.monotonic() - started >= 0.25
+    assert limiter.stats()["max_queue_depth"] >= 3
+
+
+def test_retry_after_is_honored():
+    limiter = OutboundRateLimiter()
+    api = FakeApi(flood_times=2)
+
+    asyncio.run(limiter(api, None, SendMessage(chat_id=1, text="hi")))
+
+    assert len(api.calls) == 1
+    assert limiter.stats()["retries"] == 2
+
+
+def test_stale_edits_of_same_message_are_coalesced():
+    limiter = OutboundRateLimiter(global_rate=1000, group_per_minute=60)
+    limiter.group_capacity = 1
+    api = FakeApi()
+
+    async def scenario():
+        await limiter(api, None, SendMessage(chat_id=-1, text="poll"))   # съедает burst
+        await asyncio.gather(*(
+            limiter(api, None, EditMessageText(chat_id=-1, message_id=7, text=f"votes: {i}"))
+            for i in range(5)
+        ))
+
+    asyncio.run(scenario())
+
+    assert [getattr(m, "text") for m in api.calls] == ["poll", "votes: 4"]
+    assert limiter.stats()["coalesced"] == 4
@@ -0,0 +1,217 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest, TelegramNetworkError
+from aiogram.types import CallbackQuery, Chat, Message, User
+
+from core.models.poll import ANSWER_NO, ANSWER_YES
+from core.repositories.poll_repo import PollRepository
+from core.services.poll_service import PollService
+from telegram.handlers.polls import get_poll_router
+from telegram.middlewares.throttling import ThrottlingMiddleware
+from telegram.renderers.poll_renderer import MAX_MESSAGE_LENGTH, POLL_CALLBACK_PREFIX, render_poll, tg_length
+from telegram.tasks.poll_updater import flush_poll_messages, start_poll_updater
+
+NOW = datetime(2025, 3, 3, 12, 0)
+
+
+class FakeBot:
+    def __init__(self):
+        self.edits = []
+
+    async def edit_message_text(self, text, chat_id, message_id, reply_markup=None):
+        self.edits.append((chat_id, message_id, text, reply_markup))
+
+
+class FlakyBot(FakeBot):
+    """Первые правки падают с заданными ошибками, дальше — как FakeBot."""
+
+    def __init__(self, *errors):
+        super().__init__()
+        self.errors = list(errors)
+
+    async def edit_message_text(self, text, chat_id, message_id, reply_markup=None):
+        if self.errors:
+            raise self.errors.pop(0)
+        await super().edit_message_text(text, chat_id, message_id, reply_markup)
+
+
+async def open_poll(service, expires_in=timedelta(hours=12)):
+    poll = await service.create_poll(-100, "Сабля, среда 20:00", NOW + expires_in)
+    await service.attach_message(poll.id, 555)
+    return poll
+
+
+def vote_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT user_id, answer FROM poll_votes ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def test_votes_are_deduplicated_and_appended(db_path, run_in_db):
+    async def scenario(conn):
+        service = PollService(PollRepository(conn))
+        poll = await open_poll(service)
+        results = [
+            await service.add_vote(poll.id, 1, "ivan", "Иван Иванов", ANSWER_YES, now=NOW),
+            await service.add_vote(poll.id, 1, "ivan", "Иван Иванов", ANSWER_YES, now=NOW),
+            await service.add_vote(poll.id, 2, None, "Пётр", ANSWER_YES, now=NOW),
+            await service.add_vote(poll.id, 1, "ivan", "Иван Иванов", ANSWER_NO, now=NOW),
+        ]
+        commits = service.uow.commits
+
+        restarted = PollService(PollRepository(conn))
+        await restarted.load_active()
+        return results, commits, restarted.get(poll.id)
+
+    results, commits, reloaded = run_in_db(scenario)
+
+    assert results == [True, False, True, True]
+    assert commits == 5
+    assert vote_rows(db_path) == [(1, "yes"), (2, "yes"), (1, "no")]
+    assert [(v.user_id, v.answer) for v in reloaded.votes.values()] == [(1, "no"), (2, "yes")]
+    assert reloaded.participants == [(2, None, "Пётр")]
+
+
+def test_burst_of_votes_produces_one_message_edit(run_in_db):
+    async def scenario(conn):
+        service = PollService(PollRepository(conn))
+        poll = await open_poll(service)
+        bot = FakeBot()
+        for user_id in range(200):
+            await service.add_vote(poll.id, user_id, None, f"Участник {user_id}", ANSWER_YES, now=NOW)
+        edited = await flush_poll_messages(bot, service)
+        again = await flush_poll_messages(bot, service)
+        return edited, again, bot.edits
+
+    edited, again, edits = run_in_db(scenario)
+
+    assert (edited, again) == (1, 0)
+    (chat_id, message_id, text, keyboard), = edits
+    assert (chat_id, message_id) == (-100, 555)
+    assert "Идут (200)" in text and "Участник 49" in text
+    assert "и ещё 150" in text
+    assert keyboard is not None
+
+
+def test_expired_poll_is_closed_and_rendered_final(run_in_db):
+    async def scenario(conn):
+        service = PollService(PollRepository(conn))
+        poll = await open_poll(service, expires_in=timedelta(minutes=30))
+        await service.add_vote(poll.id, 1, "ivan", None, ANSWER_YES, now=NOW)
+        closed = await service.close_expired(now=NOW + timedelta(hours=1))
+        with pytest.raises(ValueError):
+            await service.add_vote(poll.id, 2, None, None, ANSWER_YES, now=NOW)
+        bot = FakeBot()
+        await flush_poll_messages(bot, service)
+
+        restarted = PollService(PollRepository(conn))
+        return closed, bot.edits, await restarted.load_active()
+
+    closed, edits, active_after_restart = run_in_db(scenario)
+
+    assert [p.active for p in closed] == [False]
+    (_, _, text, keyboard), = edits
+    assert "Голосование закрыто" in text and "@ivan" in text
+    assert keyboard is None
+    assert active_after_restart == 0
+
+
+def test_updater_flushes_pending_votes_on_shutdown(run_in_db):
+    async def scenario(conn):
+        service = PollService(PollRepository(conn))
+        poll = await open_poll(service)
+        bot = FakeBot()
+        task = asyncio.create_task(start_poll_updater(bot, service, interval=3600))
+        await service.add_vote(poll.id, 1, None, "Анна", ANSWER_YES, now=NOW)
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return bot.edits
+
+    edits = run_in_db(scenario)
+
+    assert len(edits) == 1 and "Анна" in edits[0][2]
+
+
+def test_render_poll_escapes_names():
+    from core.models.poll import Poll, PollVote
+
+    poll = Poll(id=1, chat_id=-1, message_id=2, command="<b>x</b>", expires_at=NOW)
+    poll.votes[7] = PollVote(1, 7, None, "<script>", ANSWER_NO, NOW)
+
+    text = render_poll(poll)
+
+    assert "&lt;script&gt;" in text and "&lt;b&gt;x&lt;/b&gt;" in text
+    assert "Не идут (1)" in text
+
+
+def test_render_poll_fits_telegram_limit_with_many_voters():
+    from core.models.poll import Poll, PollVote
+
+    poll = Poll(id=1, chat_id=-1, message_id=2, command="&" * 500, expires_at=NOW)
+    for user_id in range(600):
+        answer = ANSWER_YES if user_id % 3 else ANSWER_NO
+        poll.votes[user_id] = PollVote(1, user_id, None, "<Очень длинное имя 🤺 участника>" * 3, answer, NOW)
+
+    text = render_poll(poll)
+
+    assert tg_length(text) <= MAX_MESSAGE_LENGTH
+    assert "Идут (400)" in text and "Не идут (200)" in text
+    assert "и ещё" in text
+
+
+class FakeCallback(CallbackQuery):
+    async def answer(self, text=None, show_alert=None, **kwargs):
+        pass
+
+
+def test_vote_burst_in_group_passes_throttling(run_in_db):
+    async def scenario(conn):
+        service = PollService(PollRepository(conn))
+        # обработчик голосует по реальным часам
+        poll = await service.create_poll(-100, "Сабля, среда 20:00", datetime.now() + timedelta(hours=12))
+        await service.attach_message(poll.id, 555)
+        vote = get_poll_router(service).callback_query.handlers[0].callback
+        middleware = ThrottlingMiddleware(chat_limit=60, chat_window=10, chat_exempt_callbacks=(POLL_CALLBACK_PREFIX,))
+        group_message = Message(message_id=555, date=NOW, chat=Chat(id=-100, type="supergroup"))
+
+        for user_id in range(1, 101):
+            query = FakeCallback(
+                id=str(user_id), chat_instance="group", message=group_message,
+                from_user=User(id=user_id, is_bot=False, first_name=f"Участник {user_id}"),
+                data=f"{POLL_CALLBACK_PREFIX}{poll.id}:{ANSWER_YES}",
+            )
+            await middleware(lambda event, data: vote(event), query, {})
+        return service.get(poll.id), middleware.stats()
+
+    poll, stats = run_in_db(scenario)
+
+    assert len(poll.voters(ANSWER_YES)) == 100
+    assert stats["dropped"] == 0
+
+
+def test_failed_edit_is_retried_on_next_flush(run_in_db):
+    async def scenario(conn):
+        service = PollService(PollRepository(conn))
+        poll = await open_poll(service)
+        bot = FlakyBot(TelegramNetworkError(method=None, message="timeout"))
+        await service.add_vote(poll.id, 1, None, "Анна", ANSWER_YES, now=NOW)
+        failed = await flush_poll_messages(bot, service)
+        retried = await flush_poll_messages(bot, service)
+
+        gone = FlakyBot(TelegramBadRequest(method=None, message="message to edit not found"))
+        await service.add_vote(poll.id, 2, None, "Борис", ANSWER_YES, now=NOW)
+        await flush_poll_messages(gone, service)
+        return failed, retried, bot.edits, service.pop_dirty()
+
+    failed, retried, edits, still_dirty = run_in_db(scenario)
+
+    assert (failed, retried) == (0, 1)
+    assert len(edits) == 1 and "Анна" in edits[0][2]
+    assert still_dirty == []
@@ -0,0 +1,51 @@
+import asyncio
+
+from core.repositories.user_repo import UserRepository
+from core.services.user_service import UserService
+
+
+class FakeTgUser:
+    def __init__(self, id, username, full_name):
+        self.id = id
+        self.username = username
+        self.full_name = full_name
+
+
+def test_unchanged_profile_does_not_write(tmp_path):
+    async def scenario():
+        repo = await UserRepository.create(str(tmp_path / "users.db"))
+        service = UserService(repo)
+        try:
+            for _ in range(5):
+                await service.register_if_needed(FakeTgUser(1, "ivan", "Ivan"))
+            return service.pending_profiles_count(), await service.flush_profiles()
+        finally:
+            await repo.close()
+
+    assert asyncio.run(scenario()) == (0, 0)
+
+
+def test_profile_changes_are_coalesced_and_flushed(tmp_path):
+    async def scenario():
+        repo = await UserRepository.create(str(tmp_path / "users.db"))
+        service = UserService(repo)
+        try:
+            await service.register_if_needed(FakeTgUser(1, "ivan", "Ivan"))
+            await service.register_if_needed(FakeTgUser(1, "ivan_new", "Ivan"))
+            cached = await service.register_if_needed(FakeTgUser(1, "ivan_newest", "Ivan I."))
+            pending = service.pending_profiles_count()
+            stored_before = await repo.get(1)
+
+            flushed = await service.flush_profiles()
+            stored_after = await repo.get(1)
+            return cached, pending, stored_before, flushed, stored_after
+        finally:
+            await repo.close()
+
+    cached, pending, stored_before, flushed, stored_after = asyncio.run(scenario())
+
+    assert (cached.username, cached.full_name) == ("ivan_newest", "Ivan I.")
+    assert pending == 1
+    assert stored_before.username == "ivan"
+    assert flushed == 1
+    assert (stored_after.username, stored_after.full_name) == ("ivan_newest", "Ivan I.")
@@ -0,0 +1,147 @@
+import json
+import sqlite3
+from datetime import date, time, timedelta
+
+import pytest
+
+from core.services.schedule_conflicts import ScheduleConflictError
+from core.services.schedule_service import ScheduleService
+from core.utils.intervals import IntervalIndex
+
+MONDAY = date(2025, 3, 3)
+
+
+def test_interval_index_overlaps_and_pairs():
+    index = IntervalIndex()
+    index.add("зал", 600, 690, 1)
+    index.add("зал", 690, 780, 2)
+    index.add("зал", 700, 720, 3)
+    index.add("зал", 100, 1000, 4)
+
+    assert sorted(index.overlapping("зал", 680, 695)) == [1, 2, 4]
+    assert index.overlapping("зал", 1000, 1100) == []
+    assert index.overlapping("другой зал", 600, 690) == []
+
+    index.remove("зал", 100, 1000, 4)
+    assert sorted((a, b) for _, a, b in index.overlapping_pairs()) == [(2, 3)]
+
+
+def test_double_booking_is_rejected_and_nothing_is_written(run_service):
+    async def scenario(service):
+        first = await service.add_extra(MONDAY, time(18, 0), 90, 101, "Малый зал", "Сабля", admin_id=1)
+        with pytest.raises(ScheduleConflictError) as trainer_busy:
+            await service.add_extra(MONDAY, time(19, 0), 60, 101, "Большой зал", "Шпага", admin_id=1)
+        with pytest.raises(ValueError):
+            await service.add_extra(MONDAY, time(17, 0), 90, 102, "Малый зал", "Шпага", admin_id=1)
+        # вплотную — не пересечение
+        after = await service.add_extra(MONDAY, time(19, 30), 60, 101, "Малый зал", "Сабля", admin_id=1)
+        with pytest.raises(ScheduleConflictError):
+            await service.change_time(after.id, time(19, 0), 60, admin_id=1)
+        stored = await service.inst_repo.get_by_date(MONDAY)
+        return first, trainer_busy.value, after, stored
+
+    first, error, after, stored = run_service(scenario)
+
+    assert [(c.kind, c.other_id) for c in error.conflicts] == [("trainer", first.id)]
+    assert [(i.id, i.start_time) for i in stored] == [(first.id, time(18, 0)), (after.id, time(19, 30))]
+
+
+def test_move_and_cancel_free_the_original_slot(run_service):
+    async def scenario(service):
+        inst = await service.add_extra(MONDAY, time(18, 0), 90, 101, "Малый зал", "Сабля", admin_id=1)
+        # копия пересекается с исходным занятием — это не конфликт
+        moved = await service.move(inst.id, new_time=time(18, 30), new_duration=90,
+                                   new_trainer=101, new_place="Малый зал", admin_id=1)
+        with pytest.raises(ScheduleConflictError):
+            await service.add_extra(MONDAY, time(19, 0), 60, 101, "Большой зал", "Шпага", admin_id=1)
+
+        moved_again = await service.move(moved.id, new_time=time(12, 0), new_duration=90,
+                                         new_trainer=101, new_place="Малый зал", admin_id=1)
+        evening = await service.add_extra(MONDAY, time(18, 0), 90, 101, "Малый зал", "Сабля", admin_id=1)
+        await service.cancel(moved_again.id, admin_id=1)
+        noon = await service.add_extra(MONDAY, time(12, 0), 60, 101, "Малый зал", "Сабля", admin_id=1)
+
+        # новый сервис (после рестарта) строит индекс с нуля, перенесённые оригиналы — из журнала
+        fresh = ScheduleService(service.base_repo, service.inst_repo, service.log_repo, uow=service.uow)
+        report, _ = await fresh.conflict_report(2025, 3)
+        return evening, noon, report
+
+    evening, noon, report = run_service(scenario)
+
+    assert evening.id and noon.id
+    assert report == []
+
+
+def test_legacy_move_entry_frees_the_original_slot(db_path, run_service):
+    # до журнала-диффа перенос писал одну запись под id копии: old_value — полный снимок оригинала
+    original = {
+        "id": 1, "date": MONDAY.isoformat(), "start_time": "18:00:00", "duration_minutes": 90,
+        "trainer_id": 101, "place": "Малый зал", "training_type": "Сабля",
+        "source_template_id": None, "status": "planned", "comment": None,
+    }
+    copy = {**original, "id": 2, "start_time": "12:00:00", "status": "moved"}
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO training_instances (id, date, start_time, duration_minutes, trainer_id, place, "
+        "training_type, source_template_id, status) VALUES (?, ?, ?, 90, 101, 'Малый зал', 'Сабля', NULL, 'moved')",
+        [(1, MONDAY.isoformat(), "18:00"), (2, MONDAY.isoformat(), "12:00")],
+    )
+    conn.execute(
+        "INSERT INTO schedule_change_log (training_id, admin_user_id, change_type, old_value, new_value, timestamp) "
+        "VALUES (2, 1, 'moved', ?, ?, '2024-12-01T10:00:00')",
+        (json.dumps(original), json.dumps(copy)),
+    )
+    conn.commit()
+    conn.close()
+
+    async def scenario(service):
+        moved_away = await service.log_repo.moved_away_ids(MONDAY, MONDAY)
+        evening = await service.add_extra(MONDAY, time(18, 0), 90, 101, "Малый зал", "Сабля", admin_id=1)
+        with pytest.raises(ScheduleConflictError):
+            await service.add_extra(MONDAY, time(12, 30), 60, 101, "Большой зал", "Шпага", admin_id=1)
+        report, _ = await service.conflict_report(2025, 3)
+        return moved_away, evening, report
+
+    moved_away, evening, report = run_service(scenario)
+
+    assert moved_away == {1}
+    assert evening.id
+    assert report == []
+
+
+def test_training_past_midnight_conflicts_with_next_day(run_service):
+    async def scenario(service):
+        await service.add_extra(MONDAY, time(23, 30), 90, 101, "Малый зал", "Сабля", admin_id=1)
+        with pytest.raises(ScheduleConflictError):
+            await service.add_extra(MONDAY + timedelta(days=1), time(0, 30), 60, 102, "Малый зал", "Шпага", admin_id=1)
+
+    run_service(scenario)
+
+
+def test_monthly_conflict_report(db_path, run_service):
+    conn = sqlite3.connect(db_path)
+    rows = []
+    for day in range(1, 32):
+        for hour in range(9, 21, 2):
+            rows.append((f"2025-03-{day:02d}", f"{hour:02d}:00", 120, 100 + hour, f"Зал {hour}", "planned"))
+    # два пересечения: тренер 109 в 10:00 3-го числа и зал «Зал 15» 20-го
+    rows.append(("2025-03-03", "10:00", 60, 109, "Зал 99", "extra"))
+    rows.append(("2025-03-20", "16:00", 60, 200, "Зал 15", "extra"))
+    rows.append(("2025-03-21", "16:00", 60, 200, "Зал 15", "canceled"))
+    conn.executemany(
+        "INSERT INTO training_instances (date, start_time, duration_minutes, trainer_id, place, "
+        "training_type, source_template_id, status) VALUES (?, ?, ?, ?, ?, 'Сабля', NULL, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+    async def scenario(service):
+        return await service.conflict_report(2025, 3)
+
+    report, instances = run_service(scenario)
+
+    assert [(instances[c.inst_id].date.day, c.kind, c.key) for c in report] == [
+        (3, "trainer", 109),
+        (20, "place", "Зал 15"),
+    ]
@@ -0,0 +1,83 @@
+import asyncio
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from core.models.schedule import BaseScheduleTemplate
+from telegram.tasks import schedule_materializer
+from telegram.tasks.schedule_materializer import materialize_once, seconds_until
+
+pytestmark = pytest.mark.usefixtures("schedule_templates")
+
+MONDAY = date(2025, 1, 6)
+
+
+def test_materialize_is_idempotent_and_keeps_edited_trainings(run_service):
+    async def scenario(service):
+        first = await materialize_once(service, weeks_ahead=4, today=MONDAY)
+        inst = (await service.get_schedule_range(MONDAY, MONDAY))[MONDAY][0]
+        await service.cancel(inst.id, admin_id=1, reason="ремонт")
+        second = await materialize_once(service, weeks_ahead=4, today=MONDAY)
+        stored = await service.inst_repo.get_by_date_range(MONDAY, MONDAY + timedelta(weeks=4))
+        return first, second, stored, inst.id
+
+    first, second, stored, canceled_id = run_service(scenario)
+
+    assert first == 16
+    assert second == 0
+    assert len(stored) == 16
+    assert [i.status for i in stored if i.id == canceled_id] == ["canceled"]
+
+
+def test_read_handlers_do_not_write_inside_materialized_range(run_service):
+    async def scenario(service):
+        await materialize_once(service, weeks_ahead=2, today=MONDAY)
+        commits = service.uow.commits
+        week = await service.get_schedule_range(MONDAY + timedelta(days=7), MONDAY + timedelta(days=13))
+        reads_only = service.uow.commits - commits
+
+        # новый шаблон: заполненный диапазон устарел — обычная сборка с дозаписью
+        async with service.uow.transaction():
+            await service.base_repo.add(BaseScheduleTemplate(
+                id=None, weekday=1, start_time=time(19, 0), duration_minutes=60,
+                trainer_id=102, place="Большой зал", training_type="Шпага",
+            ))
+        commits = service.uow.commits
+        tuesday = MONDAY + timedelta(days=8)
+        day = (await service.get_schedule_range(tuesday, tuesday))[tuesday]
+        return week, reads_only, day, service.uow.commits - commits
+
+    week, reads_only, day, rebuild_commits = run_service(scenario)
+
+    assert reads_only == 0
+    assert [i.start_time for i in week[MONDAY + timedelta(days=7)]] == [time(18, 0), time(20, 0)]
+    assert week[MONDAY + timedelta(days=8)] == []
+    assert [i.trainer_id for i in day] == [102]
+    assert rebuild_commits == 1
+
+
+def test_seconds_until_next_quiet_hour():
+    assert seconds_until(4, datetime(2025, 1, 6, 3, 30)) == 30 * 60
+    assert seconds_until(4, datetime(2025, 1, 6, 4, 0)) == 24 * 3600
+    assert seconds_until(4, datetime(2025, 1, 6, 23, 0)) == 5 * 3600
+
+
+def test_materializer_task_stops_cleanly(run_service, monkeypatch):
+    runs = []
+
+    async def fake_materialize(service, weeks_ahead, today=None):
+        runs.append(weeks_ahead)
+        return 0
+
+    monkeypatch.setattr(schedule_materializer, "materialize_once", fake_materialize)
+
+    async def scenario(service):
+        task = asyncio.create_task(schedule_materializer.start_schedule_materializer(service, 8, 4))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return task.cancelled()
+
+    assert run_service(scenario)
+    assert runs == [8]
@@ -0,0 +1,86 @@
+from datetime import date, time, timedelta
+
+import pytest
+
+from core.models.schedule import GROUP_LOG_TRAINING_ID
+
+pytestmark = pytest.mark.usefixtures("schedule_templates")
+
+MONDAY = date(2025, 1, 6)
+SUNDAY = MONDAY + timedelta(days=6)
+
+
+def test_cancel_range_materializes_and_logs_one_group_entry(run_service):
+    async def scenario(service):
+        extra = await service.add_extra(MONDAY, time(10, 0), 60, 102, "Большой зал", "Шпага", admin_id=1)
+        commits = service.uow.commits
+        ids = await service.cancel_range(MONDAY, SUNDAY, admin_id=1, reason="Праздники")
+        week = await service.build_schedule_range(MONDAY, SUNDAY)
+        log = await service.log_repo.get_all()
+        before = await service.get_version(extra.id, log_id=log[1].id)
+        return ids, extra, week, log, service.uow.commits - commits, before
+
+    ids, extra, week, log, commits, before = run_service(scenario)
+
+    assert len(ids) == 5
+    assert extra.id in ids
+    assert {i.status for day in week.values() for i in day} == {"canceled"}
+    assert {i.comment for day in week.values() for i in day} == {"Праздники"}
+    assert commits == 1
+    assert log[0].training_id == GROUP_LOG_TRAINING_ID
+    assert sorted(int(k) for k in log[0].old_value) == ids
+    assert log[0].old_value[str(extra.id)] == {"status": "extra", "comment": ""}
+    assert (before.status, before.comment) == ("extra", "")
+
+
+def test_shift_range_skips_trainings_crossing_midnight(run_service):
+    async def scenario(service):
+        late = await service.add_extra(MONDAY, time(23, 0), 90, 101, "Малый зал", "Сабля", admin_id=1)
+        shifted, skipped = await service.shift_range(MONDAY, MONDAY, 30, admin_id=1)
+        monday = (await service.build_schedule_range(MONDAY, MONDAY))[MONDAY]
+        back, _ = await service.shift_range(MONDAY, MONDAY, -45, admin_id=1, trainer_id=101)
+        after_back = (await service.build_schedule_range(MONDAY, MONDAY))[MONDAY]
+        after_first = await service.get_version(monday[0].id, log_id=(await service.log_repo.get_all())[1].id)
+        return late, shifted, skipped, monday, back, after_back, after_first
+
+    late, shifted, skipped, monday, back, after_back, after_first = run_service(scenario)
+
+    assert skipped == [late.id]
+    assert len(shifted) == 2
+    assert [i.start_time for i in monday] == [time(18, 30), time(20, 30), time(23, 0)]
+    assert len(back) == 3
+    assert [i.start_time for i in after_back] == [time(17, 45), time(19, 45), time(22, 15)]
+    assert after_first.start_time == time(18, 30)
+
+
+def test_reassign_trainer_range_only_touches_matching_trainer(run_service):
+    async def scenario(service):
+        other = await service.add_extra(MONDAY, time(10, 0), 60, 102, "Большой зал", "Шпага", admin_id=1)
+        ids = await service.reassign_trainer_range(MONDAY, SUNDAY, 101, 105, admin_id=1)
+        week = await service.build_schedule_range(MONDAY, SUNDAY)
+        return other, ids, week
+
+    other, ids, week = run_service(scenario)
+
+    assert len(ids) == 4
+    trainers = {i.id: i.trainer_id for day in week.values() for i in day}
+    assert trainers.pop(other.id) == 102
+    assert set(trainers.values()) == {105}
+
+
+def test_range_operations_skip_moved_originals(run_service):
+    async def scenario(service):
+        evening = (await service.build_schedule_range(MONDAY, MONDAY))[MONDAY][0]
+        copy = await service.move(evening.id, new_time=time(10, 0), new_duration=90,
+                                  new_trainer=101, new_place="Большой зал", admin_id=1, comment="перенос")
+        shifted, _ = await service.shift_range(MONDAY, MONDAY, 30, admin_id=1)
+        reassigned = await service.reassign_trainer_range(MONDAY, MONDAY, 101, 105, admin_id=1)
+        canceled = await service.cancel_range(MONDAY, MONDAY, admin_id=1, reason="Праздники")
+        original = await service.inst_repo.get_by_id(evening.id)
+        return evening, copy, shifted, reassigned, canceled, original
+
+    evening, copy, shifted, reassigned, canceled, original = run_service(scenario)
+
+    assert evening.id not in shifted + reassigned + canceled
+    assert copy.id in shifted and copy.id in reassigned and copy.id in canceled
+    assert (original.status, original.start_time, original.trainer_id) == ("moved", evening.start_time, 101)
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import date, time, timedelta
+
+from core.models.schedule import TrainingInstance
+from telegram.keyboards.schedule_admin_keyboards import SCHEDULE_PAGE_SIZE, schedule_admin_keyboard
+from telegram.renderers.schedule_renderer import MESSAGE_LIMIT, answer_schedule, pack_messages
+
+MONDAY = date(2025, 1, 6)
+
+
+class RecordingMessage:
+    """Заглушка aiogram Message: считает исходящие вызовы API."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def answer(self, text, reply_markup=None, **kwargs):
+        assert len(text) <= MESSAGE_LIMIT
+        self.sent.append((text, reply_markup))
+
+
+def make_week(per_day):
+    schedule = {}
+    next_id = 1
+    for i in range(7):
+        d = MONDAY + timedelta(days=i)
+        schedule[d] = []
+        for slot in range(per_day if i % 2 == 0 else 0):
+            schedule[d].append(TrainingInstance(
+                id=next_id, date=d, start_time=time(8 + slot // 4, (slot % 4) * 15), duration_minutes=90,
+                trainer_id=101, place="Малый зал", training_type="Сабля",
+                source_template_id=None, status="planned",
+            ))
+            next_id += 1
+    return schedule
+
+
+def test_pack_messages_respects_limit():
+    blocks = ["x" * 30] * 10 + ["y" * 250]
+
+    messages = pack_messages(blocks, limit=100, separator="\n")
+
+    assert all(len(m) <= 100 for m in messages)
+    assert "".join(messages).replace("\n", "") == "x" * 300 + "y" * 250
+
+
+def test_week_is_sent_in_one_call():
+    schedule = make_week(per_day=8)   # 32 занятия, 3 пустых дня
+    message = RecordingMessage()
+
+    calls = asyncio.run(answer_schedule(message, schedule, {101: "Иван"}, page_key="2025-01-06:7"))
+
+    assert calls == len(message.sent) == 1
+    text, keyboard = message.sent[0]
+    assert text.count("Занятий нет") == 3
+    assert keyboard is not None
+
+
+def test_large_schedule_is_split_and_keyboard_goes_last():
+    schedule = make_week(per_day=40)
+    message = RecordingMessage()
+
+    calls = asyncio.run(answer_schedule(message, schedule, {}, page_key="2025-01-06:7"))
+
+    assert calls == len(message.sent) > 1
+    assert all(markup is None for _, markup in message.sent[:-1])
+    assert message.sent[-1][1] is not None
+
+
+def test_schedule_keyboard_pagination():
+    instances = [i for day in make_week(per_day=8).values() for i in day]
+
+    first = schedule_admin_keyboard(instances, 0, "2025-01-06:7").inline_keyboard
+    last = schedule_admin_keyboard(instances, 99, "2025-01-06:7").inline_keyboard
+
+    assert [b.callback_data for b in first[0]] == ["cancel:1", "move:1", "change_trainer:1"]
+    assert len(first) == SCHEDULE_PAGE_SIZE + 2
+    assert first[-2][-1].callback_data == "sched_page:2025-01-06:7:1"
+    assert last[-2][0].callback_data == "sched_page:2025-01-06:7:2"
+    assert last[-1][0].callback_data == "add_extra"
@@ -0,0 +1,106 @@
+from datetime import date, time, timedelta
+
+import pytest
+
+from core.models.schedule import BaseScheduleTemplate
+
+pytestmark = pytest.mark.usefixtures("schedule_templates")
+
+MONDAY = date(2025, 1, 6)
+
+
+def test_build_schedule_range_materializes_week(run_service):
+    async def scenario(service):
+        return await service.build_schedule_range(MONDAY, MONDAY + timedelta(days=6))
+
+    week = run_service(scenario)
+
+    assert list(week) == [MONDAY + timedelta(days=i) for i in range(7)]
+    assert [i.start_time for i in week[MONDAY]] == [time(18, 0), time(20, 0)]
+    assert len(week[MONDAY + timedelta(days=2)]) == 1
+    assert week[MONDAY + timedelta(days=1)] == []
+    assert all(i.id is not None for day in week.values() for i in day)
+
+
+def test_build_schedule_range_is_idempotent(run_service):
+    async def scenario(service):
+        first = await service.build_schedule_range(MONDAY, MONDAY + timedelta(days=6))
+        second = await service.build_schedule_range(MONDAY, MONDAY + timedelta(days=6))
+        stored = await service.inst_repo.get_by_date_range(MONDAY, MONDAY + timedelta(days=6))
+        return first, second, stored
+
+    first, second, stored = run_service(scenario)
+
+    assert {i.id for d in first.values() for i in d} == {i.id for d in second.values() for i in d}
+    assert len(stored) == 4
+
+
+def test_build_daily_schedule_matches_range(run_service):
+    async def scenario(service):
+        week = await service.build_schedule_range(MONDAY, MONDAY + timedelta(days=6))
+        return week[MONDAY], await service.build_daily_schedule(MONDAY)
+
+    from_range, daily = run_service(scenario)
+
+    assert [i.id for i in daily] == [i.id for i in from_range]
+
+
+def test_canceled_instance_is_not_rematerialized(run_service):
+    async def scenario(service):
+        inst = (await service.build_daily_schedule(MONDAY))[0]
+        await service.cancel(inst.id, admin_id=1, reason="праздник")
+        return inst, (await service.build_schedule_range(MONDAY, MONDAY))[MONDAY]
+
+    inst, day = run_service(scenario)
+
+    assert len(day) == 2
+    assert [i.status for i in day if i.id == inst.id] == ["canceled"]
+
+
+def test_template_index_is_built_once_and_rebuilt_on_change(run_service):
+    async def scenario(service):
+        calls = []
+        get_active = service.base_repo.get_active
+
+        async def counting_get_active():
+            calls.append(1)
+            return await get_active()
+
+        service.base_repo.get_active = counting_get_active
+
+        for i in range(14):
+            await service.build_daily_schedule(MONDAY + timedelta(days=i))
+        reads_before_change = len(calls)
+
+        tuesday = MONDAY + timedelta(days=15)
+        async with service.uow.transaction():
+            template_id = await service.base_repo.add(BaseScheduleTemplate(
+                id=None, weekday=1, start_time=time(19, 0), duration_minutes=60,
+                trainer_id=102, place="Большой зал", training_type="Шпага",
+            ))
+        added = await service.build_daily_schedule(tuesday)
+
+        async with service.uow.transaction():
+            await service.base_repo.set_active(template_id, False)
+        after_deactivate = await service.build_daily_schedule(tuesday + timedelta(days=7))
+        return reads_before_change, len(calls), added, after_deactivate
+
+    reads_before_change, reads_total, added, after_deactivate = run_service(scenario)
+
+    assert reads_before_change == 1
+    assert reads_total == 3
+    assert [(i.start_time, i.trainer_id) for i in added] == [(time(19, 0), 102)]
+    assert after_deactivate == []
+
+
+def test_loaded_instances_are_slotted_and_share_parsed_values(run_service):
+    async def scenario(service):
+        await service.build_schedule_range(MONDAY, MONDAY + timedelta(days=13))
+        return await service.inst_repo.get_by_date_range(MONDAY, MONDAY + timedelta(days=13))
+
+    instances = run_service(scenario)
+    first_monday, second_monday = instances[0], instances[4]
+
+    assert not hasattr(first_monday, "__dict__")
+    assert first_monday.date == MONDAY and first_monday.start_time == time(18, 0)
+    assert first_monday.start_time is second_monday.start_time
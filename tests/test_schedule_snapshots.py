@@ -0,0 +1,111 @@
+from datetime import date, time, timedelta
+
+import pytest
+
+pytestmark = pytest.mark.usefixtures("schedule_templates")
+
+MONDAY = date(2025, 1, 6)
+WEDNESDAY = MONDAY + timedelta(days=2)
+SUNDAY = MONDAY + timedelta(days=6)
+
+
+def counting_reads(scenario):
+    """Обёртка для run_service: scenario(service, reads), reads — вызовы get_by_date_range."""
+    async def wrapper(service):
+        reads = []
+        get_by_date_range = service.inst_repo.get_by_date_range
+
+        async def counting(start, end):
+            reads.append((start, end))
+            return await get_by_date_range(start, end)
+
+        service.inst_repo.get_by_date_range = counting
+        return await scenario(service, reads)
+    return wrapper
+
+
+def test_repeated_views_are_served_from_snapshots(run_service):
+    async def scenario(service, reads):
+        await service.get_schedule_range(MONDAY, SUNDAY)
+        reads_after_first = len(reads)
+        for _ in range(20):
+            await service.get_schedule_range(MONDAY, MONDAY)
+            await service.get_schedule_range(MONDAY, SUNDAY)
+        return reads_after_first, len(reads), service.snapshot_stats()
+
+    first, total, stats = run_service(counting_reads(scenario))
+
+    assert total == first
+    assert stats["hits"] == 20 * 8
+    assert stats["size"] == 7
+
+
+def test_changes_invalidate_only_affected_dates(run_service):
+    async def scenario(service, reads):
+        week = await service.get_schedule_range(MONDAY, SUNDAY)
+        await service.change_trainer(week[WEDNESDAY][0].id, 105, admin_id=1)
+        extra = await service.add_extra(SUNDAY, time(10, 0), 60, 102, "Большой зал", "Шпага", admin_id=1)
+
+        cached = [d for d in week if d in service.snapshots]
+        reads.clear()
+        wednesday = (await service.get_schedule_range(WEDNESDAY, WEDNESDAY))[WEDNESDAY]
+        monday = (await service.get_schedule_range(MONDAY, MONDAY))[MONDAY]
+        sunday = (await service.get_schedule_range(SUNDAY, SUNDAY))[SUNDAY]
+        return cached, reads, wednesday, monday, sunday, extra
+
+    cached, reads, wednesday, monday, sunday, extra = run_service(counting_reads(scenario))
+
+    assert WEDNESDAY not in cached and SUNDAY not in cached
+    assert len(cached) == 5
+    assert reads == [(WEDNESDAY, WEDNESDAY), (SUNDAY, SUNDAY)]
+    assert [i.trainer_id for i in wednesday] == [105]
+    assert len(monday) == 2
+    assert [(i.id == extra.id, i.start_time) for i in sunday] == [(True, time(10, 0)), (False, time(14, 0))]
+
+
+def test_range_operations_invalidate_whole_range(run_service):
+    async def scenario(service, reads):
+        await service.get_schedule_range(MONDAY, SUNDAY)
+        await service.cancel_range(MONDAY, WEDNESDAY, admin_id=1, reason="ремонт")
+        week = await service.get_schedule_range(MONDAY, SUNDAY)
+        return week
+
+    week = run_service(counting_reads(scenario))
+
+    assert {i.status for d in (MONDAY, WEDNESDAY) for i in week[d]} == {"canceled"}
+    assert [i.status for i in week[SUNDAY]] == ["planned"]
+
+
+def test_reads_inside_a_transaction_are_not_cached(run_service):
+    async def scenario(service, reads):
+        await service.get_schedule_range(MONDAY, MONDAY)
+        service.snapshots.clear()
+        try:
+            async with service.uow.transaction():
+                inst = (await service.inst_repo.get_by_date(MONDAY))[0]
+                inst.trainer_id = 999
+                await service.inst_repo.update(inst)
+                seen = await service.get_schedule_range(MONDAY, MONDAY)
+                raise RuntimeError("rollback")
+        except RuntimeError:
+            pass
+        after = await service.get_schedule_range(MONDAY, MONDAY)
+        return seen, after
+
+    seen, after = run_service(counting_reads(scenario))
+
+    assert 999 in [i.trainer_id for i in seen[MONDAY]]
+    assert [i.trainer_id for i in after[MONDAY]] == [101, 101]
+
+
+def test_snapshot_cache_is_bounded(run_service):
+    async def scenario(service, reads):
+        for i in range(10):
+            d = MONDAY + timedelta(days=i)
+            await service.get_schedule_range(d, d)
+        return service.snapshot_stats()
+
+    stats = run_service(counting_reads(scenario), cache_size=4)
+
+    assert stats["size"] == 4
+    assert stats["evictions"] == 6
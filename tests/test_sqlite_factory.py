@@ -0,0 +1,21 @@
+import asyncio
+
+from config import SQLITE_BUSY_TIMEOUT_MS, SQLITE_CACHE_SIZE
+from core.repositories.sqlite_factory import open_connection, close_connection, read_settings
+
+
+def test_open_connection_applies_pragmas(tmp_path):
+    async def scenario():
+        conn = await open_connection(tmp_path / "nested" / "test.db")
+        try:
+            return await read_settings(conn)
+        finally:
+            await close_connection(conn)
+
+    settings = asyncio.run(scenario())
+
+    assert settings["journal_mode"] == "wal"
+    assert settings["synchronous"] == "NORMAL"
+    assert settings["temp_store"] == "MEMORY"
+    assert settings["busy_timeout"] == SQLITE_BUSY_TIMEOUT_MS
+    assert settings["cache_size"] == SQLITE_CACHE_SIZE
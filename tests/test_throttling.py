@@ -0,0 +1,92 @@
+import asyncio
+from types import SimpleNamespace
+
+from telegram.middlewares.throttling import CallbackDebouncer, SlidingWindowLimiter, ThrottlingMiddleware
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sliding_window_limits_and_recovers():
+    clock = FakeClock()
+    limiter = SlidingWindowLimiter(limit=3, window=10, clock=clock)
+
+    assert [limiter.hit("u") for _ in range(4)] == [True, True, True, False]
+
+    clock.now += 10     # начало следующего окна: предыдущее ещё весит полностью
+    assert limiter.hit("u") is False
+    clock.now += 10     # через два окна ключ свободен
+    assert limiter.hit("u") is True
+
+
+def test_stale_keys_are_pruned():
+    clock = FakeClock()
+    limiter = SlidingWindowLimiter(limit=3, window=1, clock=clock)
+    for user_id in range(3):
+        limiter.hit(user_id)
+
+    clock.now += 5
+    limiter.hit("fresh")
+
+    assert len(limiter) == 1
+
+
+def test_callback_debouncer():
+    clock = FakeClock()
+    debouncer = CallbackDebouncer(interval=1, clock=clock)
+
+    assert debouncer.is_duplicate(1, "cancel:5") is False
+    assert debouncer.is_duplicate(1, "cancel:5") is True
+    assert debouncer.is_duplicate(2, "cancel:5") is False
+    clock.now += 1.5
+    assert debouncer.is_duplicate(1, "cancel:5") is False
+
+
+def test_middleware_drops_flood_from_one_user():
+    clock = FakeClock()
+    middleware = ThrottlingMiddleware(user_limit=2, user_window=10, chat_limit=100, clock=clock)
+    handled = []
+
+    async def handler(event, data):
+        handled.append(event)
+
+    def message(user_id):
+        return SimpleNamespace(from_user=SimpleNamespace(id=user_id), chat=SimpleNamespace(id=-1))
+
+    async def scenario():
+        for _ in range(5):
+            await middleware(handler, message(1), {})
+        await middleware(handler, message(2), {})
+
+    asyncio.run(scenario())
+
+    assert [e.from_user.id for e in handled] == [1, 1, 2]
+    assert middleware.stats()["dropped"] == 3
+
+
+def test_one_spammer_does_not_mute_the_chat():
+    clock = FakeClock()
+    middleware = ThrottlingMiddleware(user_limit=10, user_window=5, chat_limit=60, chat_window=10, clock=clock)
+    handled = []
+
+    async def handler(event, data):
+        handled.append(event)
+
+    def message(user_id):
+        return SimpleNamespace(from_user=SimpleNamespace(id=user_id), chat=SimpleNamespace(id=-1))
+
+    async def scenario():
+        for _ in range(80):
+            await middleware(handler, message(1), {})
+        for user_id in (2, 3, 4):
+            await middleware(handler, message(user_id), {})
+
+    asyncio.run(scenario())
+
+    assert [e.from_user.id for e in handled] == [1] * 10 + [2, 3, 4]
+    assert middleware.stats()["dropped"] == 70
@@ -0,0 +1,73 @@
+import asyncio
+import sqlite3
+from datetime import date, time
+
+import pytest
+
+from core.services.schedule_service import ScheduleService
+
+
+async def add_trainings(service: ScheduleService, count: int):
+    return [
+        await service.add_extra(date(2025, 3, 3), time(10 + i % 10, 0), 60, 101, "Малый зал", "Сабля", admin_id=1)
+        for i in range(count)
+    ]
+
+
+def committed_rows(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_failed_move_is_rolled_back_entirely(db_path, run_service):
+    async def scenario(service):
+        [inst] = await add_trainings(service, 1)
+
+        async def broken_log(entry):
+            raise RuntimeError("disk full")
+
+        service.log_repo.add = broken_log
+        with pytest.raises(RuntimeError):
+            await service.move(
+                inst.id, new_time=time(19, 0), new_duration=90,
+                new_trainer=101, new_place="Большой зал", admin_id=1,
+            )
+        return inst, service.uow
+
+    inst, uow = run_service(scenario)
+
+    assert committed_rows(db_path, "SELECT id, status FROM training_instances") == [(inst.id, "extra")]
+    assert committed_rows(db_path, "SELECT COUNT(*) FROM schedule_change_log") == [(1,)]
+    assert (uow.commits, uow.rollbacks) == (1, 1)
+
+
+def test_concurrent_operations_commit_once_each_and_do_not_mix(db_path, run_service):
+    async def scenario(service):
+        trainings = await add_trainings(service, 10)
+        original_update = service.inst_repo.update
+
+        async def slow_update(inst):
+            await asyncio.sleep(0)
+            if inst.trainer_id == 666:
+                raise ValueError("bad trainer")
+            await original_update(inst)
+
+        service.inst_repo.update = slow_update
+        results = await asyncio.gather(
+            *(service.change_trainer(t.id, 200 + t.id, admin_id=1) for t in trainings),
+            service.change_trainer(trainings[0].id, 666, admin_id=1),
+            return_exceptions=True,
+        )
+        return trainings, results, service.uow
+
+    trainings, results, uow = run_service(scenario)
+
+    assert [type(r) for r in results] == [type(None)] * 10 + [ValueError]
+    assert committed_rows(db_path, "SELECT id, trainer_id FROM training_instances ORDER BY id") == [
+        (t.id, 200 + t.id) for t in trainings
+    ]
+    assert committed_rows(db_path, "SELECT COUNT(*) FROM schedule_change_log") == [(20,)]
+    assert (uow.commits, uow.rollbacks) == (20, 1)
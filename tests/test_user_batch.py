@@ -0,0 +1,52 @@
+import asyncio
+
+from core.models.user import User
+from core.repositories.user_repo import UserRepository, MAX_SQL_PARAMS
+from core.services.user_service import UserService
+
+
+def test_get_many_handles_more_ids_than_one_query(tmp_path):
+    async def scenario():
+        repo = await UserRepository.create(str(tmp_path / "users.db"))
+        try:
+            for i in range(MAX_SQL_PARAMS + 10):
+                await repo.upsert(User(user_id=i, username=f"u{i}"))
+            return await repo.get_many(list(range(MAX_SQL_PARAMS + 20)))
+        finally:
+            await repo.close()
+
+    users = asyncio.run(scenario())
+
+    assert len(users) == MAX_SQL_PARAMS + 10
+    assert users[7].username == "u7"
+
+
+def test_resolve_display_names_uses_one_query(tmp_path):
+    async def scenario():
+        repo = await UserRepository.create(str(tmp_path / "users.db"))
+        service = UserService(repo)
+        await repo.upsert(User(user_id=1, username="sabre", fio="Иван Иванов"))
+        await repo.upsert(User(user_id=2, username="foil"))
+        await repo.upsert(User(user_id=3, full_name="Epee Trainer"))
+
+        calls = []
+        original = repo.get_many
+
+        async def counting_get_many(ids):
+            calls.append(list(ids))
+            return await original(ids)
+
+        repo.get_many = counting_get_many
+        try:
+            names = await service.resolve_display_names([1, 2, 3, 2, 1, 404])
+            again = await service.resolve_display_names([1, 2, 3])
+            return names, again, calls
+        finally:
+            await repo.close()
+
+    names, again, calls = asyncio.run(scenario())
+
+    assert names == {1: "Иван Иванов", 2: "foil", 3: "Epee Trainer", 404: "#404"}
+    assert again == {1: "Иван Иванов", 2: "foil", 3: "Epee Trainer"}
+    # первый вызов — один запрос, второй целиком из кеша
+    assert calls == [[1, 2, 3, 404]]
@@ -0,0 +1,84 @@
+import asyncio
+
+from core.repositories.user_repo import UserRepository
+from core.services.user_service import UserService
+from core.utils.cache import TTLCache
+
+
+class FakeTgUser:
+    def __init__(self, id, username, full_name):
+        self.id = id
+        self.username = username
+        self.full_name = full_name
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_lru_eviction_and_expiry():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"      # 1 становится самым свежим
+    cache.set(3, "c")               # вытесняет 2
+
+    assert cache.get(2) is None
+    assert cache.get(3) == "c"
+
+    clock.now = 11
+    assert cache.get(1) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 1)
+
+
+def test_user_service_serves_warm_users_from_cache(tmp_path):
+    async def scenario():
+        repo = await UserRepository.create(str(tmp_path / "users.db"))
+        service = UserService(repo)
+        queries = 0
+        original_get = repo.get
+
+        async def counting_get(user_id):
+            nonlocal queries
+            queries += 1
+            return await original_get(user_id)
+
+        repo.get = counting_get
+        try:
+            tg_user = FakeTgUser(100, "tester", "Tester User")
+            first = await service.register_if_needed(tg_user)
+            for _ in range(10):
+                same = await service.register_if_needed(tg_user)
+            return first, same, queries, service.cache_stats()
+        finally:
+            await repo.close()
+
+    first, same, queries, stats = asyncio.run(scenario())
+
+    assert same is first
+    assert queries == 1
+    assert stats["hits"] == 10
+
+
+def test_update_extra_info_invalidates_cached_user(tmp_path):
+    async def scenario():
+        repo = await UserRepository.create(str(tmp_path / "users.db"))
+        service = UserService(repo)
+        try:
+            await service.register_if_needed(FakeTgUser(1, "ivan", "Ivan"))
+            await service.update_extra_info(1, fio="Иван Иванов")
+            return await service.get_user(1)
+        finally:
+            await repo.close()
+
+    user = asyncio.run(scenario())
+
+    assert user.fio == "Иван Иванов"
@@ -0,0 +1,138 @@
+import asyncio
+import csv
+import io
+
+from core.models.user import User
+from core.repositories.user_repo import UserRepository
+from extras.export_import import (
+    CSV_FIELDS,
+    export_users_to_tempfile,
+    import_users_csv,
+    write_users_csv,
+)
+from telegram.handlers.admin import USERS_PAGE_SIZE, render_users_text
+from telegram.renderers.poll_renderer import tg_length
+from telegram.renderers.schedule_renderer import MESSAGE_LIMIT
+
+
+def test_write_users_csv_streams_all_rows_in_batches(tmp_path):
+    async def scenario():
+        repo = await UserRepository.create(str(tmp_path / "users.db"))
+        try:
+            for i in range(25):
+                await repo.upsert(User(user_id=i, username=f"u{i:02}", fio=f"Фамилия {i:02}"))
+            fh = io.StringIO()
+            count = await write_users_csv(repo, fh, batch_size=7)
+            return count, fh.getvalue()
+        finally:
+            await repo.close()
+
+    count, content = asyncio.run(scenario())
+    rows = list(csv.reader(io.StringIO(content), delimiter=";"))
+
+    assert count == 25
+    assert rows[0] == CSV_FIELDS
+    assert len(rows) == 26
+    assert [r[3] for r in rows[1:]] == [f"Фамилия {i:02}" for i in range(25)]
+
+
+def test_export_to_tempfile_and_pages_keep_listing_order(tmp_path):
+    async def scenario():
+        repo = await UserRepository.create(str(tmp_path / "users.db"))
+        try:
+            for i, fio in enumerate(["Борисов", "Андреев", "Волков", "Гусев", "Дмитриев"]):
+                await repo.upsert(User(user_id=i, fio=fio))
+            path = await export_users_to_tempfile(repo)
+            pages = [await repo.get_page(offset, 2) for offset in (0, 2, 4)]
+            all_users = await repo.get_all_users()
+            return path, pages, all_users, await repo.count()
+        finally:
+            await repo.close()
+
+    path, pages, all_users, total = asyncio.run(scenario())
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    finally:
+        path.unlink()
+
+    assert total == 5
+    assert len(lines) == 6
+    assert [u.fio for page in pages for u in page] == [u.fio for u in all_users]
+    assert [u.fio for u in pages[0]] == ["Андреев", "Борисов"]
+
+
+def test_import_round_trips_export_in_batches(tmp_path):
+    async def scenario():
+        source = await UserRepository.create(str(tmp_path / "source.db"))
+        target = await UserRepository.create(str(tmp_path / "target.db"))
+        try:
+            for i in range(12):
+                await source.upsert(User(
+                    user_id=i, username=f"u{i}", fio=f"Иван Иванов{i}",
+                    birth_date="12.11.1990", gender="М", phone="+7 912 345-67-89",
+                ))
+            fh = io.StringIO()
+            await write_users_csv(source, fh)
+            fh.seek(0)
+
+            calls = []
+            original = target.upsert_many
+
+            async def counting_upsert_many(users):
+                calls.append(len(users))
+                return await original(users)
+
+            target.upsert_many = counting_upsert_many
+            report = await import_users_csv(target, fh, batch_size=5)
+            return report, calls, await target.get_all_users(), await source.get_all_users()
+        finally:
+            await source.close()
+            await target.close()
+
+    report, calls, imported, original = asyncio.run(scenario())
+
+    assert (report.total, report.imported, report.rejected) == (12, 12, 0)
+    assert calls == [5, 5, 2]
+    assert [(u.user_id, u.fio, u.phone, u.created_at) for u in imported] == \
+        [(u.user_id, u.fio, u.phone, u.created_at) for u in original]
+
+
+def test_import_rejects_invalid_rows_and_keeps_existing_fields(tmp_path):
+    content = "\n".join([
+        "user_id;username;fio;gender;phone;email",
+        "1;sabre;;;;",
+        "abc;foil;;;;",
+        "2;epee;Пётр Петров;X;;",
+        "3;;Анна Смирнова;ж;;anna@example.com",
+    ])
+
+    async def scenario():
+        repo = await UserRepository.create(str(tmp_path / "users.db"))
+        try:
+            await repo.upsert(User(user_id=1, fio="Иван Иванов", phone="+7 912 345-67-89"))
+            report = await import_users_csv(repo, io.StringIO(content))
+            return report, await repo.get(1), await repo.get(3)
+        finally:
+            await repo.close()
+
+    report, kept, added = asyncio.run(scenario())
+
+    assert (report.total, report.imported, report.rejected) == (4, 2, 2)
+    assert [line for line, _ in report.errors] == [3, 4]
+    assert (kept.username, kept.fio, kept.phone) == ("sabre", "Иван Иванов", "+7 912 345-67-89")
+    assert (added.fio, added.gender, added.email) == ("Анна Смирнова", "Ж", "anna@example.com")
+
+
+def test_users_page_fits_telegram_limit_with_long_names():
+    users = [
+        User(user_id=10**12 + i, full_name="Очень & длинное <имя> 🤺" * 8, fio="Константинопольский-Водкин " * 6)
+        for i in range(USERS_PAGE_SIZE)
+    ]
+
+    text = render_users_text(users, total=100_000, start=99_951)
+    short = render_users_text([User(user_id=1, full_name="Иван", fio="Иванов Иван")], total=1, start=1)
+
+    assert tg_length(text) <= MESSAGE_LIMIT
+    assert text.count("\n") == USERS_PAGE_SIZE + 1
+    assert "…" in text and "&amp;" in text and "<имя" not in text
+    assert short.endswith("1. 1 — Иван - Иванов Иван")
@@ -0,0 +1,70 @@
+import subprocess
+import sys
+
+from core.utils import validators
+from core.utils.validators import (
+    SKIP_SIGNAL,
+    validate_birthdate,
+    validate_email,
+    validate_full_name,
+    validate_gender,
+    validate_phone,
+)
+
+
+def test_field_validators_normalize_and_reject():
+    assert validate_full_name("иван  иванов") == "Иван Иванов"
+    assert validate_full_name("Иван") is None
+    assert validate_birthdate("12.11.1990") == "12.11.1990"
+    assert validate_birthdate("31.02.1990") is None
+    assert validate_birthdate("1990") == "1990"
+    assert validate_birthdate("1800") is None
+    assert validate_gender(" Жен ") == "Ж"
+    assert validate_gender("?") is None
+    assert validate_phone("+7 912 345-67-89") == "+7 912 345-67-89"
+    assert validate_phone("+79123456789") == "+7 912 345-67-89"
+    assert validate_email("anna@mail.ru", check_deliverability=False) == "anna@mail.ru"
+    for validator in (validate_full_name, validate_birthdate, validate_gender, validate_phone, validate_email):
+        assert validator(SKIP_SIGNAL) is None
+
+
+def test_prefilter_skips_heavy_libraries(monkeypatch):
+    validators.clear_caches()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("heavy validator must not be called")
+
+    import email_validator
+    import phonenumbers
+
+    monkeypatch.setattr(phonenumbers, "parse", fail)
+    monkeypatch.setattr(email_validator, "validate_email", fail)
+
+    assert validate_phone("привет") is None
+    assert validate_phone("89123456789") is None
+    assert validate_phone("+7 12") is None
+    assert validate_email("не почта") is None
+    assert validate_email("a@b") is None
+    assert validate_email("x" * 250 + "@mail.ru") is None
+
+
+def test_repeated_input_is_served_from_cache():
+    validators.clear_caches()
+
+    for _ in range(5):
+        assert validate_phone(" +7 912 345-67-89 ") == "+7 912 345-67-89"
+        assert validate_email("anna@mail.ru", check_deliverability=False) == "anna@mail.ru"
+
+    stats = validators.cache_stats()
+    assert (stats["phone"]["misses"], stats["phone"]["hits"]) == (1, 4)
+    assert (stats["email"]["misses"], stats["email"]["hits"]) == (1, 4)
+
+
+def test_heavy_libraries_are_not_imported_at_startup():
+    code = (
+        "import sys, telegram.handlers.registration, extras.export_import; "
+        "print('phonenumbers' in sys.modules, 'email_validator' in sys.modules)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert out.stdout.split() == ["False", "False"]